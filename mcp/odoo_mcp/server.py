@@ -272,6 +272,41 @@ class OdooMCPServer:
             self._log_error(f"Failed to record payment: {e}")
             return {"error": str(e)}
 
+    def search_read_changes(self, model: str, fields: List[str], domain: Optional[List] = None,
+                            cursor: Optional[List] = None, limit: int = 200) -> List[Dict[str, Any]]:
+        """
+        Read one page of records changed after a (write_date, id) cursor
+
+        Pages are keyed on (write_date, id) rather than offset, so records
+        edited while a sync is paging are neither skipped nor repeated.
+
+        Args:
+            model: Odoo model, e.g. 'account.move'
+            fields: Fields to read ('write_date' is always included)
+            domain: Extra search domain
+            cursor: [write_date, id] of the last record already seen
+            limit: Page size
+
+        Returns:
+            Records ordered by write_date, id
+        """
+        if not self.uid:
+            if not self.authenticate():
+                raise RuntimeError("Authentication failed")
+
+        search_domain = list(domain or [])
+        if cursor:
+            write_date, record_id = cursor
+            search_domain += ['|', ['write_date', '>', write_date],
+                              '&', ['write_date', '=', write_date], ['id', '>', record_id]]
+
+        return self.models.execute_kw(
+            self.db, self.uid, self.password,
+            model, 'search_read',
+            [search_domain],
+            {'fields': sorted(set(fields) | {'write_date'}), 'order': 'write_date asc, id asc', 'limit': limit}
+        )
+
     def _log_business_activity(self, message: str):
         """Log activity to business log"""
         try:
@@ -328,6 +363,20 @@ class OdooMCPServer:
                     payment_date=params.get('payment_date')
                 )
 
+            elif action == 'search_read_changes':
+                records = self.search_read_changes(
+                    model=params.get('model', 'account.move'),
+                    fields=params.get('fields', ['name']),
+                    domain=params.get('domain'),
+                    cursor=params.get('cursor'),
+                    limit=params.get('limit', 200)
+                )
+                return {
+                    "success": True,
+                    "records": records,
+                    "count": len(records)
+                }
+
             else:
                 return {"error": f"Unknown action: {action}"}
 
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Odoo XML-RPC Stand-in
+Serves the subset of Odoo's external API used by server.py and
+scripts/odoo_sync.py from in-memory records, for testing without Odoo
+"""
+
+import sys
+import json
+import argparse
+import threading
+from datetime import datetime
+from xmlrpc.client import Fault
+from xmlrpc.server import SimpleXMLRPCServer, SimpleXMLRPCRequestHandler
+
+
+class RequestHandler(SimpleXMLRPCRequestHandler):
+    rpc_paths = ('/xmlrpc/2/common', '/xmlrpc/2/object')
+
+
+class OdooStub:
+    """In-memory Odoo models answering authenticate and execute_kw"""
+
+    def __init__(self, records=None, login='admin', password='admin', uid=2):
+        self.models = {model: {r['id']: dict(r) for r in rows} for model, rows in (records or {}).items()}
+        self.login = login
+        self.password = password
+        self.uid = uid
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def version(self):
+        return {'server_version': 'stub', 'protocol_version': 1}
+
+    def authenticate(self, db, login, password, context=None):
+        self._count('authenticate')
+        if login == self.login and password == self.password:
+            return self.uid
+        return False
+
+    def execute_kw(self, db, uid, password, model, method, args, kwargs=None):
+        with self.lock:
+            self._count(f'{model}.{method}')
+            if uid != self.uid or password != self.password:
+                raise Fault(3, 'AccessDenied')
+
+            handler = getattr(self, f'_{method}', None)
+            if handler is None:
+                raise Fault(2, f'Method {method} not supported by the stand-in')
+            return handler(self.models.setdefault(model, {}), *args, **(kwargs or {}))
+
+    # Domain evaluation (prefix notation with '&', '|', '!')
+
+    def _match(self, record, domain):
+        terms = list(domain)
+
+        def parse():
+            term = terms.pop(0)
+            if term == '!':
+                return not parse()
+            if term in ('&', '|'):
+                left, right = parse(), parse()
+                return (left and right) if term == '&' else (left or right)
+            return self._leaf(record, *term)
+
+        result = True
+        while terms:
+            result = parse() and result
+        return result
+
+    def _leaf(self, record, field, operator, value):
+        actual = record.get(field)
+        if isinstance(actual, list) and len(actual) == 2 and not isinstance(value, list):
+            actual = actual[0]  # many2one as [id, name]
+
+        if operator == '=':
+            return actual == value
+        if operator == '!=':
+            return actual != value
+        if operator == 'in':
+            return actual in value
+        if operator == 'not in':
+            return actual not in value
+        if operator == 'ilike':
+            return str(value).lower() in str(actual or '').lower()
+        if actual is None or actual is False:
+            return False
+        if operator == '>':
+            return actual > value
+        if operator == '>=':
+            return actual >= value
+        if operator == '<':
+            return actual < value
+        if operator == '<=':
+            return actual <= value
+        raise Fault(2, f'Operator {operator} not supported by the stand-in')
+
+    def _select(self, table, domain, order=None, limit=None, offset=0):
+        rows = [r for r in table.values() if self._match(r, domain)]
+        for part in reversed((order or 'id asc').split(',')):
+            field, _, direction = part.strip().partition(' ')
+            rows.sort(key=lambda r: (r.get(field) is None, r.get(field)), reverse=direction.lower() == 'desc')
+        rows = rows[offset:]
+        return rows[:limit] if limit else rows
+
+    def _fields(self, record, fields):
+        if not fields:
+            return dict(record)
+        return {f: record.get(f, False) for f in ['id'] + list(fields)}
+
+    # ORM methods
+
+    def _search(self, table, domain, limit=None, offset=0, order=None):
+        return [r['id'] for r in self._select(table, domain, order, limit, offset)]
+
+    def _search_count(self, table, domain):
+        return len(self._select(table, domain))
+
+    def _search_read(self, table, domain, fields=None, limit=None, offset=0, order=None):
+        return [self._fields(r, fields) for r in self._select(table, domain, order, limit, offset)]
+
+    def _read(self, table, ids, fields=None):
+        ids = ids if isinstance(ids, list) else [ids]
+        return [self._fields(table[i], fields) for i in ids if i in table]
+
+    def _create(self, table, values):
+        record_id = max(table, default=0) + 1
+        table[record_id] = dict(values, id=record_id, write_date=now())
+        return record_id
+
+    def _write(self, table, ids, values):
+        for record_id in ids:
+            table[record_id].update(values, write_date=now())
+        return True
+
+    def _unlink(self, table, ids):
+        for record_id in ids:
+            table.pop(record_id, None)
+        return True
+
+    def _action_post(self, table, ids):
+        return self._write(table, ids, {'state': 'posted'})
+
+    def stub_stats(self):
+        """RPC calls served so far, by method"""
+        return dict(self.calls)
+
+
+def now():
+    """Odoo's write_date format"""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def make_server(stub, host='127.0.0.1', port=8069):
+    """Create an XML-RPC server for a stub (port 0 picks a free port)"""
+    server = SimpleXMLRPCServer((host, port), requestHandler=RequestHandler, allow_none=True, logRequests=False)
+    server.register_function(stub.version, 'version')
+    server.register_function(stub.authenticate, 'authenticate')
+    server.register_function(stub.execute_kw, 'execute_kw')
+    server.register_function(stub.stub_stats, 'stub_stats')
+    return server
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Odoo XML-RPC stand-in')
+    parser.add_argument('--port', type=int, default=8069, help='Port to listen on (default: 8069)')
+    parser.add_argument('--seed', help='JSON file of {model: [records]} to serve')
+    parser.add_argument('--login', default='admin', help='Accepted login (default: admin)')
+    parser.add_argument('--password', default='admin', help='Accepted password (default: admin)')
+    args = parser.parse_args()
+
+    records = {}
+    if args.seed:
+        with open(args.seed, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+
+    server = make_server(OdooStub(records, args.login, args.password), port=args.port)
+    print(json.dumps({"info": f"Odoo stand-in listening on http://127.0.0.1:{server.server_address[1]}"}))
+    sys.stdout.flush()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
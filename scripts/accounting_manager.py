@@ -1,35 +1,71 @@
 #!/usr/bin/env python3
 """
 Accounting Manager Script
-Maintains financial records in AI_Employee_Vault/Accounting/Current_Month.md
+Records transactions in an append-only ledger (AI_Employee_Vault/Accounting/Ledger)
+and renders AI_Employee_Vault/Accounting/Current_Month.md from it
 """
 
 import os
 import sys
+import csv
+import gzip
 import json
+import time
+import uuid
+import shutil
 import argparse
 from datetime import datetime, timedelta
 from pathlib import Path
 import re
 
+from file_lock import FileLock
+
+try:
+    import numpy as np
+except ImportError:  # No columnar archives; queries read the ledgers in pure Python
+    np = None
+
 
 # Configuration
 VAULT_PATH = os.path.join(os.path.dirname(__file__), "..", "AI_Employee_Vault")
 ACCOUNTING_PATH = os.path.join(VAULT_PATH, "Accounting")
 CURRENT_MONTH_FILE = os.path.join(ACCOUNTING_PATH, "Current_Month.md")
 ARCHIVE_PATH = os.path.join(ACCOUNTING_PATH, "Archive")
+LEDGER_PATH = os.path.join(ACCOUNTING_PATH, "Ledger")
+ROLLUPS_FILE = os.path.join(LEDGER_PATH, "rollups.json")
+SPOOL_PATH = os.path.join(ACCOUNTING_PATH, "Spool")
+SPOOL_REJECTED_PATH = os.path.join(SPOOL_PATH, "Rejected")
+LOCK_FILE = os.path.join(ACCOUNTING_PATH, ".accounting.lock")
+PENDING_IMPORT_PATH = os.path.join(ACCOUNTING_PATH, "Pending")
+NEEDS_APPROVAL_PATH = os.path.join(VAULT_PATH, "Needs_Approval")
 LOGS_PATH = os.path.join(VAULT_PATH, "Logs")
 
 # Environment variables
 APPROVAL_THRESHOLD = float(os.getenv('ACCOUNTING_APPROVAL_THRESHOLD', '500'))
 CURRENCY = os.getenv('ACCOUNTING_CURRENCY', '$')
 WEEK_START = int(os.getenv('ACCOUNTING_WEEK_START', '1'))  # 0=Sunday, 1=Monday
+RENDER_DEBOUNCE = int(os.getenv('ACCOUNTING_RENDER_DEBOUNCE', '60'))  # Seconds between re-renders while logging
+COALESCE_WINDOW = int(os.getenv('ACCOUNTING_COALESCE_MS', '0')) / 1000  # Extra wait for writers before a group commit
+SPOOL_POLL_INTERVAL = 0.002  # Seconds between checks while another writer commits
+
+IMPORT_DATE_FORMATS = ['%Y-%m-%d', '%m/%d/%Y', '%d.%m.%Y', '%Y%m%d']
+OFX_TAG_PATTERN = re.compile(r'<(\w+)>([^<\r\n]*)')
+LEDGER_FILE_PATTERN = re.compile(r'^(\d{4}-\d{2})\.jsonl(\.gz)?$')
+ROLLUPS_VERSION = 2
+TRANSACTION_TYPE_CODES = {'income': 0, 'expense': 1}
+DEFAULT_CATEGORY = 'uncategorized'
+QUERY_PERIODS = ['week', 'month', 'quarter', 'year', 'rolling-30', 'all']
+QUERY_GROUPS = ['type', 'category', 'month', 'quarter', 'year']
+ROLLUP_PERIODS = ['day', 'week', 'month']
+WEEK_MARKER_PATTERN = re.compile(r'^<!-- week:(\d{4}-W\d{2}) -->$')
+LEGACY_WEEK_HEADING_PATTERN = re.compile(r'^### Week \d+: (\w{3}) (\d{1,2})-.*?(\d{4})$')
 
 
 def ensure_directories():
     """Ensure all required directories exist"""
     os.makedirs(ACCOUNTING_PATH, exist_ok=True)
     os.makedirs(ARCHIVE_PATH, exist_ok=True)
+    os.makedirs(LEDGER_PATH, exist_ok=True)
     os.makedirs(LOGS_PATH, exist_ok=True)
 
 
@@ -46,40 +82,562 @@ def log_to_business_log(message):
         print(json.dumps({"warning": f"Failed to log to business.log: {str(e)}"}))
 
 
-def initialize_current_month():
-    """Initialize Current_Month.md if it doesn't exist"""
-    if not os.path.exists(CURRENT_MONTH_FILE):
-        now = datetime.now()
-        month_name = now.strftime("%B %Y")
+ACCOUNTING_LOCK = FileLock(LOCK_FILE)
+
+
+def accounting_lock(blocking=True):
+    """Hold the exclusive lock every writer of accounting files takes
+
+    The lock is an OS file lock, so it serializes separate processes (CLI,
+    scheduler, imports); it is re-entrant within a process. Yields False
+    instead of waiting when blocking is off and another process holds it.
+    """
+    return ACCOUNTING_LOCK.hold(blocking)
+
+
+def get_ledger_file(date=None):
+    """Path of the ledger holding one month's transactions"""
+    if date is None:
+        date = datetime.now()
+    return os.path.join(LEDGER_PATH, f"{date.strftime('%Y-%m')}.jsonl")
+
+
+def append_to_ledger(transaction):
+    """Append one transaction to its month's ledger"""
+    append_batch_to_ledger([transaction])
+
+
+def append_batch_to_ledger(transactions):
+    """Append transactions to their months' ledgers with one fsynced write per month"""
+    by_month = {}
+    for transaction in transactions:
+        by_month.setdefault(transaction['date'][:7], []).append(json.dumps(transaction) + '\n')
+
+    with accounting_lock():
+        for month, lines in by_month.items():
+            ledger_file = get_ledger_file(datetime.strptime(month, "%Y-%m"))
+            with open(ledger_file, 'a', encoding='utf-8') as f:
+                f.write(''.join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+
+        sync_rollups()
+
+
+def spool_transaction(transaction):
+    """Queue a transaction for the next group commit; returns its spool file"""
+    os.makedirs(SPOOL_PATH, exist_ok=True)
+    name = f"{time.time_ns()}_{os.getpid()}_{uuid.uuid4().hex[:8]}.json"
+    spool_file = os.path.join(SPOOL_PATH, name)
+
+    temp_file = os.path.join(SPOOL_PATH, f".{name}.tmp")
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(transaction, f)
+    os.replace(temp_file, spool_file)
+
+    return spool_file
+
+
+def list_spool():
+    """Spooled transaction files, oldest first"""
+    if not os.path.exists(SPOOL_PATH):
+        return []
+    return sorted(name for name in os.listdir(SPOOL_PATH) if name.endswith('.json'))
+
+
+def get_rejected_spool_file(spool_file):
+    """Where commit_spool moves a spool entry it cannot parse"""
+    return os.path.join(SPOOL_REJECTED_PATH, os.path.basename(spool_file))
+
+
+def commit_spool():
+    """Append every spooled transaction to the ledger as one batch (lock held)
+
+    When other writers are already queued, wait COALESCE_WINDOW for more to
+    arrive so the whole group shares one write and fsync. Only appended
+    entries are removed: one that cannot be read stays for the next commit,
+    and one that cannot be parsed is moved to Spool/Rejected.
+    """
+    names = list_spool()
+    if len(names) > 1 and COALESCE_WINDOW > 0:
+        time.sleep(COALESCE_WINDOW)
+        names = list_spool()
+
+    transactions = []
+    committed = []
+    for name in names:
+        spool_file = os.path.join(SPOOL_PATH, name)
+        try:
+            with open(spool_file, 'r', encoding='utf-8') as f:
+                transactions.append(json.load(f))
+            committed.append(spool_file)
+        except OSError as e:
+            log_to_business_log(f"Spooled transaction {name} could not be read, retrying next commit: {e}")
+        except ValueError as e:
+            os.makedirs(SPOOL_REJECTED_PATH, exist_ok=True)
+            os.replace(spool_file, get_rejected_spool_file(spool_file))
+            log_to_business_log(f"ERROR: Spooled transaction {name} is corrupt, moved to Spool/Rejected: {e}")
+
+    if transactions:
+        initialize_current_month()
+        append_batch_to_ledger(transactions)
+
+    # Spool entries are only dropped once the ledger write is durable
+    for spool_file in committed:
+        try:
+            os.remove(spool_file)
+        except OSError:
+            pass
+
+    return len(transactions)
+
+
+def submit_transaction(transaction):
+    """Group-commit one transaction; returns once it is durably in the ledger
+
+    The caller spools its transaction, then waits until either its entry is
+    gone (an earlier leader committed it) or it gets the lock and commits
+    every spooled transaction itself. The rollups are returned as of the
+    commit; 'rejected' is set if the entry was quarantined instead.
+    """
+    spool_file = spool_transaction(transaction)
+    leader_batch = None
+
+    while True:
+        if not os.path.exists(spool_file):
+            # A leader that was not us saved the rollups before removing the entry
+            return {
+                'leader': leader_batch is not None,
+                'batch_size': leader_batch,
+                'rejected': os.path.exists(get_rejected_spool_file(spool_file)),
+                'rollups': sync_rollups() if leader_batch is not None else load_rollups()
+            }
+
+        with accounting_lock(blocking=False) as locked:
+            if locked:
+                pending = os.path.exists(spool_file)
+                batch_size = commit_spool()
+                if pending and not os.path.exists(spool_file):
+                    leader_batch = batch_size
+                continue
+
+        time.sleep(SPOOL_POLL_INTERVAL)
+
+
+def open_ledger(ledger_file):
+    """Open a ledger for binary reading; archived months are gzipped"""
+    if ledger_file.endswith('.gz'):
+        return gzip.open(ledger_file, 'rb')
+    return open(ledger_file, 'rb')
+
+
+def read_ledger(date=None):
+    """Read one month's transactions from the ledger, oldest first"""
+    ledger_file = get_ledger_file(date)
+    transactions = []
+
+    # An archived month is gzipped; late entries may sit in a new plain file
+    for path in [f"{ledger_file}.gz", ledger_file]:
+        if not os.path.exists(path):
+            continue
+
+        with open_ledger(path) as f:
+            for line in f:
+                try:
+                    transactions.append(json.loads(line))
+                except ValueError:
+                    continue
+
+    return transactions
+
+
+def empty_rollups():
+    """Rollups with no transactions counted"""
+    rollups = {'version': ROLLUPS_VERSION, 'week_start': WEEK_START, 'offsets': {}}
+    for period in ROLLUP_PERIODS:
+        rollups[period] = {}
+    return rollups
+
+
+def signed_amount(transaction):
+    """Amount a transaction adds to its type's total; reversal entries subtract theirs"""
+    amount = float(transaction['amount'])
+    return -amount if transaction.get('reversal') else amount
+
+
+def add_to_rollups(rollups, transaction):
+    """Count one transaction in its day, week and month buckets
+
+    Weeks are keyed by their start date, so they follow WEEK_START.
+    """
+    date = datetime.strptime(transaction['date'], "%Y-%m-%d")
+    keys = {
+        'day': transaction['date'],
+        'week': get_week_range(date)[0].strftime("%Y-%m-%d"),
+        'month': transaction['date'][:7]
+    }
+    field = 'income' if transaction['type'] == 'income' else 'expenses'
+
+    for period, key in keys.items():
+        bucket = rollups[period].setdefault(key, {'income': 0.0, 'expenses': 0.0, 'count': 0})
+        bucket[field] = round(bucket[field] + signed_amount(transaction), 2)
+        bucket['count'] += 1
+
+
+def fold_ledger_tail(rollups, ledger_file):
+    """Add ledger lines past the file's recorded offset to the rollups"""
+    name = os.path.basename(ledger_file)
+    offset = rollups['offsets'].get(name, 0)
+
+    with open_ledger(ledger_file) as f:
+        f.seek(offset)
+        data = f.read()
+
+    # Only whole lines; a line still being written is picked up next time
+    end = data.rfind(b'\n') + 1
+    for line in data[:end].splitlines():
+        try:
+            add_to_rollups(rollups, json.loads(line))
+        except (ValueError, KeyError):
+            continue
+
+    rollups['offsets'][name] = offset + end
+
+
+def iter_ledger_files():
+    """Yield (month, path) for every ledger file, archived (.gz) ones included"""
+    if not os.path.exists(LEDGER_PATH):
+        return
+
+    for filename in sorted(os.listdir(LEDGER_PATH)):
+        match = LEDGER_FILE_PATTERN.match(filename)
+        if match:
+            yield match.group(1), os.path.join(LEDGER_PATH, filename)
+
+
+def compute_rollups():
+    """Recompute all rollups from scratch by reading every ledger"""
+    rollups = empty_rollups()
+    for month, ledger_file in iter_ledger_files():
+        fold_ledger_tail(rollups, ledger_file)
+    return rollups
+
+
+def save_rollups(rollups):
+    """Write rollups.json atomically"""
+    os.makedirs(LEDGER_PATH, exist_ok=True)
+    temp_file = f"{ROLLUPS_FILE}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(rollups, f)
+    os.replace(temp_file, ROLLUPS_FILE)
+
+
+def rebuild_rollups():
+    """Replace rollups.json with a full recompute"""
+    with accounting_lock():
+        rollups = compute_rollups()
+        save_rollups(rollups)
+        return rollups
+
+
+def load_rollups():
+    """Read rollups.json as last saved, without folding in new ledger lines"""
+    try:
+        with open(ROLLUPS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return sync_rollups()
+
+
+def sync_rollups():
+    """Load the rollups, folding in any ledger lines appended since the last sync
+
+    Each ledger's size is compared with the offset already counted, so
+    only new bytes are read.
+    """
+    with accounting_lock():
+        if not os.path.exists(ROLLUPS_FILE):
+            return rebuild_rollups()
+
+        try:
+            with open(ROLLUPS_FILE, 'r', encoding='utf-8') as f:
+                rollups = json.load(f)
+        except ValueError:
+            return rebuild_rollups()
+
+        # Week buckets depend on WEEK_START; rebuild if it or the layout changed
+        if rollups.get('week_start') != WEEK_START or rollups.get('version') != ROLLUPS_VERSION:
+            return rebuild_rollups()
+
+        changed = False
+        for month, ledger_file in iter_ledger_files():
+            if ledger_file.endswith('.gz'):
+                # Archived months are closed and were counted before compression
+                continue
+
+            size = os.path.getsize(ledger_file)
+            offset = rollups['offsets'].get(os.path.basename(ledger_file), 0)
+
+            if size < offset:
+                # The ledger was rewritten rather than appended to
+                return rebuild_rollups()
+
+            if size > offset:
+                fold_ledger_tail(rollups, ledger_file)
+                changed = True
 
-        content = f"""# Financial Records - {month_name}
+        if changed:
+            save_rollups(rollups)
+
+        return rollups
+
+
+def get_rollup(period, key, rollups=None):
+    """Totals for one day (YYYY-MM-DD), week (start date) or month (YYYY-MM)"""
+    rollups = rollups or sync_rollups()
+    bucket = rollups[period].get(key, {'income': 0.0, 'expenses': 0.0, 'count': 0})
+
+    return {
+        'income': bucket['income'],
+        'expenses': bucket['expenses'],
+        'net': round(bucket['income'] - bucket['expenses'], 2),
+        'count': bucket['count']
+    }
+
+
+def get_range_totals(start_date, end_date):
+    """Totals for an arbitrary date range, summed from the daily rollups"""
+    # Legacy Current_Month.md rows must reach the ledger before they are counted
+    ensure_directories()
+    initialize_current_month()
+    rollups = sync_rollups()
+    totals = {'income': 0.0, 'expenses': 0.0, 'net': 0.0, 'count': 0}
+
+    day = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day.date() <= end_date.date():
+        bucket = get_rollup('day', day.strftime("%Y-%m-%d"), rollups)
+        for field in totals:
+            totals[field] = round(totals[field] + bucket[field], 2)
+        day += timedelta(days=1)
+
+    return totals
+
+
+def migrate_current_month():
+    """Import the rows of a pre-ledger Current_Month.md into the ledger once
+
+    The ledger counts as migrated once any month's ledger file exists;
+    rollups.json alone can be written before the migration has run.
+    """
+    with accounting_lock():
+        if not os.path.exists(CURRENT_MONTH_FILE):
+            return
+        if any(iter_ledger_files()):
+            return
+
+        transactions = parse_current_month_file()
+        if not transactions:
+            return
+        os.makedirs(LEDGER_PATH, exist_ok=True)
+
+        # The markdown table lists the newest transaction first
+        append_batch_to_ledger(list(reversed(transactions)))
+
+        log_to_business_log(f"Migrated {len(transactions)} transactions from Current_Month.md to the ledger")
+
+
+def find_section(content, heading):
+    """Match the body of a '## heading' section, or None"""
+    return re.search(rf'^## {re.escape(heading)}$(.*?)(?=^## |^---$|\Z)', content, re.MULTILINE | re.DOTALL)
+
+
+def get_section(content, heading):
+    """Return the body of a '## heading' section, or an empty string"""
+    match = find_section(content, heading)
+    return match.group(1) if match else ''
+
+
+def render_current_month():
+    """Rewrite Current_Month.md from the ledger"""
+    with accounting_lock():
+        render_month(datetime.now(), CURRENT_MONTH_FILE)
+
+
+def render_month(month_date, target_file):
+    """Render one month's ledger as markdown into target_file
+
+    The Weekly Summaries section is written by generate_summary rather than
+    derived from the ledger, so it is carried over from Current_Month.md.
+    """
+    now = datetime.now()
+    month_name = month_date.strftime("%B %Y")
+    transactions = read_ledger(month_date)
+    totals = calculate_totals(transactions)
+
+    weekly_summaries = '\n\n'
+    if os.path.exists(CURRENT_MONTH_FILE):
+        with open(CURRENT_MONTH_FILE, 'r', encoding='utf-8') as f:
+            existing = f.read()
+        if existing.startswith(f"# Financial Records - {month_name}\n"):
+            # Also drops duplicate blocks a migrated legacy file still carries
+            weekly_summaries = join_weekly_summaries(split_weekly_summaries(get_section(existing, 'Weekly Summaries')))
+
+    rows = ''.join(
+        f"| {t['date']} | {t['type'].capitalize()} | {'-' if t.get('reversal') else ''}{CURRENCY}{t['amount']:,.2f} | {t['description']} |\n"
+        for t in reversed(transactions)
+    )
+
+    content = f"""# Financial Records - {month_name}
 
 ## Transactions
 
 | Date       | Type    | Amount  | Description                           |
 |------------|---------|---------|---------------------------------------|
+{rows}
+## Weekly Summaries{weekly_summaries}## Monthly Totals
 
-## Weekly Summaries
-
-## Monthly Totals
-
-- **Total Income**: {CURRENCY}0.00
-- **Total Expenses**: {CURRENCY}0.00
-- **Net Profit**: {CURRENCY}0.00
-- **Transaction Count**: 0
+- **Total Income**: {CURRENCY}{totals['income']:,.2f}
+- **Total Expenses**: {CURRENCY}{totals['expenses']:,.2f}
+- **Net Profit**: {CURRENCY}{totals['net']:,.2f}
+- **Transaction Count**: {totals['count']}
 
 ---
 Last updated: {now.strftime("%Y-%m-%d %H:%M:%S")}
 """
 
-        with open(CURRENT_MONTH_FILE, 'w', encoding='utf-8') as f:
-            f.write(content)
+    temp_file = f"{target_file}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temp_file, target_file)
+
+
+def get_columnar_archive_file(month):
+    """Path of a closed month's columnar archive (YYYY-MM.npz)"""
+    return os.path.join(ARCHIVE_PATH, f"{month}.npz")
+
+
+def write_columnar_archive(month, transactions):
+    """Store a month's transactions as date/type/amount/description columns
+
+    Reversal entries are stored with a negative amount. Returns the archive
+    path, or None when NumPy is not installed.
+    """
+    if np is None:
+        log_to_business_log(f"NumPy not installed, no columnar archive written for {month}")
+        return None
+
+    archive_file = get_columnar_archive_file(month)
+    np.savez_compressed(
+        archive_file,
+        date=np.array([t['date'] for t in transactions], dtype='datetime64[D]'),
+        type=np.array([TRANSACTION_TYPE_CODES[t['type']] for t in transactions], dtype='u1'),
+        amount=np.array([signed_amount(t) for t in transactions], dtype='float64'),
+        description=np.array([t.get('description', '') for t in transactions], dtype=str),
+        category=np.array([t.get('category') or DEFAULT_CATEGORY for t in transactions], dtype=str)
+    )
+    return archive_file
+
+
+def read_columnar_archive(month, columns=None):
+    """Load a closed month's columns as lists (dates as datetime.date)"""
+    archive_file = get_columnar_archive_file(month)
+    if np is None or not os.path.exists(archive_file):
+        return None
+
+    with np.load(archive_file) as data:
+        return {name: data[name].tolist() for name in (columns or data.files) if name in data.files}
+
+
+def archive_month(month):
+    """Close a month: columnar archive, final markdown, compressed ledger"""
+    month_date = datetime.strptime(month, "%Y-%m")
+    ledger_file = get_ledger_file(month_date)
+    archived_ledger = f"{ledger_file}.gz"
+
+    # Count every line before the plain ledger goes away
+    rollups = sync_rollups()
+
+    transactions = read_ledger(month_date)
+    archive_file = write_columnar_archive(month, transactions)
+    render_month(month_date, os.path.join(ARCHIVE_PATH, f"{month}.md"))
+
+    # gzip members concatenate, so late entries are appended to the archive
+    with open(ledger_file, 'rb') as src, gzip.open(archived_ledger, 'ab') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(ledger_file)
+
+    plain_name = os.path.basename(ledger_file)
+    archived_name = os.path.basename(archived_ledger)
+    rollups['offsets'][archived_name] = rollups['offsets'].get(archived_name, 0) + rollups['offsets'].pop(plain_name, 0)
+    save_rollups(rollups)
+
+    log_to_business_log(f"Archived accounting month {month}: {len(transactions)} transactions")
+
+    return {
+        'month': month,
+        'transactions': len(transactions),
+        'archive': archive_file
+    }
+
+
+def rollover_months():
+    """Archive every month before the current one that still has a plain ledger"""
+    with accounting_lock():
+        current_month = datetime.now().strftime("%Y-%m")
+        archived = []
+
+        for month, ledger_file in list(iter_ledger_files()):
+            if month < current_month and not ledger_file.endswith('.gz'):
+                archived.append(archive_month(month))
+
+        # The old month's markdown now lives in the archive
+        if archived and os.path.exists(CURRENT_MONTH_FILE):
+            with open(CURRENT_MONTH_FILE, 'r', encoding='utf-8') as f:
+                title = f.readline().strip()
+            if title != f"# Financial Records - {datetime.now().strftime('%B %Y')}":
+                os.remove(CURRENT_MONTH_FILE)
+
+        return archived
+
+
+def is_render_stale():
+    """True if Current_Month.md is missing, for another month, or older than the ledger"""
+    if not os.path.exists(CURRENT_MONTH_FILE):
+        return True
+
+    with open(CURRENT_MONTH_FILE, 'r', encoding='utf-8') as f:
+        if f.readline().strip() != f"# Financial Records - {datetime.now().strftime('%B %Y')}":
+            return True
+
+    ledger_file = get_ledger_file()
+    if not os.path.exists(ledger_file):
+        return False
+
+    return os.path.getmtime(CURRENT_MONTH_FILE) < os.path.getmtime(ledger_file)
+
+
+def initialize_current_month():
+    """Migrate legacy records, roll over closed months and create Current_Month.md"""
+    with accounting_lock():
+        migrate_current_month()
+        rollover_months()
+
+        if not os.path.exists(CURRENT_MONTH_FILE):
+            render_current_month()
+            log_to_business_log(f"Initialized accounting file for {datetime.now().strftime('%B %Y')}")
+
 
-        log_to_business_log(f"Initialized accounting file for {month_name}")
+def refresh_current_month():
+    """Bring Current_Month.md up to date before it is read"""
+    with accounting_lock():
+        initialize_current_month()
+
+        if is_render_stale():
+            render_current_month()
 
 
 def parse_current_month_file():
-    """Parse Current_Month.md and extract transactions"""
+    """Parse the transaction table of Current_Month.md (used for migration)"""
     if not os.path.exists(CURRENT_MONTH_FILE):
         return []
 
@@ -123,8 +681,8 @@ def parse_current_month_file():
 
 def calculate_totals(transactions):
     """Calculate total income, expenses, and net"""
-    income = sum(t['amount'] for t in transactions if t['type'] == 'income')
-    expenses = sum(t['amount'] for t in transactions if t['type'] == 'expense')
+    income = sum(signed_amount(t) for t in transactions if t['type'] == 'income')
+    expenses = sum(signed_amount(t) for t in transactions if t['type'] == 'expense')
     net = income - expenses
 
     return {
@@ -156,38 +714,30 @@ def get_week_number(date):
     return week_num
 
 
-def calculate_weekly_summary(transactions, week_start, week_end):
-    """Calculate summary for a specific week"""
-    week_transactions = [
-        t for t in transactions
-        if week_start.strftime("%Y-%m-%d") <= t['date'] <= week_end.strftime("%Y-%m-%d")
-    ]
+def validate_transaction(trans_type, amount, description):
+    """Return an error message for an invalid transaction, or None"""
+    if trans_type not in ['income', 'expense']:
+        return "Transaction type must be 'income' or 'expense'"
+
+    if amount <= 0:
+        return "Amount must be positive"
 
-    return calculate_totals(week_transactions)
+    if not description:
+        return "Description is required"
+
+    return None
 
 
-def log_transaction(trans_type, amount, description):
+def log_transaction(trans_type, amount, description, category=None):
     """Log a new transaction"""
     ensure_directories()
-    initialize_current_month()
 
     # Validate inputs
-    if trans_type not in ['income', 'expense']:
-        return {
-            "success": False,
-            "error": "Transaction type must be 'income' or 'expense'"
-        }
-
-    if amount <= 0:
-        return {
-            "success": False,
-            "error": "Amount must be positive"
-        }
-
-    if not description:
+    error = validate_transaction(trans_type, amount, description)
+    if error:
         return {
             "success": False,
-            "error": "Description is required"
+            "error": error
         }
 
     # Check if approval needed
@@ -200,63 +750,32 @@ def log_transaction(trans_type, amount, description):
             "requires_approval": True
         }
 
-    # Read current file
-    with open(CURRENT_MONTH_FILE, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Add new transaction
     now = datetime.now()
     date_str = now.strftime("%Y-%m-%d")
-    new_row = f"| {date_str} | {trans_type.capitalize()} | {CURRENCY}{amount:,.2f} | {description} |"
-
-    # Find the transaction table and insert
-    lines = content.split('\n')
-    new_lines = []
-    inserted = False
-
-    for i, line in enumerate(lines):
-        new_lines.append(line)
-        if not inserted and line.startswith('|---') and i > 0 and lines[i-1].startswith('| Date'):
-            new_lines.append(new_row)
-            inserted = True
-
-    # Update totals
-    transactions = parse_current_month_file()
-    transactions.append({
+    transaction = {
         'date': date_str,
         'type': trans_type,
         'amount': amount,
-        'description': description
-    })
-
-    totals = calculate_totals(transactions)
-
-    # Update Monthly Totals section
-    updated_content = '\n'.join(new_lines)
-    updated_content = re.sub(
-        r'## Monthly Totals\n\n.*?(?=\n---|\Z)',
-        f"""## Monthly Totals
-
-- **Total Income**: {CURRENCY}{totals['income']:,.2f}
-- **Total Expenses**: {CURRENCY}{totals['expenses']:,.2f}
-- **Net Profit**: {CURRENCY}{totals['net']:,.2f}
-- **Transaction Count**: {totals['count']}
+        'description': description,
+        'logged_at': now.isoformat()
+    }
+    if category:
+        transaction['category'] = category
 
-""",
-        updated_content,
-        flags=re.DOTALL
-    )
+    # The ledger is the source of truth; concurrent callers share one
+    # durable append per group commit, which also initializes the month
+    commit = submit_transaction(transaction)
+    if commit['rejected']:
+        return {
+            "success": False,
+            "error": "Transaction could not be read back from the spool; kept in Accounting/Spool/Rejected"
+        }
 
-    # Update timestamp
-    updated_content = re.sub(
-        r'Last updated:.*',
-        f"Last updated: {now.strftime('%Y-%m-%d %H:%M:%S')}",
-        updated_content
-    )
+    # Re-render at most once per debounce window; readers render when stale
+    if commit['leader'] and os.path.getmtime(CURRENT_MONTH_FILE) < now.timestamp() - RENDER_DEBOUNCE:
+        render_current_month()
 
-    # Write back
-    with open(CURRENT_MONTH_FILE, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
+    totals = get_rollup('month', now.strftime("%Y-%m"), commit['rollups'])
 
     # Log activity
     log_to_business_log(f"Transaction logged: {trans_type} {CURRENCY}{amount:,.2f} - {description}")
@@ -270,6 +789,8 @@ def log_transaction(trans_type, amount, description):
             "amount": amount,
             "description": description
         },
+        "durable": True,
+        "batch_size": commit['batch_size'],
         "new_totals": {
             "income": totals['income'],
             "expenses": totals['expenses'],
@@ -278,21 +799,550 @@ def log_transaction(trans_type, amount, description):
     }
 
 
+def parse_import_date(value):
+    """Parse a statement date into YYYY-MM-DD"""
+    value = value.strip()
+    if value[:8].isdigit():
+        # OFX dates carry a time and timezone after YYYYMMDD
+        value = value[:8]
+    for date_format in IMPORT_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date: {value}")
+
+
+def parse_import_amount(value):
+    """Parse a statement amount; parentheses or a leading minus mean negative"""
+    value = value.strip().replace(CURRENCY, '').replace(',', '').replace(' ', '')
+    if value.startswith('(') and value.endswith(')'):
+        value = '-' + value[1:-1]
+    return float(value)
+
+
+def iter_csv_rows(f):
+    """Yield (line_number, row) from a CSV statement
+
+    Columns are matched by name: date, amount (or debit/credit), description
+    (or memo/payee/name) and an optional type.
+    """
+    reader = csv.DictReader(f)
+    for row in reader:
+        row = {(k or '').strip().lower(): (v or '').strip() for k, v in row.items()}
+
+        amount = row.get('amount', '')
+        debit = not amount and bool(row.get('debit'))
+        if not amount:
+            amount = row.get('debit') or row.get('credit', '')
+
+        yield reader.line_num, {
+            'date': row.get('date', ''),
+            'amount': amount,
+            'debit': debit,
+            'description': row.get('description') or row.get('memo') or row.get('payee') or row.get('name', ''),
+            'type': row.get('type', '').lower(),
+            'category': row.get('category', '')
+        }
+
+
+def iter_ofx_rows(f):
+    """Yield (line_number, row) for each STMTTRN block of an OFX/QFX statement"""
+    current = None
+    start_line = 0
+
+    for line_number, line in enumerate(f, 1):
+        for tag, value in OFX_TAG_PATTERN.findall(line):
+            tag = tag.upper()
+            if tag == 'STMTTRN':
+                current = {}
+                start_line = line_number
+            elif current is not None and value:
+                current[tag] = value.strip()
+
+        if current is not None and '</STMTTRN>' in line.upper():
+            yield start_line, {
+                'date': current.get('DTPOSTED', ''),
+                'amount': current.get('TRNAMT', ''),
+                'description': current.get('NAME') or current.get('MEMO', ''),
+                'type': '',
+                'category': ''
+            }
+            current = None
+
+
+def parse_import_row(row, source):
+    """Turn a raw statement row into a ledger transaction, raising ValueError if invalid"""
+    date_str = parse_import_date(row['date'])
+    amount = parse_import_amount(row['amount'])
+    if row.get('debit'):
+        # Debit columns may or may not carry their own minus sign
+        amount = -abs(amount)
+
+    trans_type = row['type']
+    if trans_type not in ['income', 'expense']:
+        trans_type = 'expense' if amount < 0 else 'income'
+
+    amount = round(abs(amount), 2)
+    description = row['description']
+
+    error = validate_transaction(trans_type, amount, description)
+    if error:
+        raise ValueError(error)
+
+    transaction = {
+        'date': date_str,
+        'type': trans_type,
+        'amount': amount,
+        'description': description,
+        'source': source
+    }
+    if row.get('category'):
+        transaction['category'] = row['category']
+
+    return transaction
+
+
+def request_import_approval(source, transactions):
+    """Write all above-threshold rows to one pending file and one approval request"""
+    os.makedirs(PENDING_IMPORT_PATH, exist_ok=True)
+    os.makedirs(NEEDS_APPROVAL_PATH, exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    pending_file = os.path.join(PENDING_IMPORT_PATH, f"import_{timestamp}.csv")
+
+    with open(pending_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['date', 'type', 'amount', 'description', 'category'])
+        writer.writeheader()
+        for transaction in transactions:
+            writer.writerow({
+                'date': transaction['date'],
+                'type': transaction['type'],
+                'amount': transaction['amount'],
+                'description': transaction['description'],
+                'category': transaction.get('category', '')
+            })
+
+    rows = ''.join(
+        f"| {t['date']} | {t['type'].capitalize()} | {CURRENCY}{t['amount']:,.2f} | {t['description']} |\n"
+        for t in transactions
+    )
+    total = sum(t['amount'] for t in transactions)
+
+    approval_file = os.path.join(NEEDS_APPROVAL_PATH, f"APPROVAL_{timestamp}_accounting_import.md")
+    with open(approval_file, 'w', encoding='utf-8') as f:
+        f.write(f"""---
+type: accounting_import_approval
+source: {source}
+pending_file: {pending_file}
+transactions: {len(transactions)}
+total: {total:.2f}
+requested: {datetime.now().isoformat()}
+status: pending
+---
+
+# Approval Required: {len(transactions)} imported transactions above {CURRENCY}{APPROVAL_THRESHOLD:,.2f}
+
+| Date       | Type    | Amount  | Description                           |
+|------------|---------|---------|---------------------------------------|
+{rows}
+**Total**: {CURRENCY}{total:,.2f}
+
+## Actions
+- To approve: run `python scripts/accounting_manager.py import --file {pending_file} --approved`
+- To reject: delete this file and {os.path.basename(pending_file)}
+
+---
+*Approval requested by Accounting Manager*
+""")
+
+    return approval_file
+
+
+def import_transactions(file_path, file_format=None, approved=False, dry_run=False):
+    """Import a CSV or OFX statement in one pass and one ledger write
+
+    Rows above APPROVAL_THRESHOLD are held back together in a single
+    approval request unless approved is set.
+    """
+    ensure_directories()
+
+    if not os.path.exists(file_path):
+        return {
+            "success": False,
+            "error": f"File not found: {file_path}"
+        }
+
+    if file_format is None:
+        file_format = 'ofx' if os.path.splitext(file_path)[1].lower() in ['.ofx', '.qfx'] else 'csv'
+
+    source = os.path.basename(file_path)
+    now = datetime.now()
+    accepted = []
+    needs_approval = []
+    invalid = []
+
+    with open(file_path, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+        rows = iter_ofx_rows(f) if file_format == 'ofx' else iter_csv_rows(f)
+
+        for line_number, row in rows:
+            try:
+                transaction = parse_import_row(row, source)
+            except (ValueError, KeyError) as e:
+                invalid.append({'line': line_number, 'error': str(e)})
+                continue
+
+            transaction['logged_at'] = now.isoformat()
+
+            if transaction['amount'] > APPROVAL_THRESHOLD and not approved:
+                needs_approval.append(transaction)
+            else:
+                accepted.append(transaction)
+
+    approval_file = None
+    if not dry_run:
+        initialize_current_month()
+
+        if accepted:
+            append_batch_to_ledger(accepted)
+            render_current_month()
+
+        if needs_approval:
+            approval_file = request_import_approval(source, needs_approval)
+
+        log_to_business_log(
+            f"Imported {len(accepted)} transactions from {source} "
+            f"({len(needs_approval)} held for approval, {len(invalid)} invalid)"
+        )
+
+    return {
+        "success": True,
+        "file": file_path,
+        "format": file_format,
+        "dry_run": dry_run,
+        "imported": len(accepted),
+        "income": round(sum(t['amount'] for t in accepted if t['type'] == 'income'), 2),
+        "expenses": round(sum(t['amount'] for t in accepted if t['type'] == 'expense'), 2),
+        "requires_approval": len(needs_approval),
+        "approval_file": approval_file,
+        "invalid": invalid
+    }
+
+
+def get_iso_week_key(week_start):
+    """ISO year-week (e.g. 2026-W42) identifying the week that starts on week_start"""
+    # Mid-week date, so Sunday- and Monday-start weeks map the same way
+    year, week, _ = (week_start + timedelta(days=3)).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def get_legacy_week_key(heading):
+    """Key for a '### Week N: Mon DD-DD, YYYY' block written before week markers"""
+    match = LEGACY_WEEK_HEADING_PATTERN.match(heading)
+    if match:
+        try:
+            week_start = datetime.strptime(f"{match.group(1)} {match.group(2)} {match.group(3)}", "%b %d %Y")
+            return get_iso_week_key(week_start)
+        except ValueError:
+            pass
+    return heading
+
+
+def split_weekly_summaries(section):
+    """Split the Weekly Summaries section into {week_key: block}
+
+    Blocks carry a '<!-- week:YYYY-Www -->' marker; older blocks without one
+    are keyed from their heading. The first block per week wins, which drops
+    the duplicates earlier versions appended on every run.
+    """
+    blocks = []
+    current = None
+
+    for line in section.split('\n'):
+        marker = WEEK_MARKER_PATTERN.match(line)
+        if marker:
+            current = [marker.group(1), [line]]
+            blocks.append(current)
+        elif line.startswith('### Week '):
+            if current and len(current[1]) == 1 and WEEK_MARKER_PATTERN.match(current[1][0]):
+                current[1].append(line)
+            else:
+                current = [get_legacy_week_key(line), [line]]
+                blocks.append(current)
+        elif current:
+            current[1].append(line)
+
+    weeks = {}
+    for key, lines in blocks:
+        if key not in weeks:
+            weeks[key] = '\n'.join(lines).strip('\n')
+
+    return weeks
+
+
+def upsert_weekly_summary(content, week_key, block):
+    """Insert or replace one week's block in Current_Month.md content"""
+    match = find_section(content, 'Weekly Summaries')
+    if match is None:
+        return content
+
+    weeks = split_weekly_summaries(match.group(1))
+    weeks[week_key] = f"<!-- week:{week_key} -->\n{block.strip()}"
+
+    return content[:match.start(1)] + join_weekly_summaries(weeks) + content[match.end(1):]
+
+
+def join_weekly_summaries(weeks):
+    """Weekly Summaries section body from {week_key: block}, newest week first"""
+    if not weeks:
+        return '\n\n'
+    return '\n' + '\n\n'.join(weeks[key] for key in sorted(weeks, reverse=True)) + '\n\n'
+
+
+def get_period_range(period, date=None):
+    """Return (start, end) dates for a query period ending around date"""
+    if date is None:
+        date = datetime.now()
+    date = date.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if period == 'week':
+        return get_week_range(date)
+    if period == 'month':
+        start = date.replace(day=1)
+        return start, (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    if period == 'quarter':
+        start = date.replace(month=(date.month - 1) // 3 * 3 + 1, day=1)
+        return start, (start + timedelta(days=95)).replace(day=1) - timedelta(days=1)
+    if period == 'year':
+        return date.replace(month=1, day=1), date.replace(month=12, day=31)
+    if period == 'rolling-30':
+        return date - timedelta(days=29), date
+
+    # 'all': from the first ledger month
+    months = [month for month, _ in iter_ledger_files()]
+    start = datetime.strptime(min(months), "%Y-%m") if months else date
+    return start, date
+
+
+def iter_months(start_date, end_date):
+    """Yield YYYY-MM for every month touching the range"""
+    month = start_date.replace(day=1)
+    while month <= end_date:
+        yield month.strftime("%Y-%m")
+        month = (month + timedelta(days=32)).replace(day=1)
+
+
+def read_ledger_file(ledger_file):
+    """Read every transaction from one ledger file, plain or gzipped"""
+    transactions = []
+    with open_ledger(ledger_file) as f:
+        for line in f:
+            try:
+                transactions.append(json.loads(line))
+            except ValueError:
+                continue
+    return transactions
+
+
+def load_query_rows(start_date, end_date):
+    """Load date/type/amount/category for the months in range
+
+    Closed months come from their columnar archive and open months (plus
+    late entries for closed ones) from the plain ledger, so no markdown is
+    parsed. Without NumPy, or without an archive, a closed month is read
+    from its gzipped ledger instead. Returns a list of column chunks, one
+    per source file.
+    """
+    epoch = datetime(1970, 1, 1)
+    chunks = []
+
+    for month in iter_months(start_date, end_date):
+        archive_file = get_columnar_archive_file(month)
+        ledger_file = get_ledger_file(datetime.strptime(month, "%Y-%m"))
+
+        if np is not None and os.path.exists(archive_file):
+            with np.load(archive_file) as data:
+                count = len(data['amount'])
+                chunks.append({
+                    'date': data['date'].astype('int64'),
+                    'type': data['type'].astype('int8'),
+                    'amount': data['amount'],
+                    'category': data['category'] if 'category' in data.files else np.full(count, DEFAULT_CATEGORY)
+                })
+            ledger_files = [ledger_file]
+        else:
+            ledger_files = [f"{ledger_file}.gz", ledger_file]
+
+        for path in ledger_files:
+            if not os.path.exists(path):
+                continue
+            transactions = read_ledger_file(path)
+            chunk = {
+                'date': [(datetime.strptime(t['date'], "%Y-%m-%d") - epoch).days for t in transactions],
+                'type': [TRANSACTION_TYPE_CODES[t['type']] for t in transactions],
+                'amount': [signed_amount(t) for t in transactions],
+                'category': [t.get('category') or DEFAULT_CATEGORY for t in transactions]
+            }
+            if np is not None:
+                chunk = {
+                    'date': np.array(chunk['date'], dtype='int64'),
+                    'type': np.array(chunk['type'], dtype='int8'),
+                    'amount': np.array(chunk['amount'], dtype='float64'),
+                    'category': np.array(chunk['category'], dtype=str)
+                }
+            chunks.append(chunk)
+
+    return chunks
+
+
+def group_label(group_by, day, category, trans_type):
+    """Group key for one row in the pure-Python query path"""
+    if group_by == 'type':
+        return 'income' if trans_type == 0 else 'expense'
+    if group_by == 'category':
+        return category
+    date = datetime(1970, 1, 1) + timedelta(days=day)
+    if group_by == 'month':
+        return date.strftime("%Y-%m")
+    if group_by == 'quarter':
+        return f"{date.year}-Q{(date.month - 1) // 3 + 1}"
+    return str(date.year)
+
+
+def aggregate_numpy(chunks, start_day, end_day, group_by):
+    """Filter and group the columns with vectorized NumPy operations"""
+    dates = np.concatenate([c['date'] for c in chunks])
+    types = np.concatenate([c['type'] for c in chunks])
+    amounts = np.concatenate([c['amount'] for c in chunks])
+    categories = np.concatenate([np.asarray(c['category'], dtype=str) for c in chunks])
+
+    mask = (dates >= start_day) & (dates <= end_day)
+    dates, types, amounts, categories = dates[mask], types[mask], amounts[mask], categories[mask]
+
+    income = np.where(types == 0, amounts, 0.0)
+    expenses = np.where(types == 1, amounts, 0.0)
+    totals = (float(income.sum()), float(expenses.sum()), int(len(amounts)))
+
+    if not group_by:
+        return totals, []
+
+    if group_by == 'type':
+        labels, keys = np.array(['income', 'expense']), types.astype('int64')
+    elif group_by == 'category':
+        labels, keys = np.unique(categories, return_inverse=True)
+    else:
+        months = dates.astype('datetime64[D]').astype('datetime64[M]').astype('int64')
+        if group_by == 'month':
+            codes = months
+        elif group_by == 'quarter':
+            codes = months // 3
+        else:
+            codes = months // 12
+        unique_codes, keys = np.unique(codes, return_inverse=True)
+        if group_by == 'month':
+            labels = np.datetime_as_string(unique_codes.astype('datetime64[M]'))
+        elif group_by == 'quarter':
+            labels = [f"{1970 + code // 4}-Q{code % 4 + 1}" for code in unique_codes.tolist()]
+        else:
+            labels = [str(1970 + code) for code in unique_codes.tolist()]
+
+    size = len(labels)
+    group_income = np.bincount(keys, weights=income, minlength=size)
+    group_expenses = np.bincount(keys, weights=expenses, minlength=size)
+    group_count = np.bincount(keys, minlength=size)
+
+    groups = [
+        (str(labels[i]), float(group_income[i]), float(group_expenses[i]), int(group_count[i]))
+        for i in range(size) if group_count[i]
+    ]
+    return totals, groups
+
+
+def aggregate_python(chunks, start_day, end_day, group_by):
+    """Filter and group the columns row by row (used without NumPy)"""
+    income_total = expenses_total = 0.0
+    count = 0
+    groups = {}
+
+    for chunk in chunks:
+        for day, trans_type, amount, category in zip(chunk['date'], chunk['type'], chunk['amount'], chunk['category']):
+            if not start_day <= day <= end_day:
+                continue
+
+            count += 1
+            if trans_type == 0:
+                income_total += amount
+            else:
+                expenses_total += amount
+
+            if group_by:
+                label = group_label(group_by, day, category, trans_type)
+                group = groups.setdefault(label, [0.0, 0.0, 0])
+                group[0 if trans_type == 0 else 1] += amount
+                group[2] += 1
+
+    return (income_total, expenses_total, count), [(label, *values) for label, values in groups.items()]
+
+
+def query_transactions(period='month', date=None, start_date=None, end_date=None, group_by=None):
+    """Income, expenses and net for a period, optionally grouped
+
+    Periods: week, month, quarter, year, rolling-30 (ending on date) or all;
+    an explicit start_date/end_date overrides the period. Groups: type,
+    category, month, quarter or year.
+    """
+    if start_date is None or end_date is None:
+        start_date, end_date = get_period_range(period, date)
+    else:
+        period = 'custom'
+
+    epoch = datetime(1970, 1, 1)
+    start_day = (start_date.replace(hour=0, minute=0, second=0, microsecond=0) - epoch).days
+    end_day = (end_date.replace(hour=0, minute=0, second=0, microsecond=0) - epoch).days
+
+    chunks = load_query_rows(start_date, end_date)
+
+    if not chunks:
+        totals, groups = (0.0, 0.0, 0), []
+    elif np is not None:
+        totals, groups = aggregate_numpy(chunks, start_day, end_day, group_by)
+    else:
+        totals, groups = aggregate_python(chunks, start_day, end_day, group_by)
+
+    income, expenses, count = totals
+
+    return {
+        "success": True,
+        "period": period,
+        "start": start_date.strftime("%Y-%m-%d"),
+        "end": end_date.strftime("%Y-%m-%d"),
+        "income": round(income, 2),
+        "expenses": round(expenses, 2),
+        "net": round(income - expenses, 2),
+        "transaction_count": count,
+        "group_by": group_by,
+        "groups": [
+            {
+                "key": label,
+                "income": round(group_income, 2),
+                "expenses": round(group_expenses, 2),
+                "net": round(group_income - group_expenses, 2),
+                "count": group_count
+            }
+            for label, group_income, group_expenses, group_count in sorted(groups)
+        ]
+    }
+
+
 def generate_summary(period='week'):
     """Generate financial summary for week or month"""
     ensure_directories()
-    initialize_current_month()
-
-    transactions = parse_current_month_file()
+    refresh_current_month()
 
     if period == 'week':
         week_start, week_end = get_week_range()
         week_num = get_week_number(datetime.now())
-        summary = calculate_weekly_summary(transactions, week_start, week_end)
-
-        # Update Current_Month.md with weekly summary
-        with open(CURRENT_MONTH_FILE, 'r', encoding='utf-8') as f:
-            content = f.read()
+        summary = get_rollup('week', week_start.strftime("%Y-%m-%d"))
 
         week_summary_text = f"""
 ### Week {week_num}: {week_start.strftime('%b %d')}-{week_end.strftime('%d, %Y')}
@@ -303,15 +1353,19 @@ def generate_summary(period='week'):
 - **Transaction Count**: {summary['count']}
 """
 
-        # Insert or update weekly summary
-        if '## Weekly Summaries' in content:
-            content = content.replace(
-                '## Weekly Summaries',
-                f"## Weekly Summaries{week_summary_text}"
-            )
+        # Update Current_Month.md with weekly summary; the lock keeps a
+        # concurrent render from dropping it
+        with accounting_lock():
+            with open(CURRENT_MONTH_FILE, 'r', encoding='utf-8') as f:
+                content = f.read()
 
-        with open(CURRENT_MONTH_FILE, 'w', encoding='utf-8') as f:
-            f.write(content)
+            # Insert or update this week's summary in place
+            content = upsert_weekly_summary(content, get_iso_week_key(week_start), week_summary_text)
+
+            temp_file = f"{CURRENT_MONTH_FILE}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(temp_file, CURRENT_MONTH_FILE)
 
         log_to_business_log(f"Generated weekly summary: Week {week_num}")
 
@@ -325,7 +1379,7 @@ def generate_summary(period='week'):
         }
 
     elif period == 'month':
-        totals = calculate_totals(transactions)
+        totals = get_rollup('month', datetime.now().strftime("%Y-%m"))
         month_name = datetime.now().strftime("%B %Y")
 
         log_to_business_log(f"Generated monthly summary: {month_name}")
@@ -349,10 +1403,9 @@ def generate_summary(period='week'):
 def show_totals():
     """Show current monthly totals"""
     ensure_directories()
-    initialize_current_month()
+    refresh_current_month()
 
-    transactions = parse_current_month_file()
-    totals = calculate_totals(transactions)
+    totals = get_rollup('month', datetime.now().strftime("%Y-%m"))
     month_name = datetime.now().strftime("%B %Y")
 
     return {
@@ -365,19 +1418,50 @@ def show_totals():
     }
 
 
-def validate_file():
-    """Validate Current_Month.md for consistency"""
+def compare_rollups(stored, computed):
+    """List buckets whose stored rollup differs from a full recompute"""
+    mismatches = []
+
+    for period in ROLLUP_PERIODS:
+        for key in sorted(set(stored[period]) | set(computed[period])):
+            stored_bucket = stored[period].get(key)
+            computed_bucket = computed[period].get(key)
+
+            if stored_bucket is None or computed_bucket is None or any(
+                abs(stored_bucket[field] - computed_bucket[field]) >= 0.01
+                for field in ['income', 'expenses', 'count']
+            ):
+                mismatches.append({
+                    'period': period,
+                    'key': key,
+                    'stored': stored_bucket,
+                    'computed': computed_bucket
+                })
+
+    return mismatches
+
+
+def validate_file(recompute=False, rebuild=False):
+    """Validate Current_Month.md for consistency
+
+    With recompute, the stored rollups are also checked against a full
+    pass over the ledgers; with rebuild they are replaced by one.
+    """
     ensure_directories()
-    initialize_current_month()
+    refresh_current_month()
+
+    if rebuild:
+        rebuild_rollups()
 
-    transactions = parse_current_month_file()
-    calculated_totals = calculate_totals(transactions)
+    rollups = sync_rollups()
+    calculated_totals = get_rollup('month', datetime.now().strftime("%Y-%m"), rollups)
 
     # Read stated totals from file
     with open(CURRENT_MONTH_FILE, 'r', encoding='utf-8') as f:
         content = f.read()
 
-    # Extract stated totals
+    # Extract stated totals (weekly summaries use the same labels)
+    content = get_section(content, 'Monthly Totals')
     income_match = re.search(r'\*\*Total Income\*\*:\s*\$?([\d,]+\.?\d*)', content)
     expenses_match = re.search(r'\*\*Total Expenses\*\*:\s*\$?([\d,]+\.?\d*)', content)
 
@@ -389,7 +1473,7 @@ def validate_file():
         abs(stated_expenses - calculated_totals['expenses']) < 0.01
     )
 
-    return {
+    result = {
         "success": True,
         "valid": is_valid,
         "calculated": calculated_totals,
@@ -400,6 +1484,17 @@ def validate_file():
         }
     }
 
+    if recompute:
+        mismatches = compare_rollups(rollups, compute_rollups())
+        result["rollups_valid"] = not mismatches
+        result["rollup_mismatches"] = mismatches
+        result["valid"] = is_valid and not mismatches
+
+    if rebuild:
+        result["rollups_rebuilt"] = True
+
+    return result
+
 
 def main():
     """Main function"""
@@ -411,6 +1506,7 @@ def main():
     log_parser.add_argument('--type', required=True, choices=['income', 'expense'], help='Transaction type')
     log_parser.add_argument('--amount', required=True, type=float, help='Transaction amount')
     log_parser.add_argument('--description', required=True, help='Transaction description')
+    log_parser.add_argument('--category', help='Transaction category')
 
     # Generate summary
     summary_parser = subparsers.add_parser('summary', help='Generate summary')
@@ -420,18 +1516,56 @@ def main():
     subparsers.add_parser('totals', help='Show current totals')
 
     # Validate
-    subparsers.add_parser('validate', help='Validate accounting file')
+    validate_parser = subparsers.add_parser('validate', help='Validate accounting file')
+    validate_parser.add_argument('--recompute', action='store_true', help='Check rollups against a full recompute')
+    validate_parser.add_argument('--rebuild', action='store_true', help='Rebuild rollups from the ledgers')
+
+    # Import statement
+    import_parser = subparsers.add_parser('import', help='Import transactions from a CSV or OFX statement')
+    import_parser.add_argument('--file', required=True, help='Statement file')
+    import_parser.add_argument('--format', choices=['csv', 'ofx'], help='File format (default: from extension)')
+    import_parser.add_argument('--approved', action='store_true', help='Import rows above the approval threshold too')
+    import_parser.add_argument('--dry-run', action='store_true', help='Validate without writing')
+
+    # Query
+    query_parser = subparsers.add_parser('query', help='Totals for a period across the ledger and archives')
+    query_parser.add_argument('--period', choices=QUERY_PERIODS, default='month', help='Query period')
+    query_parser.add_argument('--date', help='Reference date YYYY-MM-DD (default: today)')
+    query_parser.add_argument('--start', help='Start date YYYY-MM-DD (overrides --period)')
+    query_parser.add_argument('--end', help='End date YYYY-MM-DD (overrides --period)')
+    query_parser.add_argument('--group-by', choices=QUERY_GROUPS, help='Break totals down by this field')
+
+    # Rollover
+    subparsers.add_parser('rollover', help='Archive closed months and start the current month file')
+
+    # Render
+    subparsers.add_parser('render', help='Re-render Current_Month.md from the ledger')
 
     args = parser.parse_args()
 
     if args.command == 'log':
-        result = log_transaction(args.type, args.amount, args.description)
+        result = log_transaction(args.type, args.amount, args.description, args.category)
     elif args.command == 'summary':
         result = generate_summary(args.period)
     elif args.command == 'totals':
         result = show_totals()
     elif args.command == 'validate':
-        result = validate_file()
+        result = validate_file(args.recompute, args.rebuild)
+    elif args.command == 'import':
+        result = import_transactions(args.file, args.format, args.approved, args.dry_run)
+    elif args.command == 'query':
+        dates = [datetime.strptime(value, "%Y-%m-%d") if value else None for value in [args.date, args.start, args.end]]
+        result = query_transactions(args.period, *dates, group_by=args.group_by)
+    elif args.command == 'rollover':
+        ensure_directories()
+        migrate_current_month()
+        result = {"success": True, "archived": rollover_months()}
+        initialize_current_month()
+    elif args.command == 'render':
+        ensure_directories()
+        initialize_current_month()
+        render_current_month()
+        result = {"success": True, "file": CURRENT_MONTH_FILE, "transaction_count": len(read_ledger())}
     else:
         parser.print_help()
         return
@@ -12,6 +12,11 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import re
 import subprocess
+from collections import deque
+
+import accounting_manager
+import social_summary
+from log_segments import iter_lines
 
 
 # Configuration
@@ -101,27 +106,24 @@ def get_email_activity(week_start, week_end):
     emails = []
     log_file = os.path.join(LOGS_PATH, "business.log")
 
-    if not os.path.exists(log_file):
-        return emails
-
     try:
-        with open(log_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if 'Email sent to' in line:
-                    # Parse timestamp
-                    match = re.search(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]', line)
-                    if match:
-                        timestamp = datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S')
-                        if week_start <= timestamp <= week_end + timedelta(days=1):
-                            # Extract recipient
-                            recipient_match = re.search(r'Email sent to ([^\s]+)', line)
-                            subject_match = re.search(r'with subject: (.+)', line)
-
-                            emails.append({
-                                'date': timestamp.strftime('%Y-%m-%d'),
-                                'recipient': recipient_match.group(1) if recipient_match else 'Unknown',
-                                'subject': subject_match.group(1) if subject_match else 'No subject'
-                            })
+        # Only archived segments overlapping the week are opened
+        for line in iter_lines(log_file, week_start, week_end + timedelta(days=1)):
+            if 'Email sent to' in line:
+                # Parse timestamp
+                match = re.search(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]', line)
+                if match:
+                    timestamp = datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S')
+                    if week_start <= timestamp <= week_end + timedelta(days=1):
+                        # Extract recipient
+                        recipient_match = re.search(r'Email sent to ([^\s]+)', line)
+                        subject_match = re.search(r'with subject: (.+)', line)
+
+                        emails.append({
+                            'date': timestamp.strftime('%Y-%m-%d'),
+                            'recipient': recipient_match.group(1) if recipient_match else 'Unknown',
+                            'subject': subject_match.group(1) if subject_match else 'No subject'
+                        })
     except Exception as e:
         pass
 
@@ -133,25 +135,22 @@ def get_linkedin_activity(week_start, week_end):
     posts = []
     log_file = os.path.join(LOGS_PATH, "business.log")
 
-    if not os.path.exists(log_file):
-        return posts
-
     try:
-        with open(log_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if 'LinkedIn post created' in line:
-                    # Parse timestamp
-                    match = re.search(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]', line)
-                    if match:
-                        timestamp = datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S')
-                        if week_start <= timestamp <= week_end + timedelta(days=1):
-                            # Extract content preview
-                            content_match = re.search(r'LinkedIn post created: (.+)', line)
-
-                            posts.append({
-                                'date': timestamp.strftime('%Y-%m-%d'),
-                                'content': content_match.group(1) if content_match else 'No content'
-                            })
+        # Only archived segments overlapping the week are opened
+        for line in iter_lines(log_file, week_start, week_end + timedelta(days=1)):
+            if 'LinkedIn post created' in line:
+                # Parse timestamp
+                match = re.search(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]', line)
+                if match:
+                    timestamp = datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S')
+                    if week_start <= timestamp <= week_end + timedelta(days=1):
+                        # Extract content preview
+                        content_match = re.search(r'LinkedIn post created: (.+)', line)
+
+                        posts.append({
+                            'date': timestamp.strftime('%Y-%m-%d'),
+                            'content': content_match.group(1) if content_match else 'No content'
+                        })
     except Exception as e:
         pass
 
@@ -159,24 +158,16 @@ def get_linkedin_activity(week_start, week_end):
 
 
 def get_financial_summary(week_start, week_end):
-    """Get financial summary from accounting manager"""
+    """Get financial summary for the week from the accounting rollups"""
     try:
-        result = subprocess.run(
-            ['python', 'scripts/accounting_manager.py', 'summary', '--period', 'week'],
-            capture_output=True,
-            text=True,
-            cwd=os.path.join(os.path.dirname(__file__), '..')
-        )
+        totals = accounting_manager.get_range_totals(week_start, week_end)
 
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-        else:
-            return {
-                'income': 0,
-                'expenses': 0,
-                'net': 0,
-                'transaction_count': 0
-            }
+        return {
+            'income': totals['income'],
+            'expenses': totals['expenses'],
+            'net': totals['net'],
+            'transaction_count': totals['count']
+        }
     except Exception as e:
         return {
             'income': 0,
@@ -186,6 +177,27 @@ def get_financial_summary(week_start, week_end):
         }
 
 
+def get_financial_trends(week_end):
+    """Get quarter-to-date and rolling 30-day figures from the accounting query engine"""
+    try:
+        quarter = accounting_manager.query_transactions('quarter', week_end)
+        rolling = accounting_manager.query_transactions('rolling-30', week_end, group_by='category')
+
+        top_expenses = sorted(
+            (g for g in rolling['groups'] if g['expenses'] > 0),
+            key=lambda g: g['expenses'],
+            reverse=True
+        )[:3]
+
+        return {
+            'quarter': quarter,
+            'rolling_30': rolling,
+            'top_expense_categories': top_expenses
+        }
+    except Exception as e:
+        return None
+
+
 def get_pending_approvals():
     """Get count of pending approvals"""
     if not os.path.exists(NEEDS_APPROVAL_PATH):
@@ -224,11 +236,10 @@ def get_system_health():
 
     if os.path.exists(log_file):
         try:
+            # Count recent errors (last 100 lines of the active segment)
             with open(log_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+                recent_lines = list(deque(f, maxlen=100))
 
-            # Count recent errors (last 100 lines)
-            recent_lines = lines[-100:] if len(lines) > 100 else lines
             error_count = sum(1 for line in recent_lines if 'ERROR' in line or 'error' in line.lower())
 
             health['errors'] = [
@@ -259,7 +270,9 @@ def generate_briefing(week_start=None, week_end=None):
     tasks = get_completed_tasks(week_start, week_end)
     emails = get_email_activity(week_start, week_end)
     linkedin = get_linkedin_activity(week_start, week_end)
+    social = social_summary.get_social_activity(week_start, week_end) if social_summary.CEO_INTEGRATION else None
     financial = get_financial_summary(week_start, week_end)
+    trends = get_financial_trends(week_end)
     pending_approvals = get_pending_approvals()
     in_progress = get_in_progress_tasks()
     system_health = get_system_health()
@@ -272,6 +285,9 @@ def generate_briefing(week_start=None, week_end=None):
     # Generate report
     now = datetime.now()
     week_str = f"{week_start.strftime('%B %d')}-{week_end.strftime('%d, %Y')}"
+    social_row = ''
+    if social:
+        social_row = f"| Social Posts | {social['total_posts']} | {'✓' if social['total_posts'] > 0 else '-'} |\n"
 
     report = f"""# CEO Weekly Briefing
 **Week of {week_str}**
@@ -293,7 +309,7 @@ Generated: {now.strftime('%Y-%m-%d %H:%M:%S')}
 | Tasks Completed | {len(tasks)} | {"✓" if len(tasks) > 0 else "-"} |
 | Emails Sent | {len(emails)} | {"✓" if len(emails) > 0 else "-"} |
 | LinkedIn Posts | {len(linkedin)} | {"✓" if len(linkedin) > 0 else "-"} |
-| Net Profit | ${financial.get('net', 0):,.2f} | {"✓" if financial.get('net', 0) > 0 else "⚠"} |
+{social_row}| Net Profit | ${financial.get('net', 0):,.2f} | {"✓" if financial.get('net', 0) > 0 else "⚠"} |
 | Pending Approvals | {pending_approvals} | {"⚠" if pending_approvals > 0 else "✓"} |
 
 ---
@@ -348,6 +364,15 @@ Generated: {now.strftime('%Y-%m-%d %H:%M:%S')}
     else:
         report += "No LinkedIn posts this week.\n"
 
+    if social:
+        report += f"""
+### Social Media ({social['total_posts']} posts, {social['total_engagement']} interactions)
+- LinkedIn: {social['linkedin_posts']}
+- Facebook: {social['facebook_posts']}
+- Instagram: {social['instagram_posts']}
+- Twitter: {social['twitter_posts']}
+"""
+
     report += f"""
 ---
 
@@ -363,7 +388,21 @@ Generated: {now.strftime('%Y-%m-%d %H:%M:%S')}
 - **Net Profit**: ${financial.get('net', 0):,.2f}
 - **Profit Margin**: {(financial.get('net', 0) / financial.get('income', 1) * 100) if financial.get('income', 0) > 0 else 0:.1f}%
 - **Transaction Count**: {financial.get('transaction_count', 0)}
+"""
 
+    if trends:
+        quarter = trends['quarter']
+        rolling = trends['rolling_30']
+        report += f"""
+### Trends
+- **This Quarter** ({quarter['start']} to {quarter['end']}): ${quarter['income']:,.2f} income, ${quarter['expenses']:,.2f} expenses, ${quarter['net']:,.2f} net
+- **Last 30 Days**: ${rolling['income']:,.2f} income, ${rolling['expenses']:,.2f} expenses, ${rolling['net']:,.2f} net
+"""
+        if trends['top_expense_categories']:
+            categories = ", ".join(f"{g['key']} (${g['expenses']:,.2f})" for g in trends['top_expense_categories'])
+            report += f"- **Top Expense Categories (30 days)**: {categories}\n"
+
+    report += f"""
 ---
 
 ## Pending Items
@@ -487,6 +526,7 @@ Generated: {now.strftime('%Y-%m-%d %H:%M:%S')}
             "tasks_completed": len(tasks),
             "emails_sent": len(emails),
             "linkedin_posts": len(linkedin),
+            "social_posts": social['total_posts'] if social else None,
             "net_profit": financial.get('net', 0),
             "pending_approvals": pending_approvals
         }
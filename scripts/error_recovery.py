@@ -5,14 +5,23 @@ Handles error logging, task recovery, and automatic retry mechanisms
 """
 
 import os
+import re
 import sys
 import json
 import argparse
 import traceback
+import gzip
 import shutil
+import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 import time
+import random
+import hashlib
+
+from log_segments import SegmentedLog, iter_lines, parse_line_timestamp
+from send_email import send_batch
 
 
 # Configuration
@@ -20,14 +29,41 @@ VAULT_PATH = os.path.join(os.path.dirname(__file__), "..", "AI_Employee_Vault")
 ERRORS_PATH = os.path.join(VAULT_PATH, "Errors")
 LOGS_PATH = os.path.join(VAULT_PATH, "Logs")
 ERROR_LOG = os.path.join(LOGS_PATH, "error.log")
+ERROR_EVENTS_PATH = os.path.join(LOGS_PATH, "errors")
+LEGACY_IMPORT_MARKER = os.path.join(ERROR_EVENTS_PATH, ".legacy_error_log_imported")
 RETRY_STATE_FILE = os.path.join(ERRORS_PATH, ".retry_state.json")
+RETRY_DB = os.path.join(ERRORS_PATH, "retry_state.db")
 
 # Environment variables
 RETRY_DELAY = int(os.getenv('ERROR_RETRY_DELAY', '300'))  # 5 minutes
 MAX_RETRIES = int(os.getenv('ERROR_MAX_RETRIES', '3'))
 EXPONENTIAL_BACKOFF = os.getenv('ERROR_EXPONENTIAL_BACKOFF', 'true').lower() == 'true'
 ALERT_EMAIL = os.getenv('ERROR_ALERT_EMAIL', '')
+ALERT_WINDOW = int(os.getenv('ERROR_ALERT_WINDOW', '900'))  # Seconds alerts are batched before a digest
+ALERT_SAMPLE_TASKS = 10
+
+# Variable parts stripped from messages and stack traces before fingerprinting
+FINGERPRINT_PATTERNS = [
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', re.IGNORECASE), '<uuid>'),
+    (re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?'), '<ts>'),
+    (re.compile(r'\d{4}-\d{2}-\d{2}|\d{2}:\d{2}:\d{2}'), '<ts>'),
+    (re.compile(r'"[^"]*"|\'[^\']*\''), '<str>'),
+    (re.compile(r'(?:[A-Za-z]:)?(?:[\\/][\w.\-]+){2,}'), '<path>'),
+    (re.compile(r'\b0x[0-9a-f]+\b|\b[0-9a-f]{8,}\b', re.IGNORECASE), '<hex>'),
+    (re.compile(r'\d+'), '<n>'),
+    (re.compile(r'\s+'), ' ')
+]
+STACK_FRAME_PATTERN = re.compile(r'File "([^"]+)", line \d+, in (\S+)')
+LEGACY_ERROR_PATTERN = re.compile(r'^ERROR \| Task: (.*?) \| Type: (.*?) \| Message: (.*)$')
 LOG_MAX_SIZE = int(os.getenv('ERROR_LOG_MAX_SIZE', '10')) * 1024 * 1024  # MB to bytes
+LOG_ROTATE_DAYS = float(os.getenv('ERROR_LOG_ROTATE_DAYS', '7'))
+RETRY_JITTER = float(os.getenv('ERROR_RETRY_JITTER', '0.2'))  # +/- fraction of the delay
+RETRY_CONCURRENCY = int(os.getenv('ERROR_RETRY_CONCURRENCY', '5'))
+RETRY_LEASE = int(os.getenv('ERROR_RETRY_LEASE', '3600'))  # Seconds a retry counts as in flight
+BREAKER_THRESHOLD = int(os.getenv('ERROR_BREAKER_THRESHOLD', '5'))
+BREAKER_COOLDOWN = int(os.getenv('ERROR_BREAKER_COOLDOWN', '600'))
+
+_error_log = None
 
 
 def ensure_directories():
@@ -36,24 +72,173 @@ def ensure_directories():
     os.makedirs(LOGS_PATH, exist_ok=True)
 
 
-def rotate_log_if_needed():
-    """Rotate error log if it exceeds max size"""
-    if os.path.exists(ERROR_LOG) and os.path.getsize(ERROR_LOG) > LOG_MAX_SIZE:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        archive_name = os.path.join(LOGS_PATH, f"error_{timestamp}.log")
-        shutil.move(ERROR_LOG, archive_name)
+def get_error_log():
+    """Segmented error.log writer, rotated into Logs/archive on size or age"""
+    global _error_log
+    if _error_log is None or _error_log.log_file != ERROR_LOG:
+        _error_log = SegmentedLog(ERROR_LOG, LOG_MAX_SIZE, LOG_ROTATE_DAYS)
+    return _error_log
 
 
 def log_to_error_log(message):
     """Write message to error.log"""
     ensure_directories()
-    rotate_log_if_needed()
 
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     log_entry = f"[{timestamp}] {message}\n"
 
-    with open(ERROR_LOG, 'a', encoding='utf-8') as f:
-        f.write(log_entry)
+    get_error_log().append(log_entry)
+
+
+def get_event_segment(day):
+    """Path of the JSONL segment holding error events for a given day"""
+    return os.path.join(ERROR_EVENTS_PATH, f"errors_{day.strftime('%Y-%m-%d')}.jsonl")
+
+
+def write_error_event(event, task_id, **fields):
+    """Append a structured error event to today's JSONL segment"""
+    ensure_directories()
+    os.makedirs(ERROR_EVENTS_PATH, exist_ok=True)
+
+    now = datetime.now()
+    record = {'ts': now.isoformat(), 'event': event, 'task': task_id}
+    record.update(fields)
+
+    with open(get_event_segment(now), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, default=str) + '\n')
+
+
+def iter_error_events(start_date, end_date=None):
+    """Yield error events between start_date and end_date
+
+    Segments are daily, so only the files for days inside the window are opened.
+    """
+    end_date = end_date or datetime.now()
+    start_ts = start_date.isoformat()
+    end_ts = end_date.isoformat()
+
+    day = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day <= end_date:
+        segment = get_event_segment(day)
+        day += timedelta(days=1)
+
+        if os.path.exists(segment):
+            f = open(segment, 'r', encoding='utf-8')
+        elif os.path.exists(segment + '.gz'):
+            f = gzip.open(segment + '.gz', 'rt', encoding='utf-8')
+        else:
+            continue
+
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if start_ts <= record['ts'] <= end_ts:
+                    yield record
+
+
+def get_first_event_time():
+    """Timestamp of the oldest structured error event, or None"""
+    if not os.path.exists(ERROR_EVENTS_PATH):
+        return None
+
+    for filename in sorted(os.listdir(ERROR_EVENTS_PATH)):
+        segment = os.path.join(ERROR_EVENTS_PATH, filename)
+        if filename.endswith('.jsonl'):
+            f = open(segment, 'r', encoding='utf-8')
+        elif filename.endswith('.jsonl.gz'):
+            f = gzip.open(segment, 'rt', encoding='utf-8')
+        else:
+            continue
+
+        with f:
+            for line in f:
+                try:
+                    return datetime.fromisoformat(json.loads(line)['ts'])
+                except (ValueError, KeyError):
+                    continue
+
+    return None
+
+
+def import_legacy_error_log():
+    """Copy errors logged before the JSONL segments existed into them, once
+
+    Only error.log entries older than the first structured event are
+    imported, each into the segment for its own day, so reports keep
+    counting the earlier history.
+    """
+    if os.path.exists(LEGACY_IMPORT_MARKER):
+        return 0
+
+    os.makedirs(ERROR_EVENTS_PATH, exist_ok=True)
+    # error.log timestamps have no fractional seconds
+    cutoff = (get_first_event_time() or datetime.now()).replace(microsecond=0)
+    by_day = {}
+    current = None
+
+    for line in iter_lines(ERROR_LOG, end_date=cutoff):
+        timestamp = parse_line_timestamp(line)
+        if timestamp is None or timestamp >= cutoff:
+            continue
+
+        message = line.split('] ', 1)[-1].strip()
+        error = LEGACY_ERROR_PATTERN.match(message)
+        if error:
+            current = {
+                'ts': timestamp.isoformat(),
+                'event': 'error',
+                'task': error.group(1),
+                'type': error.group(2),
+                'message': error.group(3),
+                'source': 'error.log'
+            }
+            by_day.setdefault(timestamp.date(), []).append(current)
+        elif message.startswith('PERMANENT_FAILURE |') and current:
+            current['status'] = 'permanent_failure'
+        elif message == '---':
+            current = None
+
+    for day, records in by_day.items():
+        segment = get_event_segment(day)
+        data = ''.join(json.dumps(record) + '\n' for record in records)
+        if not os.path.exists(segment) and os.path.exists(segment + '.gz'):
+            with gzip.open(segment + '.gz', 'at', encoding='utf-8') as f:
+                f.write(data)
+        else:
+            with open(segment, 'a', encoding='utf-8') as f:
+                f.write(data)
+
+    with open(LEGACY_IMPORT_MARKER, 'w', encoding='utf-8') as f:
+        f.write(datetime.now().isoformat())
+
+    imported = sum(len(records) for records in by_day.values())
+    if imported:
+        log_to_business_log(f"Imported {imported} legacy error.log entries into the error event segments")
+    return imported
+
+
+def compress_event_segments():
+    """Gzip daily event segments for days that are already closed"""
+    if not os.path.exists(ERROR_EVENTS_PATH):
+        return 0
+
+    today = get_event_segment(datetime.now())
+    compressed = 0
+
+    for filename in os.listdir(ERROR_EVENTS_PATH):
+        segment = os.path.join(ERROR_EVENTS_PATH, filename)
+        if not filename.endswith('.jsonl') or segment == today:
+            continue
+
+        with open(segment, 'rb') as src, gzip.open(segment + '.gz', 'ab') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(segment)
+        compressed += 1
+
+    return compressed
 
 
 def log_to_business_log(message):
@@ -69,32 +254,390 @@ def log_to_business_log(message):
         pass
 
 
-def get_retry_state():
-    """Load retry state from file"""
+RETRY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS retries (
+    task_id TEXT PRIMARY KEY,
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    error_type TEXT,
+    error_message TEXT,
+    first_error TEXT,
+    last_error TEXT,
+    original_location TEXT,
+    status TEXT,
+    next_retry REAL,
+    error_file TEXT,
+    content_offset INTEGER,
+    content_length INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_retries_status ON retries (status);
+CREATE INDEX IF NOT EXISTS idx_retries_next_retry ON retries (status, next_retry);
+CREATE TABLE IF NOT EXISTS breakers (
+    error_type TEXT PRIMARY KEY,
+    state TEXT NOT NULL DEFAULT 'closed',
+    failures INTEGER NOT NULL DEFAULT 0,
+    last_failure REAL,
+    opened_at REAL,
+    probe_task TEXT
+);
+CREATE TABLE IF NOT EXISTS clusters (
+    fingerprint TEXT PRIMARY KEY,
+    error_type TEXT,
+    signature TEXT,
+    example TEXT,
+    count INTEGER NOT NULL DEFAULT 0,
+    first_seen TEXT,
+    last_seen TEXT,
+    last_task TEXT
+);
+CREATE TABLE IF NOT EXISTS alerts (
+    error_type TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0,
+    first_seen REAL,
+    last_seen REAL,
+    last_message TEXT,
+    tasks TEXT,
+    delivered TEXT
+);
+"""
+
+# Columns added after the first release of retry_state.db
+RETRY_ADDED_COLUMNS = {
+    'error_file': 'TEXT',
+    'content_offset': 'INTEGER',
+    'content_length': 'INTEGER'
+}
+ALERT_ADDED_COLUMNS = {
+    'delivered': 'TEXT'  # JSON list of recipients that already got the row's current content
+}
+
+_retry_db = None
+
+
+def get_retry_db():
+    """Open the retry state database, migrating the old JSON state on first use"""
+    global _retry_db
+
+    if _retry_db is None:
+        ensure_directories()
+
+        # Autocommit mode; writes go through retry_transaction()
+        conn = sqlite3.connect(RETRY_DB, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(RETRY_SCHEMA)
+
+        for table, added_columns in [('retries', RETRY_ADDED_COLUMNS), ('alerts', ALERT_ADDED_COLUMNS)]:
+            existing = {row['name'] for row in conn.execute(f'PRAGMA table_info({table})')}
+            for column, column_type in added_columns.items():
+                if column not in existing:
+                    conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+
+        _retry_db = conn
+
+        migrate_json_retry_state()
+
+    return _retry_db
+
+
+@contextmanager
+def retry_transaction():
+    """Run a read-modify-write on the retry state atomically
+
+    BEGIN IMMEDIATE takes the write lock up front, so concurrent error
+    loggers queue behind each other instead of overwriting each other.
+    """
+    conn = get_retry_db()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield conn
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    else:
+        conn.execute('COMMIT')
+
+
+def migrate_json_retry_state():
+    """Import .retry_state.json into the database once"""
     if not os.path.exists(RETRY_STATE_FILE):
-        return {}
+        return
 
     try:
         with open(RETRY_STATE_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            legacy_state = json.load(f)
     except Exception:
-        return {}
+        legacy_state = {}
+
+    with retry_transaction() as conn:
+        for task_id, info in legacy_state.items():
+            next_retry = info.get('next_retry')
+            conn.execute(
+                """INSERT OR IGNORE INTO retries
+                   (task_id, retry_count, error_type, error_message, first_error,
+                    original_location, status, next_retry)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    task_id,
+                    info.get('retry_count', 0),
+                    info.get('error_type'),
+                    info.get('error_message'),
+                    info.get('first_error'),
+                    info.get('original_location', 'unknown'),
+                    info.get('status'),
+                    datetime.fromisoformat(next_retry).timestamp() if next_retry and next_retry != 'N/A' else None
+                )
+            )
+
+    os.replace(RETRY_STATE_FILE, f"{RETRY_STATE_FILE}.migrated")
+
+    legacy_queue_file = os.path.join(ERRORS_PATH, ".retry_queue.json")
+    if os.path.exists(legacy_queue_file):
+        os.remove(legacy_queue_file)
+
+    log_to_business_log(f"Migrated {len(legacy_state)} retry entries to {os.path.basename(RETRY_DB)}")
+
+
+def row_to_retry_info(row):
+    """Convert a retries row to the dict shape used by callers"""
+    info = dict(row)
+    info['next_retry'] = datetime.fromtimestamp(row['next_retry']).isoformat() if row['next_retry'] else 'N/A'
+    return info
+
+
+def get_retry_info(task_id):
+    """Load one task's retry info, or None"""
+    row = get_retry_db().execute('SELECT * FROM retries WHERE task_id = ?', (task_id,)).fetchone()
+    return row_to_retry_info(row) if row else None
 
 
-def save_retry_state(state):
-    """Save retry state to file"""
-    ensure_directories()
+def get_retry_state():
+    """Load the full retry state as a dict keyed by task_id"""
+    rows = get_retry_db().execute('SELECT * FROM retries')
+    return {row['task_id']: row_to_retry_info(row) for row in rows}
+
+
+def get_status_counts():
+    """Count retry entries by status"""
+    rows = get_retry_db().execute('SELECT status, COUNT(*) FROM retries GROUP BY status')
+    return {status: count for status, count in rows}
+
 
-    with open(RETRY_STATE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(state, indent=2, fp=f)
+def get_next_retry_time():
+    """Return when the earliest pending retry is due, or None"""
+    row = get_retry_db().execute(
+        "SELECT MIN(next_retry) FROM retries WHERE status = 'pending_retry'"
+    ).fetchone()
+    return datetime.fromtimestamp(row[0]) if row[0] is not None else None
+
+
+def add_jitter(delay):
+    """Spread a delay by +/- RETRY_JITTER so retries do not fire in lockstep"""
+    return delay * random.uniform(1 - RETRY_JITTER, 1 + RETRY_JITTER)
 
 
 def calculate_retry_delay(attempt):
-    """Calculate retry delay with optional exponential backoff"""
+    """Calculate retry delay with optional exponential backoff and jitter"""
     if EXPONENTIAL_BACKOFF:
-        return RETRY_DELAY * (2 ** (attempt - 1))
+        return add_jitter(RETRY_DELAY * (2 ** (attempt - 1)))
+    else:
+        return add_jitter(RETRY_DELAY)
+
+
+def get_breakers():
+    """Return the circuit breaker state for every error type seen"""
+    rows = get_retry_db().execute('SELECT * FROM breakers ORDER BY error_type')
+    return [
+        {
+            'error_type': row['error_type'],
+            'state': row['state'],
+            'failures': row['failures'],
+            'opened_at': datetime.fromtimestamp(row['opened_at']).isoformat() if row['opened_at'] else None,
+            'probe_task': row['probe_task']
+        }
+        for row in rows
+    ]
+
+
+def record_breaker_failure(conn, error_type, now):
+    """Count a failure against an error type's breaker, opening it at the threshold
+
+    Failures further apart than the cooldown do not accumulate. A failure
+    while half-open means the probe failed, so the breaker opens again.
+    """
+    row = conn.execute('SELECT * FROM breakers WHERE error_type = ?', (error_type,)).fetchone()
+    ts = now.timestamp()
+
+    if row is None:
+        conn.execute(
+            'INSERT INTO breakers (error_type, failures, last_failure) VALUES (?, 0, ?)',
+            (error_type, ts)
+        )
+        failures, state = 0, 'closed'
     else:
-        return RETRY_DELAY
+        failures, state = row['failures'], row['state']
+        if row['last_failure'] and ts - row['last_failure'] > BREAKER_COOLDOWN and state == 'closed':
+            failures = 0
+
+    failures += 1
+
+    if state == 'half_open' or (state == 'closed' and failures >= BREAKER_THRESHOLD):
+        conn.execute(
+            """UPDATE breakers SET state = 'open', failures = ?, last_failure = ?, opened_at = ?, probe_task = NULL
+               WHERE error_type = ?""",
+            (failures, ts, ts, error_type)
+        )
+        return 'open'
+
+    conn.execute(
+        'UPDATE breakers SET failures = ?, last_failure = ? WHERE error_type = ?',
+        (failures, ts, error_type)
+    )
+    return state
+
+
+def acquire_breaker(conn, error_type, task_id, now):
+    """Decide whether a retry of this error type may run now
+
+    Returns None if it may, otherwise the time the breaker allows the next
+    attempt. After the cooldown an open breaker goes half-open and lets a
+    single probe retry through.
+    """
+    row = conn.execute('SELECT * FROM breakers WHERE error_type = ?', (error_type,)).fetchone()
+    if row is None or row['state'] == 'closed':
+        return None
+
+    ts = now.timestamp()
+    reopen_at = row['opened_at'] + BREAKER_COOLDOWN
+
+    if ts < reopen_at:
+        return datetime.fromtimestamp(reopen_at)
+
+    # Cooldown over: open -> half_open, or a stalled probe gets replaced
+    conn.execute(
+        "UPDATE breakers SET state = 'half_open', opened_at = ?, probe_task = ? WHERE error_type = ?",
+        (ts, task_id, error_type)
+    )
+    return None
+
+
+def close_breaker(conn, error_type):
+    """Close an error type's breaker after a successful retry"""
+    conn.execute(
+        "UPDATE breakers SET state = 'closed', failures = 0, opened_at = NULL, probe_task = NULL WHERE error_type = ?",
+        (error_type,)
+    )
+
+
+def get_in_flight_count(conn, now):
+    """Count retries restored to their original location whose lease has not expired"""
+    row = conn.execute(
+        "SELECT COUNT(*) FROM retries WHERE status = 'retrying' AND next_retry > ?",
+        (now.timestamp(),)
+    ).fetchone()
+    return row[0]
+
+
+def settle_in_flight(conn, now):
+    """Settle restored retries that are no longer in flight
+
+    A new failure moves a task back to pending_retry, so a 'retrying' task
+    whose file has left its original location completed: it is resolved and
+    its error type's breaker closes. A task still waiting when its lease
+    expires frees its slot, and if it was a half-open breaker's probe with
+    no failure of that type since, the probe counts as successful.
+    Returns [(task_id, error_type, retry_count)] of the resolved tasks.
+    """
+    resolved = []
+    rows = conn.execute(
+        "SELECT task_id, error_type, retry_count, original_location, next_retry FROM retries WHERE status = 'retrying'"
+    ).fetchall()
+
+    for row in rows:
+        if not os.path.exists(row['original_location']):
+            conn.execute(
+                "UPDATE retries SET status = 'resolved', next_retry = NULL WHERE task_id = ?",
+                (row['task_id'],)
+            )
+            close_breaker(conn, row['error_type'])
+            resolved.append((row['task_id'], row['error_type'], row['retry_count']))
+            continue
+
+        if row['next_retry'] is None or row['next_retry'] > now.timestamp():
+            continue
+
+        conn.execute('UPDATE retries SET next_retry = NULL WHERE task_id = ?', (row['task_id'],))
+        breaker = conn.execute(
+            'SELECT state, opened_at, last_failure FROM breakers WHERE error_type = ?',
+            (row['error_type'],)
+        ).fetchone()
+        if breaker and breaker['state'] == 'half_open' and (breaker['last_failure'] or 0) <= breaker['opened_at']:
+            close_breaker(conn, row['error_type'])
+
+    return resolved
+
+
+def normalize_error_text(text):
+    """Strip ids, paths, timestamps, quoted values and numbers from error text"""
+    for pattern, replacement in FINGERPRINT_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def fingerprint_error(error_type, error_message, stack_trace=None):
+    """Return (fingerprint, signature) identifying errors with the same cause
+
+    The signature is the error type, the normalized message and, when a
+    stack trace is given, the file:function of each frame.
+    """
+    parts = [error_type or 'Unknown', normalize_error_text(error_message or '')]
+
+    if stack_trace:
+        frames = STACK_FRAME_PATTERN.findall(stack_trace)
+        parts.append(' > '.join(f"{os.path.basename(path)}:{func}" for path, func in frames))
+
+    signature = ' | '.join(parts)
+    return hashlib.sha1(signature.encode('utf-8')).hexdigest()[:16], signature
+
+
+def record_error_cluster(conn, fingerprint, signature, error_type, error_message, task_id, now):
+    """Count an error against its cluster; a single primary key upsert"""
+    conn.execute(
+        """INSERT INTO clusters (fingerprint, error_type, signature, example, count, first_seen, last_seen, last_task)
+           VALUES (?, ?, ?, ?, 1, ?, ?, ?)
+           ON CONFLICT(fingerprint) DO UPDATE SET
+               count = count + 1,
+               last_seen = excluded.last_seen,
+               last_task = excluded.last_task""",
+        (fingerprint, error_type, signature, error_message, now.isoformat(), now.isoformat(), task_id)
+    )
+
+
+def get_error_clusters(limit=10, since=None):
+    """Return the largest error clusters, optionally only those seen since a date"""
+    query = 'SELECT * FROM clusters'
+    params = []
+
+    if since:
+        query += ' WHERE last_seen >= ?'
+        params.append(since.isoformat())
+
+    query += ' ORDER BY count DESC LIMIT ?'
+    params.append(limit)
+
+    return [
+        {
+            'fingerprint': row['fingerprint'],
+            'type': row['error_type'],
+            'signature': row['signature'],
+            'example': row['example'],
+            'count': row['count'],
+            'first_seen': row['first_seen'],
+            'last_seen': row['last_seen'],
+            'last_task': row['last_task']
+        }
+        for row in get_retry_db().execute(query, params)
+    ]
 
 
 def log_error(task_id, error_type, error_message, stack_trace=None, context=None, original_location=None):
@@ -114,36 +657,69 @@ def log_error(task_id, error_type, error_message, stack_trace=None, context=None
     # Log to business.log
     log_to_business_log(f"ERROR: Task {task_id} failed with {error_type}: {error_message}")
 
-    # Load retry state
-    retry_state = get_retry_state()
-
-    # Initialize or update task retry info
-    if task_id not in retry_state:
-        retry_state[task_id] = {
-            'retry_count': 0,
-            'error_type': error_type,
-            'error_message': error_message,
-            'first_error': datetime.now().isoformat(),
-            'original_location': original_location or 'unknown'
-        }
-
-    retry_count = retry_state[task_id]['retry_count']
-
-    if retry_count < MAX_RETRIES:
-        # Schedule retry
-        retry_count += 1
-        retry_delay = calculate_retry_delay(retry_count)
-        next_retry = datetime.now() + timedelta(seconds=retry_delay)
-
-        retry_state[task_id]['retry_count'] = retry_count
-        retry_state[task_id]['next_retry'] = next_retry.isoformat()
-        retry_state[task_id]['status'] = 'pending_retry'
-
+    now = datetime.now()
+    fingerprint, signature = fingerprint_error(error_type, error_message, stack_trace)
+
+    with retry_transaction() as conn:
+        record_error_cluster(conn, fingerprint, signature, error_type, error_message, task_id, now)
+
+        row = conn.execute('SELECT retry_count FROM retries WHERE task_id = ?', (task_id,)).fetchone()
+
+        # Initialize or update task retry info
+        if row is None:
+            conn.execute(
+                """INSERT INTO retries
+                   (task_id, retry_count, error_type, error_message, first_error, original_location)
+                   VALUES (?, 0, ?, ?, ?, ?)""",
+                (task_id, error_type, error_message, now.isoformat(), original_location or 'unknown')
+            )
+            retry_count = 0
+        else:
+            retry_count = row['retry_count']
+
+        breaker_state = record_breaker_failure(conn, error_type, now)
+
+        if retry_count < MAX_RETRIES:
+            # Schedule retry
+            retry_count += 1
+            retry_delay = calculate_retry_delay(retry_count)
+            next_retry = now + timedelta(seconds=retry_delay)
+            status = 'pending_retry'
+
+            conn.execute(
+                """UPDATE retries SET retry_count = ?, status = ?, next_retry = ?, last_error = ?
+                   WHERE task_id = ?""",
+                (retry_count, status, next_retry.timestamp(), now.isoformat(), task_id)
+            )
+        else:
+            # Max retries reached
+            status = 'permanent_failure'
+
+            conn.execute(
+                "UPDATE retries SET status = ?, next_retry = NULL, last_error = ? WHERE task_id = ?",
+                (status, now.isoformat(), task_id)
+            )
+
+    write_error_event(
+        'error',
+        task_id,
+        type=error_type,
+        message=error_message,
+        fingerprint=fingerprint,
+        attempt=retry_count,
+        status=status,
+        next_retry=next_retry.isoformat() if status == 'pending_retry' else None,
+        stack_trace=stack_trace,
+        context=context
+    )
+
+    if breaker_state == 'open':
+        log_to_error_log(f"BREAKER | {error_type} is open; retries of this type are paused for {BREAKER_COOLDOWN}s")
+
+    if status == 'pending_retry':
         log_to_error_log(f"RETRY | Attempt {retry_count}/{MAX_RETRIES} scheduled for {next_retry.strftime('%Y-%m-%d %H:%M:%S')}")
         log_to_business_log(f"Retry scheduled for task {task_id}: attempt {retry_count}/{MAX_RETRIES}")
     else:
-        # Max retries reached
-        retry_state[task_id]['status'] = 'permanent_failure'
         log_to_error_log(f"PERMANENT_FAILURE | Task: {task_id} | Max retries ({MAX_RETRIES}) exceeded")
         log_to_business_log(f"PERMANENT FAILURE: Task {task_id} exceeded max retries")
 
@@ -151,9 +727,6 @@ def log_error(task_id, error_type, error_message, stack_trace=None, context=None
         if ALERT_EMAIL:
             send_error_alert(task_id, error_type, error_message)
 
-    # Save retry state
-    save_retry_state(retry_state)
-
     log_to_error_log("---")
 
     return {
@@ -161,7 +734,9 @@ def log_error(task_id, error_type, error_message, stack_trace=None, context=None
         'task_id': task_id,
         'retry_count': retry_count,
         'max_retries': MAX_RETRIES,
-        'status': retry_state[task_id]['status']
+        'status': status,
+        'breaker': breaker_state,
+        'fingerprint': fingerprint
     }
 
 
@@ -186,16 +761,15 @@ def move_to_errors(task_file, error_type, error_message, stack_trace=None, conte
     error_filepath = os.path.join(ERRORS_PATH, error_filename)
 
     # Get retry state
-    retry_state = get_retry_state()
     task_id = task_name
-    task_info = retry_state.get(task_id, {})
+    task_info = get_retry_info(task_id) or {}
 
     retry_count = task_info.get('retry_count', 0)
     next_retry = task_info.get('next_retry', 'N/A')
     status = task_info.get('status', 'pending_retry')
 
     # Create error file with metadata
-    error_content = f"""---
+    header = f"""---
 original_location: {task_file}
 error_timestamp: {datetime.now().isoformat()}
 error_type: {error_type}
@@ -208,7 +782,9 @@ status: {status}
 
 # Original Task Content
 
-{original_content}
+"""
+
+    error_content = f"""
 
 ---
 
@@ -244,9 +820,27 @@ status: {status}
 *Error captured by Error Recovery System*
 """
 
-    # Write error file
-    with open(error_filepath, 'w', encoding='utf-8') as f:
-        f.write(error_content)
+    # Write error file; the index records where the original content sits
+    header_bytes = header.encode('utf-8')
+    content_bytes = original_content.encode('utf-8')
+
+    with open(error_filepath, 'wb') as f:
+        f.write(header_bytes + content_bytes + error_content.encode('utf-8'))
+
+    with retry_transaction() as conn:
+        conn.execute(
+            """INSERT INTO retries
+               (task_id, retry_count, error_type, error_message, first_error, original_location,
+                error_file, content_offset, content_length)
+               VALUES (?, 0, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(task_id) DO UPDATE SET
+                   original_location = excluded.original_location,
+                   error_file = excluded.error_file,
+                   content_offset = excluded.content_offset,
+                   content_length = excluded.content_length""",
+            (task_id, error_type, error_message, datetime.now().isoformat(), task_file,
+             error_filename, len(header_bytes), len(content_bytes))
+        )
 
     # Remove original file
     os.remove(task_file)
@@ -262,68 +856,96 @@ status: {status}
 
 
 def check_pending_retries():
-    """Check for tasks that need to be retried"""
-    retry_state = get_retry_state()
-    now = datetime.now()
-    retries_due = []
+    """Check for tasks that need to be retried
+
+    The (status, next_retry) index means only the due entries are read.
+    """
+    rows = get_retry_db().execute(
+        """SELECT task_id, retry_count, error_type, original_location FROM retries
+           WHERE status = 'pending_retry' AND next_retry <= ?
+           ORDER BY next_retry""",
+        (datetime.now().timestamp(),)
+    )
+
+    return [
+        {
+            'task_id': row['task_id'],
+            'retry_count': row['retry_count'],
+            'error_type': row['error_type'] or 'unknown',
+            'original_location': row['original_location'] or 'unknown'
+        }
+        for row in rows
+    ]
+
 
-    for task_id, info in retry_state.items():
-        if info.get('status') == 'pending_retry':
-            next_retry_str = info.get('next_retry')
-            if next_retry_str:
-                next_retry = datetime.fromisoformat(next_retry_str)
-                if now >= next_retry:
-                    retries_due.append({
-                        'task_id': task_id,
-                        'retry_count': info['retry_count'],
-                        'original_location': info.get('original_location', 'unknown')
-                    })
+def read_legacy_error_file(task_id):
+    """Locate and parse an error file written before the index existed
 
-    return retries_due
+    Returns (error_file, original_location, original_content), or
+    (None, None, None) if no error file matches.
+    """
+    error_files = sorted(
+        f for f in os.listdir(ERRORS_PATH)
+        if f.startswith(os.path.splitext(task_id)[0] + '_ERROR_') and f.endswith('.md')
+    )
+
+    if not error_files:
+        return None, None, None
+
+    # Newest error file wins when a task failed more than once
+    error_file = os.path.join(ERRORS_PATH, error_files[-1])
+
+    with open(error_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    location_match = re.search(r'original_location:\s*(.+)', content)
+    original_location = location_match.group(1).strip() if location_match else None
+
+    content_match = re.search(r'# Original Task Content\n\n(.+?)\n\n---', content, re.DOTALL)
+    original_content = content_match.group(1).strip() if content_match else content
+
+    return error_file, original_location, original_content
 
 
 def retry_task(task_id):
     """Retry a failed task"""
-    retry_state = get_retry_state()
+    task_info = get_retry_info(task_id)
 
-    if task_id not in retry_state:
+    if task_info is None:
         return {
             'success': False,
             'error': f"Task {task_id} not found in retry state"
         }
 
-    task_info = retry_state[task_id]
-
-    # Find error file
-    error_files = [f for f in os.listdir(ERRORS_PATH) if f.startswith(os.path.splitext(task_id)[0]) and f.endswith('.md')]
+    if task_info.get('error_file'):
+        error_file = os.path.join(ERRORS_PATH, task_info['error_file'])
+        original_location = task_info.get('original_location')
 
-    if not error_files:
-        return {
-            'success': False,
-            'error': f"Error file not found for task {task_id}"
-        }
-
-    error_file = os.path.join(ERRORS_PATH, error_files[0])
+        if not os.path.exists(error_file):
+            return {
+                'success': False,
+                'error': f"Error file not found for task {task_id}"
+            }
 
-    # Read error file to get original location
-    with open(error_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+        # Read just the original content using the recorded offset
+        with open(error_file, 'rb') as f:
+            f.seek(task_info['content_offset'])
+            original_content = f.read(task_info['content_length']).decode('utf-8')
+    else:
+        error_file, original_location, original_content = read_legacy_error_file(task_id)
 
-    # Extract original location from metadata
-    import re
-    location_match = re.search(r'original_location:\s*(.+)', content)
-    original_location = location_match.group(1).strip() if location_match else None
+        if error_file is None:
+            return {
+                'success': False,
+                'error': f"Error file not found for task {task_id}"
+            }
 
-    if not original_location:
+    if not original_location or original_location == 'unknown':
         return {
             'success': False,
             'error': "Could not determine original location"
         }
 
-    # Extract original content
-    content_match = re.search(r'# Original Task Content\n\n(.+?)\n\n---', content, re.DOTALL)
-    original_content = content_match.group(1).strip() if content_match else content
-
     # Move back to original location
     try:
         with open(original_location, 'w', encoding='utf-8') as f:
@@ -332,11 +954,15 @@ def retry_task(task_id):
         # Remove error file
         os.remove(error_file)
 
-        # Update retry state
-        retry_state[task_id]['status'] = 'retrying'
-        save_retry_state(retry_state)
+        # Update retry state; next_retry holds the in-flight lease expiry
+        with retry_transaction() as conn:
+            conn.execute(
+                "UPDATE retries SET status = 'retrying', next_retry = ? WHERE task_id = ?",
+                ((datetime.now() + timedelta(seconds=RETRY_LEASE)).timestamp(), task_id)
+            )
 
         log_to_error_log(f"RETRY | Task: {task_id} | Attempt: {task_info['retry_count']}/{MAX_RETRIES}")
+        write_error_event('retry', task_id, type=task_info.get('error_type'), attempt=task_info['retry_count'])
         log_to_business_log(f"Retrying task {task_id} (attempt {task_info['retry_count']}/{MAX_RETRIES})")
 
         return {
@@ -354,39 +980,132 @@ def retry_task(task_id):
 
 
 def check_retries():
-    """Check and execute pending retries"""
+    """Check and execute pending retries
+
+    Restored retries that completed are resolved first. At most
+    RETRY_CONCURRENCY retries are in flight at once; the rest stay due for
+    the next check. Retries whose error type has an open breaker are
+    pushed back, with jitter, to when the breaker allows a probe.
+    """
     retries_due = check_pending_retries()
+    now = datetime.now()
+
+    admitted = []
+    deferred = []
+
+    with retry_transaction() as conn:
+        resolved = settle_in_flight(conn, now)
+        slots = RETRY_CONCURRENCY - get_in_flight_count(conn, now)
+
+        for retry_info in retries_due:
+            if slots <= 0:
+                break
+
+            resume_at = acquire_breaker(conn, retry_info['error_type'], retry_info['task_id'], now)
+            if resume_at is None:
+                admitted.append(retry_info)
+                slots -= 1
+                continue
+
+            next_retry = resume_at + timedelta(seconds=random.uniform(0, RETRY_JITTER * BREAKER_COOLDOWN))
+            conn.execute(
+                'UPDATE retries SET next_retry = ? WHERE task_id = ?',
+                (next_retry.timestamp(), retry_info['task_id'])
+            )
+            deferred.append({
+                'task_id': retry_info['task_id'],
+                'error_type': retry_info['error_type'],
+                'next_retry': next_retry.isoformat()
+            })
+
+    for task_id, error_type, retry_count in resolved:
+        log_to_error_log(f"RESOLVED | Task: {task_id} | Attempt: {retry_count}/{MAX_RETRIES}")
+        write_error_event('resolved', task_id, type=error_type, attempt=retry_count)
+        log_to_business_log(f"Task {task_id} recovered after {retry_count} retries")
 
     results = []
-    for retry_info in retries_due:
+    for retry_info in admitted:
         result = retry_task(retry_info['task_id'])
         results.append(result)
 
+    next_retry = get_next_retry_time()
+    compress_event_segments()
+    flush_error_alerts()
+
     return {
         'success': True,
         'retries_executed': len(results),
-        'results': results
+        'retries_resolved': len(resolved),
+        'retries_deferred': len(deferred),
+        'retries_waiting': len(retries_due) - len(results) - len(deferred),
+        'results': results,
+        'deferred': deferred,
+        'next_retry': next_retry.isoformat() if next_retry else None
+    }
+
+
+def mark_resolved(task_id):
+    """Record that a retried task succeeded and close its error type's breaker"""
+    task_info = get_retry_info(task_id)
+
+    if task_info is None:
+        return {
+            'success': False,
+            'error': f"Task {task_id} not found in retry state"
+        }
+
+    with retry_transaction() as conn:
+        conn.execute(
+            "UPDATE retries SET status = 'resolved', next_retry = NULL WHERE task_id = ?",
+            (task_id,)
+        )
+        close_breaker(conn, task_info.get('error_type'))
+
+    log_to_error_log(f"RESOLVED | Task: {task_id} | Attempt: {task_info['retry_count']}/{MAX_RETRIES}")
+    write_error_event('resolved', task_id, type=task_info.get('error_type'), attempt=task_info['retry_count'])
+    log_to_business_log(f"Task {task_id} recovered after {task_info['retry_count']} retries")
+
+    return {
+        'success': True,
+        'task_id': task_id,
+        'status': 'resolved'
+    }
+
+
+def get_next_retry():
+    """Report when the next retry is due so callers can sleep until then"""
+    next_retry = get_next_retry_time()
+
+    return {
+        'success': True,
+        'next_retry': next_retry.isoformat() if next_retry else None,
+        'seconds_until': max(0, int((next_retry - datetime.now()).total_seconds())) if next_retry else None
     }
 
 
 def get_error_status():
     """Get current error status"""
-    retry_state = get_retry_state()
+    counts = get_status_counts()
 
-    total_errors = len(retry_state)
-    pending_retry = sum(1 for info in retry_state.values() if info.get('status') == 'pending_retry')
-    permanent_failures = sum(1 for info in retry_state.values() if info.get('status') == 'permanent_failure')
-    resolved = sum(1 for info in retry_state.values() if info.get('status') == 'resolved')
+    total_errors = sum(counts.values())
+    pending_retry = counts.get('pending_retry', 0)
+    permanent_failures = counts.get('permanent_failure', 0)
+    resolved = counts.get('resolved', 0)
 
     # Get recent errors
+    rows = get_retry_db().execute(
+        "SELECT * FROM retries ORDER BY COALESCE(last_error, first_error) DESC LIMIT 5"
+    )
+
     recent_errors = []
-    for task_id, info in list(retry_state.items())[:5]:
+    for row in rows:
+        info = row_to_retry_info(row)
         recent_errors.append({
-            'task': task_id,
-            'error': info.get('error_type', 'Unknown'),
-            'timestamp': info.get('first_error', 'Unknown'),
-            'status': info.get('status', 'unknown'),
-            'next_retry': info.get('next_retry', 'N/A')
+            'task': info['task_id'],
+            'error': info.get('error_type') or 'Unknown',
+            'timestamp': info.get('first_error') or 'Unknown',
+            'status': info.get('status') or 'unknown',
+            'next_retry': info['next_retry']
         })
 
     return {
@@ -395,23 +1114,19 @@ def get_error_status():
         'pending_retry': pending_retry,
         'permanent_failures': permanent_failures,
         'resolved': resolved,
+        'in_flight': get_in_flight_count(get_retry_db(), datetime.now()),
+        'open_breakers': [b for b in get_breakers() if b['state'] != 'closed'],
         'recent_errors': recent_errors
     }
 
 
 def generate_error_report(period='week'):
-    """Generate error report for specified period"""
-    # Parse error log
-    if not os.path.exists(ERROR_LOG):
-        return {
-            'success': True,
-            'period': period,
-            'total_errors': 0,
-            'error_rate': '0%',
-            'most_common_errors': [],
-            'recovery_rate': '0%',
-            'permanent_failures': 0
-        }
+    """Generate error report for specified period
+
+    Reads only the event segments that overlap the window, so the cost
+    follows the window size rather than the total error history.
+    """
+    import_legacy_error_log()
 
     # Calculate date range
     now = datetime.now()
@@ -424,30 +1139,24 @@ def generate_error_report(period='week'):
     else:
         start_date = now - timedelta(days=7)
 
-    # Parse error log
+    # Aggregate error events in the window
     error_types = {}
     total_errors = 0
+    permanent_failures = 0
 
-    with open(ERROR_LOG, 'r', encoding='utf-8') as f:
-        for line in f:
-            if 'ERROR |' in line:
-                # Extract timestamp
-                timestamp_match = re.search(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]', line)
-                if timestamp_match:
-                    timestamp = datetime.strptime(timestamp_match.group(1), '%Y-%m-%d %H:%M:%S')
-                    if timestamp >= start_date:
-                        total_errors += 1
-
-                        # Extract error type
-                        type_match = re.search(r'Type:\s*(\w+)', line)
-                        if type_match:
-                            error_type = type_match.group(1)
-                            error_types[error_type] = error_types.get(error_type, 0) + 1
+    for record in iter_error_events(start_date, now):
+        if record['event'] != 'error':
+            continue
+
+        total_errors += 1
+        error_type = record.get('type') or 'Unknown'
+        error_types[error_type] = error_types.get(error_type, 0) + 1
+
+        if record.get('status') == 'permanent_failure':
+            permanent_failures += 1
 
     # Get retry state
-    retry_state = get_retry_state()
-    permanent_failures = sum(1 for info in retry_state.values() if info.get('status') == 'permanent_failure')
-    resolved = sum(1 for info in retry_state.values() if info.get('status') == 'resolved')
+    resolved = get_status_counts().get('resolved', 0)
 
     # Calculate recovery rate
     recovery_rate = (resolved / total_errors * 100) if total_errors > 0 else 0
@@ -465,36 +1174,144 @@ def generate_error_report(period='week'):
         'error_rate': f"{(total_errors / 100):.1f}%",  # Simplified calculation
         'most_common_errors': most_common_errors,
         'recovery_rate': f"{recovery_rate:.1f}%",
-        'permanent_failures': permanent_failures
+        'permanent_failures': permanent_failures,
+        'top_clusters': get_error_clusters(limit=5, since=start_date)
     }
 
 
 def send_error_alert(task_id, error_type, error_message):
-    """Send error alert email"""
+    """Queue an alert for a permanent failure; alerts go out as a digest
+
+    Alerts are deduplicated by error type. A digest is sent once the oldest
+    queued alert is ALERT_WINDOW seconds old.
+    """
     if not ALERT_EMAIL:
         return
 
-    try:
-        import subprocess
-        subject = f"Critical Error: {error_type} in {task_id}"
-        body = f"""Critical error detected in AI Employee system:
+    now = datetime.now().timestamp()
+
+    with retry_transaction() as conn:
+        row = conn.execute('SELECT tasks FROM alerts WHERE error_type = ?', (error_type,)).fetchone()
+
+        if row is None:
+            conn.execute(
+                """INSERT INTO alerts (error_type, count, first_seen, last_seen, last_message, tasks)
+                   VALUES (?, 1, ?, ?, ?, ?)""",
+                (error_type, now, now, error_message, json.dumps([task_id]))
+            )
+        else:
+            tasks = json.loads(row['tasks'])
+            if len(tasks) < ALERT_SAMPLE_TASKS:
+                tasks.append(task_id)
+            # New failures go to every recipient again
+            conn.execute(
+                """UPDATE alerts SET count = count + 1, last_seen = ?, last_message = ?, tasks = ?, delivered = NULL
+                   WHERE error_type = ?""",
+                (now, error_message, json.dumps(tasks), error_type)
+            )
+
+    flush_error_alerts()
+
+
+def build_alert_digest(rows):
+    """Render queued alerts as one digest email"""
+    total = sum(row['count'] for row in rows)
+    subject = f"Critical Errors: {total} permanent failures across {len(rows)} error types"
+
+    body = f"""Critical errors detected in AI Employee system:
+
+Period: {datetime.fromtimestamp(min(row['first_seen'] for row in rows)).strftime('%Y-%m-%d %H:%M:%S')} to {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+"""
 
-Task: {task_id}
-Error Type: {error_type}
-Error Message: {error_message}
-Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+    for row in rows:
+        tasks = json.loads(row['tasks'])
+        more = row['count'] - len(tasks)
 
-This task has exceeded the maximum retry limit and requires manual intervention.
+        body += f"""Error Type: {row['error_type']}
+Failures: {row['count']}
+Last Error Message: {row['last_message']}
+Tasks: {', '.join(tasks)}{f' (+{more} more)' if more > 0 else ''}
+
+"""
+
+    body += """These tasks have exceeded the maximum retry limit and require manual intervention.
 
 Please review the error details in AI_Employee_Vault/Errors/ folder.
 """
 
-        subprocess.run(
-            ['python', 'scripts/send_email.py', ALERT_EMAIL, subject, body],
-            cwd=os.path.join(os.path.dirname(__file__), '..')
-        )
-    except Exception:
-        pass
+    return subject, body
+
+
+def flush_error_alerts(force=False):
+    """Send queued alerts as a digest once the batching window has passed
+
+    Delivery is tracked per recipient: a recipient whose send failed gets
+    the alerts it missed on the next flush, and the others are not sent
+    them twice. An alert leaves the queue once every recipient has it.
+    """
+    if not ALERT_EMAIL:
+        return {'success': True, 'sent': 0, 'queued': 0}
+
+    rows = get_retry_db().execute('SELECT * FROM alerts ORDER BY count DESC').fetchall()
+
+    if not rows:
+        return {'success': True, 'sent': 0, 'queued': 0}
+
+    oldest = min(row['first_seen'] for row in rows)
+    if not force and datetime.now().timestamp() - oldest < ALERT_WINDOW:
+        return {'success': True, 'sent': 0, 'queued': len(rows)}
+
+    recipients = [address.strip() for address in ALERT_EMAIL.split(',') if address.strip()]
+    delivered = {row['error_type']: set(json.loads(row['delivered'] or '[]')) for row in rows}
+
+    # Recipients missing the same alerts share one digest
+    digests = {}
+    for to in recipients:
+        missing = tuple(row['error_type'] for row in rows if to not in delivered[row['error_type']])
+        if missing:
+            digests.setdefault(missing, []).append(to)
+
+    messages = []
+    for error_types, addresses in digests.items():
+        subject, body = build_alert_digest([row for row in rows if row['error_type'] in error_types])
+        messages.extend((to, subject, body) for to in addresses)
+
+    # One SMTP login for every recipient
+    result = send_batch(messages) if messages else {'sent': []}
+    sent = set(result.get('sent', []))
+
+    for error_types, addresses in digests.items():
+        for error_type in error_types:
+            delivered[error_type].update(to for to in addresses if to in sent)
+
+    # A row that changed since it was read is left for the next flush
+    with retry_transaction() as conn:
+        for row in rows:
+            error_type = row['error_type']
+            if set(recipients) <= delivered[error_type]:
+                conn.execute(
+                    'DELETE FROM alerts WHERE error_type = ? AND last_seen = ?',
+                    (error_type, row['last_seen'])
+                )
+            else:
+                conn.execute(
+                    'UPDATE alerts SET delivered = ? WHERE error_type = ? AND last_seen = ?',
+                    (json.dumps(sorted(delivered[error_type])), error_type, row['last_seen'])
+                )
+
+    if 'error' in result:
+        failed = [to for to, _, _ in messages if to not in sent]
+        log_to_error_log(f"ALERT | Digest not sent to {', '.join(failed)}, kept queued for them: {result['error']}")
+        return {'success': False, 'error': result['error'], 'sent': len(sent), 'failed': failed, 'queued': len(rows)}
+
+    log_to_business_log(f"Error alert digest sent to {', '.join(sorted(sent))} ({len(rows)} error types)")
+
+    return {
+        'success': True,
+        'sent': len(sent),
+        'error_types': [row['error_type'] for row in rows]
+    }
 
 
 def main():
@@ -508,6 +1325,9 @@ def main():
     # Check and execute retries
     subparsers.add_parser('check-retries', help='Check and execute pending retries')
 
+    # Next due retry
+    subparsers.add_parser('next-retry', help='Show when the next retry is due')
+
     # Retry specific task
     retry_parser = subparsers.add_parser('retry', help='Retry specific task')
     retry_parser.add_argument('--task-id', required=True, help='Task ID to retry')
@@ -515,6 +1335,20 @@ def main():
     # Retry all
     subparsers.add_parser('retry-all', help='Retry all pending tasks')
 
+    # Mark a retried task as recovered
+    resolve_parser = subparsers.add_parser('resolve', help='Mark a retried task as resolved')
+    resolve_parser.add_argument('--task-id', required=True, help='Task ID that succeeded')
+
+    # Circuit breakers
+    subparsers.add_parser('breakers', help='Show circuit breaker state per error type')
+
+    # Error clusters
+    clusters_parser = subparsers.add_parser('clusters', help='Show the largest error clusters')
+    clusters_parser.add_argument('--limit', type=int, default=10, help='Number of clusters to show')
+
+    # Send queued alerts now
+    subparsers.add_parser('flush-alerts', help='Send the queued error alert digest now')
+
     # Generate report
     report_parser = subparsers.add_parser('report', help='Generate error report')
     report_parser.add_argument('--period', choices=['day', 'week', 'month'], default='week', help='Report period')
@@ -525,10 +1359,20 @@ def main():
         result = get_error_status()
     elif args.command == 'check-retries':
         result = check_retries()
+    elif args.command == 'next-retry':
+        result = get_next_retry()
     elif args.command == 'retry':
         result = retry_task(args.task_id)
     elif args.command == 'retry-all':
         result = check_retries()
+    elif args.command == 'resolve':
+        result = mark_resolved(args.task_id)
+    elif args.command == 'breakers':
+        result = {'success': True, 'breakers': get_breakers()}
+    elif args.command == 'clusters':
+        result = {'success': True, 'clusters': get_error_clusters(limit=args.limit)}
+    elif args.command == 'flush-alerts':
+        result = flush_error_alerts(force=True)
     elif args.command == 'report':
         result = generate_error_report(args.period)
     else:
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+File Lock
+Re-entrant, cross-process exclusive locks on a lock file (fcntl on POSIX,
+msvcrt on Windows)
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def lock_file_handle(handle, blocking=True):
+    """Take the OS lock on an open file; returns False if busy and not blocking"""
+    try:
+        if fcntl:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+
+        handle.seek(0)
+        while True:
+            try:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                if not blocking:
+                    return False
+                # LK_LOCK gives up after ~10 seconds; keep waiting
+    except BlockingIOError:
+        return False
+
+
+def unlock_file_handle(handle):
+    """Release the OS lock on an open file"""
+    if fcntl:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """Exclusive lock shared by every process that opens the same lock file
+
+    Re-entrant within a process; threads of one process also exclude each
+    other.
+    """
+
+    def __init__(self, lock_file):
+        self.lock_file = lock_file
+        self._thread_lock = threading.RLock()
+        self._handle = None
+        self._depth = 0
+
+    @contextmanager
+    def hold(self, blocking=True):
+        """Hold the lock; yields False instead of waiting when blocking is off and it is busy"""
+        if not self._thread_lock.acquire(blocking=blocking):
+            yield False
+            return
+
+        try:
+            if self._depth == 0:
+                os.makedirs(os.path.dirname(self.lock_file), exist_ok=True)
+                handle = open(self.lock_file, 'a+b')
+                if not lock_file_handle(handle, blocking):
+                    handle.close()
+                    yield False
+                    return
+                self._handle = handle
+
+            self._depth += 1
+            try:
+                yield True
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    unlock_file_handle(self._handle)
+                    self._handle.close()
+                    self._handle = None
+        finally:
+            self._thread_lock.release()
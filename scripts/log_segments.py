@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Log Segments
+Rotates vault logs into compressed, time-ranged segments tracked by a manifest
+"""
+
+import os
+import re
+import json
+import gzip
+import shutil
+import argparse
+from datetime import datetime, timedelta
+
+
+# Configuration
+VAULT_PATH = os.path.join(os.path.dirname(__file__), "..", "AI_Employee_Vault")
+LOGS_PATH = os.path.join(VAULT_PATH, "Logs")
+
+# Environment variables
+LOG_MAX_SIZE = int(os.getenv('LOG_MAX_SIZE', '10')) * 1024 * 1024  # MB to bytes
+LOG_ROTATE_DAYS = float(os.getenv('LOG_ROTATE_DAYS', '7'))
+
+TIMESTAMP_PATTERN = re.compile(r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]')
+
+
+def parse_line_timestamp(line):
+    """Return the timestamp at the start of a log line, or None"""
+    match = TIMESTAMP_PATTERN.match(line)
+    if match:
+        return datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S')
+    return None
+
+
+def get_archive_path(log_file):
+    """Directory holding a log's rotated segments"""
+    return os.path.join(os.path.dirname(log_file), "archive")
+
+
+def get_manifest_file(log_file):
+    """Manifest listing a log's rotated segments"""
+    return os.path.join(get_archive_path(log_file), f"{os.path.basename(log_file)}.manifest.json")
+
+
+def load_manifest(log_file):
+    """Load a log's segment manifest (oldest first)"""
+    manifest_file = get_manifest_file(log_file)
+    if not os.path.exists(manifest_file):
+        return []
+
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return []
+
+
+def save_manifest(log_file, manifest):
+    """Save a log's segment manifest"""
+    manifest_file = get_manifest_file(log_file)
+    temp_file = f"{manifest_file}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_file, manifest_file)
+
+
+def get_first_timestamp(log_file):
+    """Timestamp of the first line of a log, read without scanning the file"""
+    try:
+        with open(log_file, 'r', encoding='utf-8') as f:
+            for _ in range(10):
+                line = f.readline()
+                if not line:
+                    break
+                timestamp = parse_line_timestamp(line)
+                if timestamp:
+                    return timestamp
+    except OSError:
+        pass
+    return None
+
+
+def rotate(log_file):
+    """Compress the active log into a segment and record it in the manifest"""
+    if not os.path.exists(log_file) or os.path.getsize(log_file) == 0:
+        return None
+
+    archive_path = get_archive_path(log_file)
+    os.makedirs(archive_path, exist_ok=True)
+
+    # Swap the log out first; writers that open it afterwards start a new file
+    pending_file = os.path.join(archive_path, f".{os.path.basename(log_file)}.{os.getpid()}.rotating")
+    try:
+        os.replace(log_file, pending_file)
+    except OSError:
+        return None
+
+    start = end = None
+    lines = 0
+    with open(pending_file, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            lines += 1
+            timestamp = parse_line_timestamp(line)
+            if timestamp:
+                start = start or timestamp
+                end = timestamp
+
+    start = start or datetime.now()
+    end = end or start
+
+    base_name = os.path.splitext(os.path.basename(log_file))[0]
+    stem = f"{base_name}_{start.strftime('%Y%m%d_%H%M%S')}_{end.strftime('%Y%m%d_%H%M%S')}"
+    segment_name = f"{stem}.log.gz"
+    counter = 1
+    while os.path.exists(os.path.join(archive_path, segment_name)):
+        segment_name = f"{stem}_{counter}.log.gz"
+        counter += 1
+    segment_file = os.path.join(archive_path, segment_name)
+
+    raw_bytes = os.path.getsize(pending_file)
+    with open(pending_file, 'rb') as src, gzip.open(segment_file, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(pending_file)
+
+    entry = {
+        'file': segment_name,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'lines': lines,
+        'bytes': raw_bytes
+    }
+
+    manifest = load_manifest(log_file)
+    manifest.append(entry)
+    manifest.sort(key=lambda e: e['start'])
+    save_manifest(log_file, manifest)
+
+    return entry
+
+
+def rotate_if_needed(log_file, max_bytes=None, max_age_days=None):
+    """Rotate a log once it is larger than max_bytes or older than max_age_days"""
+    max_bytes = LOG_MAX_SIZE if max_bytes is None else max_bytes
+    max_age_days = LOG_ROTATE_DAYS if max_age_days is None else max_age_days
+
+    try:
+        size = os.path.getsize(log_file)
+    except OSError:
+        return None
+
+    if size == 0:
+        return None
+
+    if size > max_bytes:
+        return rotate(log_file)
+
+    if max_age_days:
+        first_timestamp = get_first_timestamp(log_file)
+        if first_timestamp and datetime.now() - first_timestamp > timedelta(days=max_age_days):
+            return rotate(log_file)
+
+    return None
+
+
+class SegmentedLog:
+    """Append-only log that rotates without a stat before every line
+
+    The size is read once and then tracked in memory as lines are appended.
+    """
+
+    def __init__(self, log_file, max_bytes=None, max_age_days=None):
+        self.log_file = log_file
+        self.max_bytes = LOG_MAX_SIZE if max_bytes is None else max_bytes
+        self.max_age_days = LOG_ROTATE_DAYS if max_age_days is None else max_age_days
+        self.size = None
+        self.started = None
+
+    def _load(self):
+        rotate_if_needed(self.log_file, self.max_bytes, self.max_age_days)
+        self.size = os.path.getsize(self.log_file) if os.path.exists(self.log_file) else 0
+        self.started = get_first_timestamp(self.log_file) if self.size else None
+
+    def append(self, line):
+        """Append one line, rotating first if the size or age limit was reached"""
+        if self.size is None:
+            self._load()
+        elif self.size > self.max_bytes or (
+            self.max_age_days and self.started and
+            datetime.now() - self.started > timedelta(days=self.max_age_days)
+        ):
+            rotate(self.log_file)
+            self.size = 0
+            self.started = None
+
+        data = line.encode('utf-8')
+        with open(self.log_file, 'ab') as f:
+            f.write(data)
+
+        self.size += len(data)
+        self.started = self.started or datetime.now()
+
+
+def iter_lines(log_file, start_date=None, end_date=None):
+    """Yield lines from every segment overlapping the window, then the active log
+
+    Segments entirely outside the window are never opened. Lines are not
+    filtered individually; callers check timestamps as they already do.
+    """
+    start_iso = start_date.isoformat() if start_date else None
+    end_iso = end_date.isoformat() if end_date else None
+    archive_path = get_archive_path(log_file)
+
+    for entry in load_manifest(log_file):
+        if start_iso and entry['end'] < start_iso:
+            continue
+        if end_iso and entry['start'] > end_iso:
+            continue
+
+        segment_file = os.path.join(archive_path, entry['file'])
+        if not os.path.exists(segment_file):
+            continue
+
+        with gzip.open(segment_file, 'rt', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                yield line
+
+    if os.path.exists(log_file):
+        with open(log_file, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                yield line
+
+
+def rotate_all(logs_path=None):
+    """Rotate every .log file in the Logs folder that is due"""
+    logs_path = logs_path or LOGS_PATH
+    rotated = []
+
+    if os.path.exists(logs_path):
+        for filename in sorted(os.listdir(logs_path)):
+            if filename.endswith('.log'):
+                entry = rotate_if_needed(os.path.join(logs_path, filename))
+                if entry:
+                    rotated.append(dict(entry, log=filename))
+
+    return {
+        'success': True,
+        'rotated': len(rotated),
+        'segments': rotated
+    }
+
+
+def list_segments(log_name):
+    """List the rotated segments of a log"""
+    manifest = load_manifest(os.path.join(LOGS_PATH, log_name))
+
+    return {
+        'success': True,
+        'log': log_name,
+        'segments': manifest,
+        'total_lines': sum(entry['lines'] for entry in manifest)
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Log Segments')
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+
+    # Rotate logs
+    subparsers.add_parser('rotate', help='Rotate logs that exceed their size or age limit')
+
+    # List segments
+    list_parser = subparsers.add_parser('list', help='List rotated segments of a log')
+    list_parser.add_argument('--log', default='error.log', help='Log file name (default: error.log)')
+
+    args = parser.parse_args()
+
+    if args.command == 'rotate':
+        result = rotate_all()
+    elif args.command == 'list':
+        result = list_segments(args.log)
+    else:
+        parser.print_help()
+        return
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Odoo Sync
+Pulls Odoo invoices (or payments) changed since the last sync into the
+local accounting ledger
+"""
+
+import os
+import sys
+import json
+import uuid
+import argparse
+import xmlrpc.client
+from collections import ChainMap
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "mcp", "odoo_mcp"))
+
+import accounting_manager
+from server import OdooMCPServer
+
+
+# Configuration
+SYNC_STATE_FILE = os.path.join(accounting_manager.ACCOUNTING_PATH, "odoo_sync.json")
+
+# Environment variables
+SYNC_BASIS = os.getenv('ODOO_SYNC_BASIS', 'invoice')  # 'invoice' (accrual) or 'payment' (cash)
+SYNC_PAGE_SIZE = int(os.getenv('ODOO_SYNC_PAGE_SIZE', '200'))
+
+SYNC_STATE_VERSION = 2
+
+# What each basis reads; syncing both would count the same money twice
+SYNC_MODELS = {
+    'invoice': {
+        'model': 'account.move',
+        'domain': [['move_type', 'in', ['out_invoice', 'in_invoice', 'out_refund', 'in_refund']]],
+        'fields': ['name', 'move_type', 'state', 'amount_total', 'invoice_date', 'date', 'partner_id']
+    },
+    'payment': {
+        'model': 'account.payment',
+        'domain': [],
+        'fields': ['name', 'payment_type', 'state', 'amount', 'date', 'partner_id']
+    }
+}
+
+# Odoo type -> (ledger type, sign, category)
+MOVE_TYPES = {
+    'out_invoice': ('income', 1, 'sales'),
+    'out_refund': ('income', -1, 'sales'),
+    'in_invoice': ('expense', 1, 'purchases'),
+    'in_refund': ('expense', -1, 'purchases')
+}
+PAYMENT_TYPES = {
+    'inbound': ('income', 1, 'payments'),
+    'outbound': ('expense', 1, 'payments')
+}
+
+
+def get_external_id(model, record_id):
+    """Ledger key tying a transaction to its Odoo record"""
+    return f"odoo:{model}:{record_id}"
+
+
+def to_net_amount(trans_type, amount):
+    """Signed amount as net income: income counts up, expenses count down"""
+    return amount if trans_type == 'income' else -amount
+
+
+def scan_recorded_amounts():
+    """Net income already in the ledger per Odoo record, read from the ledger itself"""
+    recorded = {}
+
+    for month, ledger_file in accounting_manager.iter_ledger_files():
+        with accounting_manager.open_ledger(ledger_file) as f:
+            for line in f:
+                if b'"external_id"' not in line:
+                    continue
+                try:
+                    transaction = json.loads(line)
+                except ValueError:
+                    continue
+                external_id = transaction['external_id']
+                net = to_net_amount(transaction['type'], accounting_manager.signed_amount(transaction))
+                recorded[external_id] = round(recorded.get(external_id, 0.0) + net, 2)
+
+    return recorded
+
+
+def load_sync_state():
+    """Load cursors, cached logins and recorded amounts
+
+    A missing or unreadable state file is rebuilt from the ledger, so a
+    full re-sync never duplicates transactions. State from an older version
+    keeps its cursors but has its recorded amounts rebuilt.
+    """
+    state = {}
+    try:
+        with open(SYNC_STATE_FILE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') == SYNC_STATE_VERSION:
+            return state
+    except (OSError, ValueError):
+        pass
+
+    return {
+        'version': SYNC_STATE_VERSION,
+        'cursors': state.get('cursors', {}),
+        'uids': state.get('uids', {}),
+        'recorded': scan_recorded_amounts(),
+        'last_sync': state.get('last_sync')
+    }
+
+
+def save_sync_state(state):
+    """Save the sync state"""
+    temp_file = f"{SYNC_STATE_FILE}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(temp_file, SYNC_STATE_FILE)
+
+
+def map_record(basis, model, record):
+    """Map an Odoo record to (external_id, ledger type, net amount, date, description, category)
+
+    Records that are not posted map to an amount of 0, so a cancelled or
+    reset invoice reverses whatever was recorded for it.
+    """
+    if basis == 'invoice':
+        trans_type, sign, category = MOVE_TYPES[record['move_type']]
+        amount = record['amount_total']
+        date = record.get('invoice_date') or record.get('date')
+    else:
+        trans_type, sign, category = PAYMENT_TYPES[record['payment_type']]
+        amount = record['amount']
+        date = record.get('date')
+
+    if record.get('state') != 'posted':
+        amount = 0.0
+
+    partner = record['partner_id'][1] if record.get('partner_id') else 'Unknown'
+    description = f"Odoo {record.get('name') or record['id']} - {partner}"
+
+    return (
+        get_external_id(model, record['id']),
+        trans_type,
+        round(to_net_amount(trans_type, sign * amount), 2),
+        date or record['write_date'][:10],
+        description,
+        category
+    )
+
+
+def build_transactions(basis, model, records, recorded):
+    """Ledger entries that bring each record's recorded amount up to date
+
+    A record seen for the first time adds its amount; a changed one adds
+    the difference; an unchanged one adds nothing. Entries keep the
+    record's own type. The ledger only holds positive amounts, so a
+    difference that lowers that type's total (a refund, a reduced invoice,
+    a cancellation) is written as a reversal entry, which the totals
+    subtract. recorded is updated in place.
+    """
+    transactions = []
+    now = datetime.now().isoformat()
+
+    for record in records:
+        external_id, trans_type, amount, date, description, category = map_record(basis, model, record)
+        previous = recorded.get(external_id, 0.0)
+        # Change in net income, then as seen from the record's own type
+        delta = to_net_amount(trans_type, round(amount - previous, 2))
+
+        if abs(delta) < 0.005:
+            continue
+
+        if external_id in recorded:
+            description += " (reversal)" if amount == 0 else " (adjustment)"
+
+        transaction = {
+            'date': date,
+            'type': trans_type,
+            'amount': abs(delta),
+            'description': description,
+            'logged_at': now,
+            'category': category,
+            'external_id': external_id,
+            'source': 'odoo'
+        }
+        if delta < 0:
+            transaction['reversal'] = True
+        transactions.append(transaction)
+        recorded[external_id] = amount
+
+    return transactions
+
+
+def batch_in_ledger(batch, months):
+    """True if any ledger line of the given months carries the batch id"""
+    marker = batch.encode('utf-8')
+
+    for month in months:
+        ledger_file = accounting_manager.get_ledger_file(datetime.strptime(month, "%Y-%m"))
+        for path in [f"{ledger_file}.gz", ledger_file]:
+            if not os.path.exists(path):
+                continue
+            with accounting_manager.open_ledger(path) as f:
+                if any(marker in line for line in f):
+                    return True
+
+    return False
+
+
+def apply_page(state, model, cursor, updates):
+    """Move the cursor past a page and record its amounts"""
+    state['recorded'].update(updates)
+    state['cursors'][model] = cursor
+    state.pop('pending', None)
+
+
+def recover_pending_page(state):
+    """Settle a page interrupted between its ledger append and its state save
+
+    The ledger decides: if the page's batch reached it the page is applied,
+    otherwise it is dropped and fetched again. Returns True, False, or None
+    when nothing was pending.
+    """
+    pending = state.get('pending')
+    if not pending:
+        return None
+
+    if batch_in_ledger(pending['batch'], pending['months']):
+        apply_page(state, pending['model'], pending['cursor'], pending['recorded'])
+        return True
+
+    state.pop('pending')
+    return False
+
+
+def connect(server, state):
+    """Reuse a cached uid so a sync with no changes costs a single RPC"""
+    key = f"{server.url}|{server.db}|{server.username}"
+    uid = state['uids'].get(key)
+
+    if uid:
+        server.uid = uid
+        server.models = xmlrpc.client.ServerProxy(f'{server.url}/xmlrpc/2/object', allow_none=True)
+        return False
+
+    if not server.authenticate():
+        raise RuntimeError("Authentication with Odoo failed")
+    state['uids'][key] = server.uid
+    return True
+
+
+def sync_odoo(full=False, dry_run=False):
+    """Pull records changed since the stored cursor into the ledger"""
+    if SYNC_BASIS not in SYNC_MODELS:
+        return {
+            "success": False,
+            "error": f"ODOO_SYNC_BASIS must be one of: {', '.join(SYNC_MODELS)}"
+        }
+
+    server = OdooMCPServer()
+    if not server.username or not server.password:
+        return {
+            "success": False,
+            "error": "ODOO_USERNAME and ODOO_PASSWORD must be set"
+        }
+
+    accounting_manager.ensure_directories()
+    spec = SYNC_MODELS[SYNC_BASIS]
+    model = spec['model']
+
+    with accounting_manager.accounting_lock():
+        state = load_sync_state()
+        recovered = recover_pending_page(state)
+        if recovered is not None and not dry_run:
+            save_sync_state(state)
+            accounting_manager.log_to_business_log(
+                f"Odoo sync: interrupted page {'applied' if recovered else 'discarded'} on restart"
+            )
+
+    cursor = None if full else state['cursors'].get(model)
+
+    stats = {'rpc_calls': 0, 'fetched': 0, 'appended': 0, 'pages': 0}
+
+    try:
+        authenticated = connect(server, state)
+        stats['rpc_calls'] += authenticated
+
+        while True:
+            try:
+                stats['rpc_calls'] += 1
+                records = server.search_read_changes(model, spec['fields'], spec['domain'], cursor, SYNC_PAGE_SIZE)
+            except xmlrpc.client.Fault:
+                if authenticated:
+                    raise
+                # The cached uid went stale (password change, new database)
+                state['uids'].clear()
+                authenticated = connect(server, state)
+                stats['rpc_calls'] += 2
+                records = server.search_read_changes(model, spec['fields'], spec['domain'], cursor, SYNC_PAGE_SIZE)
+
+            stats['pages'] += 1
+            stats['fetched'] += len(records)
+
+            if records:
+                # New amounts collect in the first map until the page is applied
+                recorded = ChainMap({}, state['recorded'])
+                transactions = build_transactions(SYNC_BASIS, model, records, recorded)
+                updates = recorded.maps[0]
+                cursor = [records[-1]['write_date'], records[-1]['id']]
+                stats['appended'] += len(transactions)
+
+                if dry_run:
+                    state['recorded'].update(updates)
+                else:
+                    with accounting_manager.accounting_lock():
+                        if transactions:
+                            # Saved before the append; the batch id in the ledger shows
+                            # after a crash whether the page landed (recover_pending_page)
+                            batch = uuid.uuid4().hex
+                            for transaction in transactions:
+                                transaction['sync_batch'] = batch
+                            state['pending'] = {
+                                'batch': batch,
+                                'months': sorted({t['date'][:7] for t in transactions}),
+                                'model': model,
+                                'cursor': cursor,
+                                'recorded': updates
+                            }
+                            save_sync_state(state)
+
+                            accounting_manager.initialize_current_month()
+                            accounting_manager.append_batch_to_ledger(transactions)
+
+                        apply_page(state, model, cursor, updates)
+                        save_sync_state(state)
+
+            if len(records) < SYNC_PAGE_SIZE:
+                break
+
+    except Exception as e:
+        accounting_manager.log_to_business_log(f"Odoo sync failed: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            **stats
+        }
+
+    if not dry_run:
+        state['last_sync'] = datetime.now().isoformat()
+        with accounting_manager.accounting_lock():
+            save_sync_state(state)
+
+        if stats['appended']:
+            accounting_manager.refresh_current_month()
+            accounting_manager.log_to_business_log(
+                f"Odoo sync: {stats['appended']} ledger entries from {stats['fetched']} changed {model} records"
+            )
+
+    return {
+        "success": True,
+        "basis": SYNC_BASIS,
+        "model": model,
+        "dry_run": dry_run,
+        "cursor": cursor,
+        **stats
+    }
+
+
+def show_status():
+    """Show the stored cursors and how many Odoo records the ledger holds"""
+    state = load_sync_state()
+
+    return {
+        "success": True,
+        "basis": SYNC_BASIS,
+        "cursors": state['cursors'],
+        "records_synced": len(state['recorded']),
+        "last_sync": state['last_sync']
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Odoo to ledger sync')
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+
+    # Sync
+    sync_parser = subparsers.add_parser('sync', help='Pull records changed since the last sync')
+    sync_parser.add_argument('--full', action='store_true', help='Ignore the cursor and re-read every record')
+    sync_parser.add_argument('--dry-run', action='store_true', help='Report what would be appended without writing')
+
+    # Status
+    subparsers.add_parser('status', help='Show sync cursors')
+
+    args = parser.parse_args()
+
+    if args.command == 'sync':
+        result = sync_odoo(args.full, args.dry_run)
+    elif args.command == 'status':
+        result = show_status()
+    else:
+        parser.print_help()
+        return
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,10 @@ import os
 import sys
 import json
 import time
-import subprocess
-from datetime import datetime
 from playwright.sync_api import sync_playwright
 
+import social_summary
+
 
 def post_linkedin(content):
     """Create a LinkedIn text post"""
@@ -62,18 +62,8 @@ def post_linkedin(content):
                     if "Create a post" not in page.content():
                         browser.close()
 
-                        # Log to social summary
-                        try:
-                            subprocess.run([
-                                sys.executable,
-                                os.path.join(os.path.dirname(__file__), 'social_summary.py'),
-                                'log',
-                                '--platform', 'linkedin',
-                                '--content', content,
-                                '--date', datetime.now().strftime('%Y-%m-%d')
-                            ], check=False, capture_output=True)
-                        except Exception:
-                            pass  # Don't fail the post if logging fails
+                        # Log to social summary (never fails the post)
+                        social_summary.record_published_post('linkedin', content)
 
                         return {"success": f"LinkedIn post created successfully: {content[:50]}..."}
                     else:
@@ -12,6 +12,8 @@ from datetime import datetime
 from pathlib import Path
 import requests
 
+import social_summary
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -273,22 +275,7 @@ class MetaSocialPoster:
 
     def _log_to_social_summary(self, platform: str, content: str):
         """Log to social summary system"""
-        try:
-            import subprocess
-            script_path = Path(__file__).parent.parent.parent / 'scripts' / 'social_summary.py'
-
-            if script_path.exists():
-                subprocess.run([
-                    sys.executable,
-                    str(script_path),
-                    'log',
-                    '--platform', platform,
-                    '--content', content,
-                    '--date', datetime.now().strftime('%Y-%m-%d')
-                ], check=False, capture_output=True)
-
-        except Exception as e:
-            logger.error(f"Failed to log to social summary: {e}")
+        social_summary.record_published_post(platform, content)
 
 
 def main():
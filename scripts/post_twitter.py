@@ -10,8 +10,11 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 import requests
 
+import social_summary
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -83,6 +86,7 @@ class TwitterPoster:
                 tweet_data = response.json()
                 tweet_id = tweet_data['data']['id']
                 tweet_text = tweet_data['data']['text']
+                tweet_url = f"https://twitter.com/user/status/{tweet_id}"
 
                 # Log to history
                 self._log_to_history(tweet_id, tweet_text)
@@ -91,7 +95,7 @@ class TwitterPoster:
                 self._log_business_activity(f"Posted tweet: {tweet_text[:50]}...")
 
                 # Log to social summary
-                self._log_to_social_summary(tweet_text)
+                self._log_to_social_summary(tweet_text, tweet_url)
 
                 logger.info(f"Tweet posted successfully: {tweet_id}")
 
@@ -99,7 +103,7 @@ class TwitterPoster:
                     "success": True,
                     "tweet_id": tweet_id,
                     "content": tweet_text,
-                    "url": f"https://twitter.com/user/status/{tweet_id}"
+                    "url": tweet_url
                 }
 
             else:
@@ -217,24 +221,9 @@ class TwitterPoster:
         except Exception as e:
             logger.error(f"Failed to log error: {e}")
 
-    def _log_to_social_summary(self, content: str):
+    def _log_to_social_summary(self, content: str, url: Optional[str] = None):
         """Log to social summary system"""
-        try:
-            import subprocess
-            script_path = Path(__file__).parent.parent.parent / 'scripts' / 'social_summary.py'
-
-            if script_path.exists():
-                subprocess.run([
-                    sys.executable,
-                    str(script_path),
-                    'log',
-                    '--platform', 'twitter',
-                    '--content', content,
-                    '--date', datetime.now().strftime('%Y-%m-%d')
-                ], check=False, capture_output=True)
-
-        except Exception as e:
-            logger.error(f"Failed to log to social summary: {e}")
+        social_summary.record_published_post('twitter', content, url=url)
 
 
 def main():
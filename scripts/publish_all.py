@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Multi-Platform Publisher
+Publishes one announcement to Twitter, Facebook, Instagram and LinkedIn
+concurrently and reports the outcome per platform
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import argparse
+import contextlib
+from datetime import datetime
+
+
+# Configuration
+VAULT_PATH = os.path.join(os.path.dirname(__file__), "..", "AI_Employee_Vault")
+LOGS_PATH = os.path.join(VAULT_PATH, "Logs")
+
+# Environment variables
+PUBLISH_TIMEOUT = float(os.getenv('PUBLISH_TIMEOUT', '120'))  # Seconds per platform
+
+PLATFORMS = ['twitter', 'facebook', 'instagram', 'linkedin']
+
+
+def log_to_business_log(message):
+    """Log to business.log"""
+    try:
+        os.makedirs(LOGS_PATH, exist_ok=True)
+        log_file = os.path.join(LOGS_PATH, "business.log")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write(f"[{timestamp}] PUBLISH: {message}\n")
+    except Exception:
+        pass
+
+
+# Each publisher runs in its own worker process and imports its poster
+# there, so a platform whose client library is missing fails on its own.
+
+def publish_twitter(variant):
+    """Post a tweet"""
+    from post_twitter import TwitterPoster
+    return TwitterPoster().post_tweet(variant['content'])
+
+
+def publish_facebook(variant):
+    """Post to the Facebook page"""
+    from post_meta import MetaSocialPoster
+    return MetaSocialPoster().post_facebook(variant['content'], link=variant.get('link'))
+
+
+def publish_instagram(variant):
+    """Post an image with caption to Instagram"""
+    from post_meta import MetaSocialPoster
+    return MetaSocialPoster().post_instagram(variant['content'], image_url=variant.get('image_url'))
+
+
+def publish_linkedin(variant):
+    """Post to LinkedIn through the Playwright browser session"""
+    from post_linkedin import post_linkedin
+    return post_linkedin(variant['content'])
+
+
+PUBLISHERS = {
+    'twitter': publish_twitter,
+    'facebook': publish_facebook,
+    'instagram': publish_instagram,
+    'linkedin': publish_linkedin
+}
+
+
+def build_variants(content, variants=None, platforms=None, image_url=None, link=None):
+    """Per-platform {content, image_url, link}; a variant may be text or a dict overriding the defaults"""
+    built = {}
+
+    for platform in platforms or PLATFORMS:
+        variant = {'content': content, 'image_url': image_url, 'link': link}
+        override = (variants or {}).get(platform)
+        if isinstance(override, str):
+            variant['content'] = override
+        elif isinstance(override, dict):
+            variant.update({key: value for key, value in override.items() if value is not None})
+        built[platform] = variant
+
+    return built
+
+
+def is_success(result):
+    """Posters report failure with an 'error' key and success with a truthy 'success'"""
+    return isinstance(result, dict) and 'error' not in result and bool(result.get('success'))
+
+
+def kill_worker(process):
+    """Kill a worker and anything it started (the LinkedIn browser)"""
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def publish_platform(platform, variant, timeout):
+    """Run one platform's poster in a worker process, killed if it overruns
+
+    A killed worker may already have posted, so a timeout is reported with
+    status 'unknown' rather than as a failure that is safe to re-run.
+    """
+    started = time.monotonic()
+    status = 'failed'
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, os.path.abspath(__file__), '--worker', platform,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=hasattr(os, 'killpg')
+        )
+
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(json.dumps(variant).encode('utf-8')), timeout)
+        except asyncio.TimeoutError:
+            kill_worker(process)
+            await process.wait()
+            status = 'unknown'
+            result = {"error": f"Timed out after {timeout:g}s; the post may or may not have been published"}
+        else:
+            try:
+                result = json.loads(stdout.decode('utf-8').strip().splitlines()[-1])
+            except (ValueError, IndexError):
+                result = {"error": f"Worker exited with code {process.returncode} without a result"}
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+
+    if is_success(result):
+        status = 'published'
+
+    return platform, {
+        'success': status == 'published',
+        'status': status,
+        'elapsed': round(time.monotonic() - started, 3),
+        'result': result
+    }
+
+
+async def publish_all_async(content, variants=None, platforms=None, image_url=None, link=None, timeout=None):
+    """Publish to every platform at once; wall-clock time is the slowest platform's"""
+    timeout = PUBLISH_TIMEOUT if timeout is None else timeout
+    platforms = platforms or PLATFORMS
+
+    unsupported = [platform for platform in platforms if platform not in PUBLISHERS]
+    if unsupported:
+        return {
+            "success": False,
+            "error": f"Unknown platforms: {', '.join(unsupported)}"
+        }
+
+    started = time.monotonic()
+    built = build_variants(content, variants, platforms, image_url, link)
+    outcomes = await asyncio.gather(*[
+        publish_platform(platform, variant, timeout) for platform, variant in built.items()
+    ])
+
+    results = dict(outcomes)
+    by_status = {
+        status: [platform for platform, outcome in results.items() if outcome['status'] == status]
+        for status in ('published', 'failed', 'unknown')
+    }
+    succeeded, failed, undetermined = by_status['published'], by_status['failed'], by_status['unknown']
+
+    log_to_business_log(
+        f"Published to {len(succeeded)}/{len(results)} platforms"
+        + (f" (failed: {', '.join(failed)})" if failed else "")
+        + (f" (unknown: {', '.join(undetermined)})" if undetermined else "")
+        + f": {content[:50]}"
+    )
+
+    return {
+        "success": bool(succeeded),
+        "partial": bool(succeeded) and bool(failed or undetermined),
+        "succeeded": succeeded,
+        "failed": failed,
+        "unknown": undetermined,
+        "elapsed": round(time.monotonic() - started, 3),
+        "results": results
+    }
+
+
+def publish_all(content, variants=None, platforms=None, image_url=None, link=None, timeout=None):
+    """Synchronous entry point for publish_all_async"""
+    return asyncio.run(publish_all_async(content, variants, platforms, image_url, link, timeout))
+
+
+def run_worker(platform):
+    """Worker process: publish the variant read from stdin, print the result as the last stdout line"""
+    variant = json.loads(sys.stdin.read())
+
+    try:
+        # Keep anything a poster prints off the result channel
+        with contextlib.redirect_stdout(sys.stderr):
+            result = PUBLISHERS[platform](variant)
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+
+    print(json.dumps(result, default=str))
+
+
+def load_variants(value):
+    """Parse --variants: inline JSON or @path to a JSON file"""
+    if not value:
+        return None
+    if value.startswith('@'):
+        with open(value[1:], 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return json.loads(value)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Publish one announcement to every social platform concurrently')
+    parser.add_argument('content', nargs='?', help='Default post content')
+    parser.add_argument('--platforms', nargs='+', choices=PLATFORMS, help='Platforms to publish to (default: all)')
+    parser.add_argument('--variants', help='Per-platform overrides as JSON or @file, e.g. {"twitter": "short text"}')
+    parser.add_argument('--image-url', help='Image URL (required by Instagram)')
+    parser.add_argument('--link', help='Link to share on Facebook')
+    parser.add_argument('--timeout', type=float, help=f'Seconds per platform (default: {PUBLISH_TIMEOUT:.0f})')
+    parser.add_argument('--worker', choices=PLATFORMS, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker)
+        return
+
+    if not args.content:
+        parser.error('content is required')
+
+    try:
+        variants = load_variants(args.variants)
+    except (OSError, ValueError) as e:
+        print(json.dumps({"success": False, "error": f"Invalid --variants: {e}"}, indent=2))
+        sys.exit(1)
+
+    result = publish_all(args.content, variants, args.platforms, args.image_url, args.link, args.timeout)
+    print(json.dumps(result, indent=2))
+
+    if not result.get('success'):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Ralph Wiggum Throughput Benchmark
+Generates a synthetic vault and measures how the Ralph loop performs at scale
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import shutil
+import tempfile
+import platform
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import ralph_wiggum
+
+
+FILLER_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua"
+).split()
+
+
+class CountingFile:
+    """File wrapper that counts bytes read and written"""
+
+    def __init__(self, f, stats):
+        self._f = f
+        self._stats = stats
+
+    @staticmethod
+    def _size(data):
+        return len(data.encode('utf-8')) if isinstance(data, str) else len(data)
+
+    def read(self, *args):
+        data = self._f.read(*args)
+        self._stats['bytes_read'] += self._size(data)
+        return data
+
+    def readline(self, *args):
+        data = self._f.readline(*args)
+        self._stats['bytes_read'] += self._size(data)
+        return data
+
+    def write(self, data):
+        self._stats['bytes_written'] += self._size(data)
+        return self._f.write(data)
+
+    def __iter__(self):
+        for line in self._f:
+            self._stats['bytes_read'] += self._size(line)
+            yield line
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return self._f.__exit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+
+def generate_vault(vault_path, task_count, task_size, step_count, risky_ratio, seed=42):
+    """Create a synthetic vault with task_count tasks in Inbox"""
+    rng = random.Random(seed)
+    inbox_path = os.path.join(vault_path, "Inbox")
+    os.makedirs(inbox_path, exist_ok=True)
+
+    risky_count = 0
+    for i in range(task_count):
+        risky = rng.random() < risky_ratio
+        risky_count += risky
+
+        lines = [f"# Synthetic Task {i:05d}", "", "## Description"]
+        if risky:
+            lines.append(f"Transfer the payment for invoice {i} and {rng.choice(ralph_wiggum.RISKY_KEYWORDS)} the record.")
+        else:
+            lines.append(f"Prepare the weekly summary for account {i}.")
+
+        lines += ["", "## Steps"]
+        lines += [f"{step + 1}. Complete part {step + 1} of the summary" for step in range(step_count)]
+        lines += ["", "## Notes"]
+
+        content = "\n".join(lines) + "\n"
+        filler = []
+        while len(content) + len(" ".join(filler)) < task_size:
+            filler.append(rng.choice(FILLER_WORDS))
+        content += " ".join(filler) + "\n"
+
+        with open(os.path.join(inbox_path, f"task_{i:05d}.md"), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    return risky_count
+
+
+def point_ralph_at(vault_path, max_iterations):
+    """Redirect the ralph_wiggum module at a vault and disable delays"""
+    ralph_wiggum.set_vault_path(vault_path)
+    ralph_wiggum.ITERATION_DELAY = 0
+    ralph_wiggum.MAX_ITERATIONS = max_iterations
+
+
+def instrument(stats):
+    """Count file I/O and time every process_task call"""
+    def counting_open(*args, **kwargs):
+        return CountingFile(open(*args, **kwargs), stats)
+
+    original_process_task = ralph_wiggum.process_task
+
+    def timed_process_task(*args, **kwargs):
+        started = time.perf_counter()
+        result = original_process_task(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+
+        stats['status_counts'][result['status']] = stats['status_counts'].get(result['status'], 0) + 1
+        if result['status'] in ['in_progress', 'completed']:
+            stats['latencies'].append(elapsed)
+        return result
+
+    # Module globals shadow builtins, so this only affects ralph_wiggum
+    ralph_wiggum.open = counting_open
+    ralph_wiggum.process_task = timed_process_task
+
+    return original_process_task
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def run_benchmark(task_count=100, task_size=2048, step_count=3, risky_ratio=0.1,
+                  mode='all', vault_path=None, keep=False, max_passes=None):
+    """Generate a synthetic vault, run Ralph over it and return the measurements"""
+    temp_vault = vault_path is None
+    if temp_vault:
+        vault_path = tempfile.mkdtemp(prefix='ralph_bench_')
+
+    max_iterations = step_count + 1
+    max_passes = max_passes or max_iterations + 1
+
+    stats = {'bytes_read': 0, 'bytes_written': 0, 'latencies': [], 'status_counts': {}}
+
+    try:
+        risky_count = generate_vault(vault_path, task_count, task_size, step_count, risky_ratio)
+        point_ralph_at(vault_path, max_iterations)
+        instrument(stats)
+
+        passes = 0
+        started = time.perf_counter()
+
+        if mode == 'all':
+            while passes < max_passes:
+                passes += 1
+                result = ralph_wiggum.process_all_tasks()
+                statuses = [r['result']['status'] for r in result.get('results', [])]
+                if 'in_progress' not in statuses:
+                    break
+        else:
+            inbox = ralph_wiggum.INBOX_PATH
+            for task_filename in sorted(os.listdir(inbox)):
+                task_file = os.path.join(inbox, task_filename)
+                for _ in range(max_passes):
+                    if ralph_wiggum.process_task(task_file)['status'] != 'in_progress':
+                        break
+            passes = 1
+
+        elapsed = time.perf_counter() - started
+    finally:
+        if temp_vault and not keep:
+            shutil.rmtree(vault_path, ignore_errors=True)
+
+    latencies = stats['latencies']
+    completed = stats['status_counts'].get('completed', 0)
+
+    return {
+        'success': True,
+        'benchmark': 'ralph_throughput',
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'params': {
+            'tasks': task_count,
+            'task_size': task_size,
+            'steps': step_count,
+            'risky_ratio': risky_ratio,
+            'mode': mode
+        },
+        'risky_tasks': risky_count,
+        'passes': passes,
+        'elapsed_sec': round(elapsed, 4),
+        'tasks_completed': completed,
+        'tasks_per_sec': round(completed / elapsed, 2) if elapsed else 0.0,
+        'iterations': len(latencies),
+        'iterations_per_sec': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50) * 1000, 3),
+            'p99': round(percentile(latencies, 99) * 1000, 3),
+            'max': round(max(latencies) * 1000, 3) if latencies else 0.0
+        },
+        'bytes_read': stats['bytes_read'],
+        'bytes_written': stats['bytes_written'],
+        'status_counts': stats['status_counts'],
+        'vault': vault_path if keep or not temp_vault else None
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Ralph Wiggum Throughput Benchmark')
+    parser.add_argument('--tasks', type=int, default=100, help='Number of synthetic tasks')
+    parser.add_argument('--size', type=int, default=2048, help='Approximate task file size in bytes')
+    parser.add_argument('--steps', type=int, default=3, help='Steps per task')
+    parser.add_argument('--risky-ratio', type=float, default=0.1, help='Fraction of tasks with risky keywords')
+    parser.add_argument('--mode', choices=['all', 'single'], default='all', help='Use process_all_tasks or process_task per task')
+    parser.add_argument('--vault', help='Generate the vault here instead of a temp directory')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated temp vault')
+    parser.add_argument('--output', help='Append the result as a JSON line to this file')
+
+    args = parser.parse_args()
+
+    result = run_benchmark(
+        task_count=args.tasks,
+        task_size=args.size,
+        step_count=args.steps,
+        risky_ratio=args.risky_ratio,
+        mode=args.mode,
+        vault_path=os.path.abspath(args.vault) if args.vault else None,
+        keep=args.keep
+    )
+
+    if args.output:
+        with open(args.output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(result) + '\n')
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
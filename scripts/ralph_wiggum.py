@@ -10,20 +10,19 @@ import json
 import argparse
 import time
 import shutil
+import signal
+import queue
+import gzip
+import heapq
 from datetime import datetime, timedelta
 from pathlib import Path
 import re
 
+from file_lock import FileLock
+
 
 # Configuration
-VAULT_PATH = os.path.join(os.path.dirname(__file__), "..", "AI_Employee_Vault")
-INBOX_PATH = os.path.join(VAULT_PATH, "Inbox")
-NEEDS_ACTION_PATH = os.path.join(VAULT_PATH, "Needs_Action")
-DONE_PATH = os.path.join(VAULT_PATH, "Done")
-NEEDS_APPROVAL_PATH = os.path.join(VAULT_PATH, "Needs_Approval")
-ERRORS_PATH = os.path.join(VAULT_PATH, "Errors")
-LOGS_PATH = os.path.join(VAULT_PATH, "Logs")
-STATE_FILE = os.path.join(VAULT_PATH, ".ralph_state.json")
+DEFAULT_VAULT_PATH = os.path.join(os.path.dirname(__file__), "..", "AI_Employee_Vault")
 
 # Environment variables
 MAX_ITERATIONS = int(os.getenv('RALPH_MAX_ITERATIONS', '5'))
@@ -31,6 +30,14 @@ ITERATION_DELAY = int(os.getenv('RALPH_ITERATION_DELAY', '10'))
 REQUIRE_APPROVAL = os.getenv('RALPH_REQUIRE_APPROVAL', 'true').lower() == 'true'
 APPROVAL_TIMEOUT = int(os.getenv('RALPH_APPROVAL_TIMEOUT', '3600'))
 VERBOSE = os.getenv('RALPH_VERBOSE', 'false').lower() == 'true'
+DAEMON_TICK = float(os.getenv('RALPH_DAEMON_TICK', '1'))
+APPROVAL_POLL_INTERVAL = int(os.getenv('RALPH_APPROVAL_POLL_INTERVAL', '30'))
+RETENTION_HOURS = float(os.getenv('RALPH_RETENTION_HOURS', '24'))
+COMPACT_INTERVAL = int(os.getenv('RALPH_COMPACT_INTERVAL', '3600'))
+PASS_BUDGET = int(os.getenv('RALPH_PASS_BUDGET', '0'))  # Iterations per process-all pass, 0 = unlimited
+AGING_MINUTES = float(os.getenv('RALPH_AGING_MINUTES', '30'))  # Wait that promotes a task one priority level
+DAEMON_RETRY_DELAY = int(os.getenv('RALPH_DAEMON_RETRY_DELAY', '30'))  # First backoff after a failed iteration
+DAEMON_MAX_BACKOFF = int(os.getenv('RALPH_DAEMON_MAX_BACKOFF', '3600'))
 
 # Risky keywords that require human approval
 RISKY_KEYWORDS = [
@@ -40,6 +47,51 @@ RISKY_KEYWORDS = [
     'cancel', 'refund', 'void'
 ]
 
+# Priority levels from task frontmatter (lower runs first)
+PRIORITY_LEVELS = {'urgent': 0, 'critical': 0, 'high': 1, 'medium': 2, 'normal': 2, 'low': 3}
+DEFAULT_PRIORITY = 'medium'
+PRIORITY_PATTERN = re.compile(r'^\W*priority\W*:\W*(\w+)', re.IGNORECASE | re.MULTILINE)
+
+# Step status markers are the same width so a step can be ticked off in place
+PENDING_MARKER = '- [ ] Status: pending'
+DONE_MARKER = '- [x] Status: success'
+PENDING_MARKER_PATTERN = re.compile(rb'^' + re.escape(PENDING_MARKER.encode('utf-8')) + rb'\r?$', re.MULTILINE)
+
+# Plans created before the iteration log became the last section end with
+# this footer; it is removed so iterations can append at the end
+LEGACY_PLAN_FOOTER_PATTERN = re.compile(rb'\r?\n---\r?\n\*Created by Ralph Wiggum Autonomous Loop\*[ \t]*(\r?\n)?')
+PLAN_LAYOUT_VERSION = 2
+
+# Loop states that will never be iterated again
+TERMINAL_STATUSES = ['completed', 'rejected', 'stopped', 'max_iterations_exceeded']
+
+
+def set_vault_path(vault_path):
+    """Point every vault path, the state file and its locks at vault_path
+
+    Every read-modify-write of the state file holds STATE_LOCK; a running
+    daemon holds DAEMON_LOCK for its lifetime.
+    """
+    global VAULT_PATH, INBOX_PATH, NEEDS_ACTION_PATH, DONE_PATH, NEEDS_APPROVAL_PATH, ERRORS_PATH, LOGS_PATH
+    global STATE_FILE, STATE_LOCK_FILE, DAEMON_LOCK_FILE, STATE_ARCHIVE_PATH, STATE_LOCK, DAEMON_LOCK
+
+    VAULT_PATH = vault_path
+    INBOX_PATH = os.path.join(VAULT_PATH, "Inbox")
+    NEEDS_ACTION_PATH = os.path.join(VAULT_PATH, "Needs_Action")
+    DONE_PATH = os.path.join(VAULT_PATH, "Done")
+    NEEDS_APPROVAL_PATH = os.path.join(VAULT_PATH, "Needs_Approval")
+    ERRORS_PATH = os.path.join(VAULT_PATH, "Errors")
+    LOGS_PATH = os.path.join(VAULT_PATH, "Logs")
+    STATE_FILE = os.path.join(VAULT_PATH, ".ralph_state.json")
+    STATE_LOCK_FILE = os.path.join(VAULT_PATH, ".ralph_state.lock")
+    DAEMON_LOCK_FILE = os.path.join(VAULT_PATH, ".ralph_daemon.lock")
+    STATE_ARCHIVE_PATH = os.path.join(VAULT_PATH, "Archive", "Ralph")
+    STATE_LOCK = FileLock(STATE_LOCK_FILE)
+    DAEMON_LOCK = FileLock(DAEMON_LOCK_FILE)
+
+
+set_vault_path(DEFAULT_VAULT_PATH)
+
 
 def ensure_directories():
     """Ensure all required directories exist"""
@@ -76,8 +128,17 @@ def save_loop_state(state):
     """Save loop state to file"""
     ensure_directories()
 
-    with open(STATE_FILE, 'w', encoding='utf-8') as f:
+    # Write to a temp file and swap it in so a crash never leaves half a state file
+    temp_file = f"{STATE_FILE}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
         json.dump(state, indent=2, fp=f)
+    os.replace(temp_file, STATE_FILE)
+
+
+def is_daemon_running():
+    """True if a Ralph daemon in another process owns the loop"""
+    with DAEMON_LOCK.hold(blocking=False) as acquired:
+        return not acquired
 
 
 def is_risky(task_content):
@@ -116,10 +177,19 @@ def analyze_task(task_file):
         'steps': steps,
         'complexity': 'high' if len(steps) > 3 else 'medium' if len(steps) > 1 else 'low',
         'risky': risky,
+        'priority': get_task_priority(content),
         'estimated_iterations': estimated_iterations
     }
 
 
+def get_task_priority(task_content):
+    """Read the task priority from frontmatter or a 'Priority:' line"""
+    match = PRIORITY_PATTERN.search(task_content)
+    if match and match.group(1).lower() in PRIORITY_LEVELS:
+        return match.group(1).lower()
+    return DEFAULT_PRIORITY
+
+
 def create_plan(task_file, analysis):
     """Create execution plan for task"""
     task_id = os.path.basename(task_file)
@@ -130,12 +200,12 @@ def create_plan(task_file, analysis):
     # Generate steps from analysis
     if analysis['steps']:
         steps_section = "\n".join([
-            f"### Step {i+1}: {step}\n- [ ] Status: pending\n- Action: Execute step\n- Validation: Check result\n"
+            f"### Step {i+1}: {step}\n{PENDING_MARKER}\n- Action: Execute step\n- Validation: Check result\n"
             for i, step in enumerate(analysis['steps'])
         ])
     else:
-        steps_section = """### Step 1: Analyze and Execute
-- [ ] Status: pending
+        steps_section = f"""### Step 1: Analyze and Execute
+{PENDING_MARKER}
 - Action: Complete task objective
 - Validation: Task completed successfully
 """
@@ -152,6 +222,8 @@ risky: {str(analysis['risky']).lower()}
 
 # Task Plan: {analysis['title']}
 
+*Created by Ralph Wiggum Autonomous Loop*
+
 ## Objective
 {analysis['title']}
 
@@ -160,13 +232,14 @@ risky: {str(analysis['risky']).lower()}
 {steps_section}
 
 ## Iteration Log
-
----
-*Created by Ralph Wiggum Autonomous Loop*
 """
 
-    with open(plan_filepath, 'w', encoding='utf-8') as f:
-        f.write(plan_content)
+    # The iteration log is the last section so iterations only ever append
+    plan_bytes = plan_content.encode('utf-8')
+    with open(plan_filepath, 'wb') as f:
+        f.write(plan_bytes)
+
+    save_plan_index(plan_filepath, build_plan_index(plan_bytes))
 
     log_to_business_log(f"Created plan for task {task_id}: {plan_filename}")
 
@@ -189,8 +262,8 @@ def parse_plan(plan_file):
                     metadata[key.strip()] = value.strip()
 
     # Count completed steps
-    completed_steps = content.count('- [x]')
-    total_steps = content.count('- [ ]') + completed_steps
+    completed_steps = content.count('- [x] Status:')
+    total_steps = content.count(PENDING_MARKER) + completed_steps
 
     return {
         'metadata': metadata,
@@ -201,15 +274,91 @@ def parse_plan(plan_file):
     }
 
 
+def get_plan_index_file(plan_file):
+    """Path of the sidecar index that tracks a plan's step markers"""
+    return os.path.splitext(plan_file)[0] + '.index.json'
+
+
+def build_plan_index(plan_bytes):
+    """Index the byte offsets of the pending step markers in a plan"""
+    pending_offsets = [match.start() for match in PENDING_MARKER_PATTERN.finditer(plan_bytes)]
+    completed_steps = plan_bytes.count(b'- [x] Status:')
+
+    return {
+        'layout': PLAN_LAYOUT_VERSION,
+        'crlf': b'\r\n' in plan_bytes,
+        'pending_offsets': pending_offsets,
+        'completed_steps': completed_steps,
+        'total_steps': completed_steps + len(pending_offsets)
+    }
+
+
+def migrate_plan_layout(plan_file, plan_bytes):
+    """Drop the footer of an old-layout plan so the iteration log ends the file
+
+    Log entries already written after the footer are kept. Returns the
+    plan's bytes as they are on disk afterwards.
+    """
+    migrated = LEGACY_PLAN_FOOTER_PATTERN.sub(b'\r\n' if b'\r\n' in plan_bytes else b'\n', plan_bytes, count=1)
+    if migrated == plan_bytes:
+        return plan_bytes
+
+    temp_file = f"{plan_file}.tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(migrated)
+    os.replace(temp_file, plan_file)
+
+    log_to_business_log(f"Migrated plan {os.path.basename(plan_file)} to the append-only layout")
+    return migrated
+
+
+def index_plan_file(plan_file):
+    """Migrate a plan if needed, then index and save it with one scan"""
+    with open(plan_file, 'rb') as f:
+        plan_bytes = migrate_plan_layout(plan_file, f.read())
+
+    index = build_plan_index(plan_bytes)
+    save_plan_index(plan_file, index)
+    return index
+
+
+def save_plan_index(plan_file, index):
+    """Save a plan's sidecar index"""
+    index_file = get_plan_index_file(plan_file)
+    temp_file = f"{index_file}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(temp_file, index_file)
+
+
+def load_plan_index(plan_file):
+    """Load a plan's sidecar index, building it with one scan for older plans"""
+    index_file = get_plan_index_file(plan_file)
+
+    if os.path.exists(index_file):
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('layout') == PLAN_LAYOUT_VERSION:
+                return index
+        except Exception:
+            pass
+
+    return index_plan_file(plan_file)
+
+
 def execute_iteration(task_file, plan_file, iteration):
-    """Execute one iteration of the task"""
+    """Execute one iteration of the task
+
+    Ticks off the next step in place and appends to the iteration log, so the
+    cost of an iteration does not grow with the plan's history.
+    """
     log_to_business_log(f"Executing iteration {iteration} for {os.path.basename(task_file)}")
 
-    # Parse plan
-    plan = parse_plan(plan_file)
+    index = load_plan_index(plan_file)
 
     # Check if already complete
-    if plan['all_steps_done']:
+    if not index['pending_offsets']:
         return {
             'success': True,
             'status': 'completed',
@@ -219,34 +368,51 @@ def execute_iteration(task_file, plan_file, iteration):
     # Simulate step execution (in real implementation, this would call actual task execution)
     # For now, we'll mark the first uncompleted step as done
 
-    with open(plan_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Find first uncompleted step and mark as done
-    updated_content = content.replace('- [ ] Status: pending', '- [x] Status: completed', 1)
-
-    # Add iteration log entry
-    iteration_log = f"""
+    pending_marker = PENDING_MARKER.encode('utf-8')
+
+    with open(plan_file, 'r+b') as f:
+        offset = index['pending_offsets'][0]
+        f.seek(offset)
+
+        # The plan was edited by hand since it was indexed
+        if f.read(len(pending_marker)) != pending_marker:
+            f.seek(0)
+            index = build_plan_index(f.read())
+            if not index['pending_offsets']:
+                save_plan_index(plan_file, index)
+                return {
+                    'success': True,
+                    'status': 'completed',
+                    'message': 'All steps completed'
+                }
+            offset = index['pending_offsets'][0]
+
+        # Find first uncompleted step and mark as done
+        f.seek(offset)
+        f.write(DONE_MARKER.encode('utf-8'))
+
+        index['pending_offsets'].pop(0)
+        index['completed_steps'] += 1
+        step = index['completed_steps']
+
+        # Add iteration log entry
+        iteration_log = f"""
 ### Iteration {iteration} ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})
-- Executed: Step {iteration}
+- Executed: Step {step}
 - Result: Success
-- Next: {"Complete" if iteration >= plan['total_steps'] else f"Step {iteration + 1}"}
+- Next: {"Complete" if step >= index['total_steps'] else f"Step {step + 1}"}
 """
 
-    # Insert before the final separator
-    if '---\n*Created by Ralph Wiggum' in updated_content:
-        updated_content = updated_content.replace(
-            '---\n*Created by Ralph Wiggum',
-            f'{iteration_log}\n---\n*Created by Ralph Wiggum'
-        )
+        if index.get('crlf'):
+            iteration_log = iteration_log.replace('\n', '\r\n')
 
-    with open(plan_file, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
+        f.seek(0, os.SEEK_END)
+        f.write(iteration_log.encode('utf-8'))
 
-    # Check if task is complete
-    updated_plan = parse_plan(plan_file)
+    save_plan_index(plan_file, index)
 
-    if updated_plan['all_steps_done']:
+    # Check if task is complete
+    if not index['pending_offsets']:
         return {
             'success': True,
             'status': 'completed',
@@ -269,6 +435,11 @@ def move_to_done(task_file, plan_file):
     if os.path.exists(task_file):
         shutil.move(task_file, done_filepath)
 
+    # The step index is only needed while the plan is being executed
+    index_file = get_plan_index_file(plan_file)
+    if os.path.exists(index_file):
+        os.remove(index_file)
+
     # Move plan file
     if os.path.exists(plan_file):
         plan_filename = os.path.basename(plan_file)
@@ -345,15 +516,34 @@ def check_approval(approval_file):
     return 'pending'
 
 
-def process_task(task_file):
-    """Process a single task through the Ralph Wiggum loop"""
+def process_task(task_file, loop_state=None):
+    """Process a single task through the Ralph Wiggum loop
+
+    When loop_state is supplied (daemon mode) it is updated in memory and the
+    caller is responsible for persisting it. Otherwise the state file is
+    updated under the state lock, and the call is refused while a daemon runs.
+    """
+    if loop_state is not None:
+        return run_task_step(task_file, loop_state, lambda: None)
+
+    if is_daemon_running():
+        return {
+            'success': False,
+            'status': 'daemon_running',
+            'message': 'Ralph daemon is running; it processes Inbox tasks itself'
+        }
+
+    with STATE_LOCK.hold():
+        loop_state = get_loop_state()
+        return run_task_step(task_file, loop_state, lambda: save_loop_state(loop_state))
+
+
+def run_task_step(task_file, loop_state, checkpoint):
+    """Advance one task by a step, calling checkpoint after each state change"""
     ensure_directories()
 
     task_id = os.path.basename(task_file)
 
-    # Load loop state
-    loop_state = get_loop_state()
-
     # Initialize task state if not exists
     if task_id not in loop_state:
         # Analyze task
@@ -367,9 +557,11 @@ def process_task(task_file):
                 'status': 'awaiting_approval',
                 'approval_file': approval_file,
                 'started_at': datetime.now().isoformat(),
-                'current_iteration': 0
+                'current_iteration': 0,
+                'priority': analysis['priority'],
+                'estimated_iterations': analysis['estimated_iterations']
             }
-            save_loop_state(loop_state)
+            checkpoint()
 
             return {
                 'success': True,
@@ -387,9 +579,11 @@ def process_task(task_file):
             'started_at': datetime.now().isoformat(),
             'current_iteration': 0,
             'max_iterations': MAX_ITERATIONS,
-            'risky': analysis['risky']
+            'risky': analysis['risky'],
+            'priority': analysis['priority'],
+            'estimated_iterations': analysis['estimated_iterations']
         }
-        save_loop_state(loop_state)
+        checkpoint()
 
     task_state = loop_state[task_id]
 
@@ -404,12 +598,13 @@ def process_task(task_file):
 
             task_state['status'] = 'in_progress'
             task_state['plan_file'] = plan_file
-            save_loop_state(loop_state)
+            checkpoint()
 
         elif approval_status == 'rejected':
             # Move to errors
             task_state['status'] = 'rejected'
-            save_loop_state(loop_state)
+            task_state['rejected_at'] = datetime.now().isoformat()
+            checkpoint()
 
             return {
                 'success': False,
@@ -428,6 +623,10 @@ def process_task(task_file):
     if task_state['current_iteration'] >= MAX_ITERATIONS:
         log_to_business_log(f"Task {task_id} exceeded max iterations ({MAX_ITERATIONS})")
 
+        task_state['status'] = 'max_iterations_exceeded'
+        task_state['exceeded_at'] = datetime.now().isoformat()
+        checkpoint()
+
         return {
             'success': False,
             'status': 'max_iterations_exceeded',
@@ -437,7 +636,7 @@ def process_task(task_file):
     # Execute iteration
     task_state['current_iteration'] += 1
     task_state['last_iteration'] = datetime.now().isoformat()
-    save_loop_state(loop_state)
+    checkpoint()
 
     result = execute_iteration(task_file, task_state['plan_file'], task_state['current_iteration'])
 
@@ -447,7 +646,7 @@ def process_task(task_file):
 
         task_state['status'] = 'completed'
         task_state['completed_at'] = datetime.now().isoformat()
-        save_loop_state(loop_state)
+        checkpoint()
 
         return {
             'success': True,
@@ -465,8 +664,179 @@ def process_task(task_file):
     }
 
 
-def process_all_tasks():
-    """Process all tasks in Inbox"""
+def get_finished_at(task_state):
+    """Return when a terminal task entry reached its final status"""
+    for key in ['completed_at', 'rejected_at', 'stopped_at', 'exceeded_at', 'last_iteration', 'started_at']:
+        if task_state.get(key):
+            return datetime.fromisoformat(task_state[key])
+    return datetime.now()
+
+
+def get_archive_partition(finished_at):
+    """Path of the archive partition holding entries finished on a given day"""
+    return os.path.join(
+        STATE_ARCHIVE_PATH,
+        finished_at.strftime('%Y-%m'),
+        f"ralph_{finished_at.strftime('%Y-%m-%d')}.jsonl.gz"
+    )
+
+
+def compact_loop_state(loop_state=None, retention_hours=None):
+    """Move finished loop entries out of the hot state into the archive
+
+    Entries are archived once they are terminal and older than the retention
+    window. Entries whose task file is still in Inbox (rejected or
+    max-iteration tasks) stay in the hot state so they are not picked up again.
+    """
+    if loop_state is None:
+        with STATE_LOCK.hold():
+            loop_state = get_loop_state()
+            result = compact_loop_state(loop_state, retention_hours)
+            if result['archived']:
+                save_loop_state(loop_state)
+            return result
+
+    if retention_hours is None:
+        retention_hours = RETENTION_HOURS
+
+    cutoff = datetime.now() - timedelta(hours=retention_hours)
+    partitions = {}
+
+    for task_id, task_state in loop_state.items():
+        if task_state.get('status') not in TERMINAL_STATUSES:
+            continue
+        if os.path.exists(os.path.join(INBOX_PATH, task_id)):
+            continue
+
+        finished_at = get_finished_at(task_state)
+        if finished_at > cutoff:
+            continue
+
+        record = dict(task_state, task_id=task_id, archived_at=datetime.now().isoformat())
+        partitions.setdefault(get_archive_partition(finished_at), []).append(record)
+
+    if not partitions:
+        return {
+            'success': True,
+            'archived': 0,
+            'active': len(loop_state)
+        }
+
+    # Write the archive first so a crash can only duplicate, never lose, entries
+    archived = 0
+    for partition, records in partitions.items():
+        os.makedirs(os.path.dirname(partition), exist_ok=True)
+        with gzip.open(partition, 'at', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+                del loop_state[record['task_id']]
+                archived += 1
+
+    log_to_business_log(f"Archived {archived} finished loop entries")
+
+    return {
+        'success': True,
+        'archived': archived,
+        'active': len(loop_state),
+        'partitions': sorted(partitions)
+    }
+
+
+def query_archive(start_date=None, end_date=None, status=None):
+    """Query archived loop entries finished between start_date and end_date (inclusive)"""
+    start_day = start_date.strftime('%Y-%m-%d') if start_date else '0000-00-00'
+    end_day = end_date.strftime('%Y-%m-%d') if end_date else '9999-99-99'
+
+    entries = []
+    by_status = {}
+
+    if not os.path.exists(STATE_ARCHIVE_PATH):
+        return {
+            'success': True,
+            'total': 0,
+            'by_status': by_status,
+            'entries': entries
+        }
+
+    # Only open the partitions whose day falls inside the window
+    for month in sorted(os.listdir(STATE_ARCHIVE_PATH)):
+        if not (start_day[:7] <= month <= end_day[:7]):
+            continue
+
+        month_path = os.path.join(STATE_ARCHIVE_PATH, month)
+        for filename in sorted(os.listdir(month_path)):
+            day = filename[len('ralph_'):-len('.jsonl.gz')]
+            if not (start_day <= day <= end_day):
+                continue
+
+            with gzip.open(os.path.join(month_path, filename), 'rt', encoding='utf-8') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if status and entry.get('status') != status:
+                        continue
+                    entries.append(entry)
+                    by_status[entry.get('status')] = by_status.get(entry.get('status'), 0) + 1
+
+    return {
+        'success': True,
+        'total': len(entries),
+        'by_status': by_status,
+        'entries': entries
+    }
+
+
+def build_task_queue(task_files, loop_state, now=None):
+    """Order tasks by priority, age and remaining work
+
+    Every AGING_MINUTES a task has waited promotes it one priority level, so
+    low-priority work cannot be starved by a steady stream of urgent tasks.
+    Within a level, tasks closest to completion run first, then the oldest.
+    Tasks in a terminal state are dropped.
+    """
+    now = now or time.time()
+    heap = []
+
+    for task_file in task_files:
+        task_state = loop_state.get(os.path.basename(task_file))
+
+        if task_state and task_state.get('status') in TERMINAL_STATUSES:
+            continue
+
+        try:
+            arrived = os.path.getmtime(task_file)
+        except OSError:
+            continue
+
+        if task_state and 'priority' in task_state:
+            priority = task_state['priority']
+            remaining = task_state.get('estimated_iterations', MAX_ITERATIONS) - task_state.get('current_iteration', 0)
+        else:
+            analysis = analyze_task(task_file)
+            priority = analysis['priority']
+            remaining = analysis['estimated_iterations']
+
+        waited_minutes = max(0.0, (now - arrived) / 60)
+        effective_level = PRIORITY_LEVELS.get(priority, PRIORITY_LEVELS[DEFAULT_PRIORITY])
+        if AGING_MINUTES > 0:
+            effective_level -= waited_minutes / AGING_MINUTES
+
+        heapq.heappush(heap, (effective_level, max(remaining, 1), arrived, task_file, priority))
+
+    queue_order = []
+    while heap:
+        effective_level, remaining, arrived, task_file, priority = heapq.heappop(heap)
+        queue_order.append({
+            'task_file': task_file,
+            'priority': priority,
+            'effective_level': round(effective_level, 3),
+            'remaining_iterations': remaining
+        })
+
+    return queue_order
+
+
+def process_all_tasks(budget=None):
+    """Process Inbox tasks in priority order, up to the per-pass budget"""
     ensure_directories()
 
     if not os.path.exists(INBOX_PATH):
@@ -476,7 +846,7 @@ def process_all_tasks():
             'message': 'No Inbox folder found'
         }
 
-    tasks = [f for f in os.listdir(INBOX_PATH) if f.endswith('.md')]
+    tasks = [os.path.join(INBOX_PATH, f) for f in os.listdir(INBOX_PATH) if f.endswith('.md')]
 
     if not tasks:
         return {
@@ -485,22 +855,48 @@ def process_all_tasks():
             'message': 'No tasks in Inbox'
         }
 
+    if is_daemon_running():
+        return {
+            'success': True,
+            'tasks_processed': 0,
+            'message': 'Ralph daemon is running; it processes Inbox tasks itself'
+        }
+
+    if budget is None:
+        budget = PASS_BUDGET
+
+    task_queue = build_task_queue(tasks, get_loop_state())
+
     results = []
-    for task_filename in tasks:
-        task_file = os.path.join(INBOX_PATH, task_filename)
+    iterations = 0
+    deferred = 0
+    for entry in task_queue:
+        # Approval checks are cheap, so only real iterations count against the budget
+        if budget and iterations >= budget:
+            deferred += 1
+            continue
+
+        task_file = entry['task_file']
         result = process_task(task_file)
         results.append({
-            'task': task_filename,
+            'task': os.path.basename(task_file),
+            'priority': entry['priority'],
             'result': result
         })
 
+        if result['status'] in ['in_progress', 'completed']:
+            iterations += 1
+
         # Delay between iterations
         if result['status'] == 'in_progress':
             time.sleep(ITERATION_DELAY)
 
+    compact_loop_state()
+
     return {
         'success': True,
         'tasks_processed': len(results),
+        'tasks_deferred': deferred,
         'results': results
     }
 
@@ -531,18 +927,19 @@ def get_status():
 
 
 def stop_task(task_id):
-    """Stop processing a specific task"""
-    loop_state = get_loop_state()
+    """Stop processing a specific task; a running daemon picks this up on its next flush"""
+    with STATE_LOCK.hold():
+        loop_state = get_loop_state()
 
-    if task_id not in loop_state:
-        return {
-            'success': False,
-            'error': f'Task {task_id} not found in loop state'
-        }
+        if task_id not in loop_state:
+            return {
+                'success': False,
+                'error': f'Task {task_id} not found in loop state'
+            }
 
-    loop_state[task_id]['status'] = 'stopped'
-    loop_state[task_id]['stopped_at'] = datetime.now().isoformat()
-    save_loop_state(loop_state)
+        loop_state[task_id]['status'] = 'stopped'
+        loop_state[task_id]['stopped_at'] = datetime.now().isoformat()
+        save_loop_state(loop_state)
 
     log_to_business_log(f"Stopped Ralph Wiggum loop for task {task_id}")
 
@@ -552,6 +949,237 @@ def stop_task(task_id):
     }
 
 
+class TimerWheel:
+    """Hashed timer wheel for scheduling task iterations
+
+    Scheduling and expiring an entry are O(1); delays longer than one
+    revolution are kept in their slot with a remaining-rounds counter.
+    """
+
+    def __init__(self, tick_seconds=1.0, slots=64):
+        self.tick_seconds = tick_seconds
+        self.slots = [[] for _ in range(slots)]
+        self.cursor = 0
+
+    def schedule(self, delay_seconds, item):
+        """Schedule item to expire after delay_seconds"""
+        ticks = max(1, int(round(delay_seconds / self.tick_seconds)))
+        rounds, offset = divmod(ticks - 1, len(self.slots))
+        slot = (self.cursor + 1 + offset) % len(self.slots)
+        self.slots[slot].append([rounds, item])
+
+    def advance(self):
+        """Advance the wheel by one tick and return expired items"""
+        self.cursor = (self.cursor + 1) % len(self.slots)
+        bucket = self.slots[self.cursor]
+        expired = [item for rounds, item in bucket if rounds == 0]
+        self.slots[self.cursor] = [[rounds - 1, item] for rounds, item in bucket if rounds > 0]
+        return expired
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.slots)
+
+
+class RalphDaemon:
+    """Long-running Ralph loop with in-memory state and a timer wheel"""
+
+    def __init__(self, tick_seconds=DAEMON_TICK):
+        self.tick_seconds = tick_seconds
+        self.wheel = TimerWheel(tick_seconds)
+        self.incoming = queue.Queue()
+        self.scheduled = set()
+        self.loop_state = {}
+        self.changed = set()
+        self.state_mtime = None
+        self.failures = {}
+        self.running = False
+        self.observer = None
+        self.last_compaction = 0
+
+    def enqueue(self, task_file):
+        """Queue a task file for processing (safe to call from watcher threads)"""
+        if task_file.endswith('.md'):
+            self.incoming.put(os.path.abspath(task_file))
+
+    def _start_watcher(self):
+        """Watch Inbox with watchdog, falling back to polling when unavailable"""
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            log_to_business_log("watchdog not installed, daemon polling Inbox instead")
+            return
+
+        daemon = self
+
+        class InboxHandler(FileSystemEventHandler):
+            def on_created(self, event):
+                if not event.is_directory:
+                    daemon.enqueue(event.src_path)
+
+            def on_moved(self, event):
+                if not event.is_directory:
+                    daemon.enqueue(event.dest_path)
+
+        self.observer = Observer()
+        self.observer.schedule(InboxHandler(), INBOX_PATH, recursive=False)
+        self.observer.start()
+
+    def _scan_inbox(self):
+        """Queue every task currently in Inbox"""
+        for entry in os.scandir(INBOX_PATH):
+            if entry.is_file():
+                self.enqueue(entry.path)
+
+    def _schedule(self, task_file, delay):
+        self.wheel.schedule(delay, task_file)
+        self.scheduled.add(task_file)
+
+    def _drain_incoming(self):
+        """Move newly discovered tasks onto the wheel"""
+        while True:
+            try:
+                task_file = self.incoming.get_nowait()
+            except queue.Empty:
+                return
+
+            task_state = self.loop_state.get(os.path.basename(task_file), {})
+            if task_state.get('status') in TERMINAL_STATUSES:
+                continue
+
+            if task_file not in self.scheduled:
+                self._schedule(task_file, self.tick_seconds)
+
+    def _run_iteration(self, task_file):
+        """Run one iteration and reschedule the task according to its result"""
+        self.scheduled.discard(task_file)
+
+        if not os.path.exists(task_file):
+            return
+
+        task_id = os.path.basename(task_file)
+        self.changed.add(task_id)
+
+        try:
+            result = process_task(task_file, self.loop_state)
+        except Exception as e:
+            failures = self.failures.get(task_file, 0) + 1
+            self.failures[task_file] = failures
+            delay = min(DAEMON_RETRY_DELAY * 2 ** (failures - 1), DAEMON_MAX_BACKOFF)
+            self._schedule(task_file, delay)
+            log_to_business_log(f"Daemon failed to process {task_id} (attempt {failures}), retrying in {delay}s: {e}")
+            return
+
+        self.failures.pop(task_file, None)
+
+        if result['status'] == 'in_progress':
+            self._schedule(task_file, ITERATION_DELAY)
+        elif result['status'] == 'awaiting_approval':
+            self._schedule(task_file, APPROVAL_POLL_INTERVAL)
+
+        if VERBOSE:
+            print(json.dumps({'task': os.path.basename(task_file), 'result': result}))
+
+    def _get_state_mtime(self):
+        try:
+            return os.stat(STATE_FILE).st_mtime_ns
+        except OSError:
+            return None
+
+    def flush(self):
+        """Merge changed entries into the state file and pick up other writers' changes
+
+        The file is re-read under the state lock rather than overwritten, so
+        a stop or compact run while the daemon is up is kept. A task another
+        writer moved to a terminal status stays terminal.
+        """
+        if not self.changed and self._get_state_mtime() == self.state_mtime:
+            return
+
+        with STATE_LOCK.hold():
+            disk_state = get_loop_state()
+
+            for task_id in self.changed:
+                if task_id not in self.loop_state:
+                    disk_state.pop(task_id, None)  # Archived by compaction
+                    continue
+
+                disk_status = disk_state.get(task_id, {}).get('status')
+                if disk_status in TERMINAL_STATUSES and self.loop_state[task_id].get('status') not in TERMINAL_STATUSES:
+                    continue
+                disk_state[task_id] = self.loop_state[task_id]
+
+            if self.changed:
+                save_loop_state(disk_state)
+            self.loop_state = disk_state
+            self.changed.clear()
+            self.state_mtime = self._get_state_mtime()
+
+    def stop(self, *_):
+        """Request a clean shutdown"""
+        self.running = False
+
+    def run(self):
+        """Run the daemon loop until stopped; only one daemon runs at a time"""
+        ensure_directories()
+
+        with DAEMON_LOCK.hold(blocking=False) as acquired:
+            if not acquired:
+                return {
+                    'success': False,
+                    'error': 'Another Ralph daemon is already running'
+                }
+            return self._run_loop()
+
+    def _run_loop(self):
+        with STATE_LOCK.hold():
+            self.loop_state = get_loop_state()
+            self.state_mtime = self._get_state_mtime()
+        self.running = True
+
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        self._start_watcher()
+        self._scan_inbox()
+        log_to_business_log("Ralph daemon started")
+
+        try:
+            while self.running:
+                if self.observer is None:
+                    self._scan_inbox()
+
+                self._drain_incoming()
+
+                due = self.wheel.advance()
+                self.scheduled.difference_update(due)
+                for entry in build_task_queue(due, self.loop_state):
+                    if not self.running:
+                        break
+                    self._run_iteration(entry['task_file'])
+
+                if time.time() - self.last_compaction >= COMPACT_INTERVAL:
+                    before = set(self.loop_state)
+                    compact_loop_state(self.loop_state)
+                    self.changed.update(before - set(self.loop_state))
+                    self.last_compaction = time.time()
+
+                self.flush()
+                time.sleep(self.tick_seconds)
+        finally:
+            if self.observer is not None:
+                self.observer.stop()
+                self.observer.join()
+            self.flush()
+            log_to_business_log("Ralph daemon stopped")
+
+        return {
+            'success': True,
+            'message': 'Ralph daemon stopped',
+            'pending_tasks': len(self.wheel)
+        }
+
+
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(description='Ralph Wiggum Autonomous Loop')
@@ -562,11 +1190,25 @@ def main():
     process_parser.add_argument('--task-file', required=True, help='Path to task file')
 
     # Process all tasks
-    subparsers.add_parser('process-all', help='Process all tasks in Inbox')
+    process_all_parser = subparsers.add_parser('process-all', help='Process all tasks in Inbox')
+    process_all_parser.add_argument('--budget', type=int, help='Max iterations this pass (default: RALPH_PASS_BUDGET, 0 = unlimited)')
+
+    # Run as daemon
+    subparsers.add_parser('daemon', help='Run continuously, watching Inbox')
 
     # Get status
     subparsers.add_parser('status', help='Get status of active loops')
 
+    # Compact finished entries into the archive
+    compact_parser = subparsers.add_parser('compact', help='Archive finished loop entries')
+    compact_parser.add_argument('--retention-hours', type=float, help='Keep finished entries this long (default: RALPH_RETENTION_HOURS)')
+
+    # Query archive
+    archive_parser = subparsers.add_parser('archive', help='Query archived loop entries')
+    archive_parser.add_argument('--start', help='Start date (YYYY-MM-DD)')
+    archive_parser.add_argument('--end', help='End date (YYYY-MM-DD)')
+    archive_parser.add_argument('--status', choices=TERMINAL_STATUSES, help='Filter by final status')
+
     # Stop task
     stop_parser = subparsers.add_parser('stop', help='Stop processing task')
     stop_parser.add_argument('--task-id', required=True, help='Task ID to stop')
@@ -576,9 +1218,17 @@ def main():
     if args.command == 'process':
         result = process_task(args.task_file)
     elif args.command == 'process-all':
-        result = process_all_tasks()
+        result = process_all_tasks(args.budget)
+    elif args.command == 'daemon':
+        result = RalphDaemon().run()
     elif args.command == 'status':
         result = get_status()
+    elif args.command == 'compact':
+        result = compact_loop_state(retention_hours=args.retention_hours)
+    elif args.command == 'archive':
+        start_date = datetime.strptime(args.start, '%Y-%m-%d') if args.start else None
+        end_date = datetime.strptime(args.end, '%Y-%m-%d') if args.end else None
+        result = query_archive(start_date, end_date, args.status)
     elif args.command == 'stop':
         result = stop_task(args.task_id)
     else:
@@ -129,12 +129,14 @@ def main():
     )
 
     # Task 6: Ralph Wiggum autonomous loop - check every 30 seconds
-    scheduler.add_task(
-        name="ralph_wiggum_loop",
-        interval_seconds=30,  # 30 seconds
-        command="scripts/ralph_wiggum.py",
-        args=["process-all"]
-    )
+    # (skipped when `ralph_wiggum.py daemon` runs the loop instead)
+    if os.getenv('RALPH_DAEMON', 'false').lower() != 'true':
+        scheduler.add_task(
+            name="ralph_wiggum_loop",
+            interval_seconds=30,  # 30 seconds
+            command="scripts/ralph_wiggum.py",
+            args=["process-all"]
+        )
 
     # Task 7: Process personal inbox every hour
     scheduler.add_task(
@@ -168,6 +170,22 @@ def main():
         args=["unified-report"]
     )
 
+    # Task 11: Rotate oversized or stale logs into compressed segments hourly
+    scheduler.add_task(
+        name="rotate_logs",
+        interval_seconds=3600,  # 1 hour
+        command="scripts/log_segments.py",
+        args=["rotate"]
+    )
+
+    # Task 12: Pull changed Odoo invoices into the accounting ledger
+    scheduler.add_task(
+        name="odoo_sync",
+        interval_seconds=900,  # 15 minutes
+        command="scripts/odoo_sync.py",
+        args=["sync"]
+    )
+
     try:
         scheduler.run()
     except KeyboardInterrupt:
@@ -12,39 +12,82 @@ from email.mime.multipart import MIMEMultipart
 import json
 
 
-def send_email(to, subject, body):
-    """Send an email via Gmail SMTP"""
-    # Get credentials from environment variables
-    email_address = os.getenv('EMAIL_ADDRESS')
-    email_password = os.getenv('EMAIL_PASSWORD')
+SMTP_HOST = 'smtp.gmail.com'
+SMTP_PORT = 587
 
-    if not email_address or not email_password:
-        return {"error": "EMAIL_ADDRESS and EMAIL_PASSWORD environment variables must be set"}
 
-    try:
+class EmailSender:
+    """SMTP session that logs in once and sends any number of messages"""
+
+    def __init__(self):
+        self.email_address = os.getenv('EMAIL_ADDRESS')
+        self.email_password = os.getenv('EMAIL_PASSWORD')
+        self.server = None
+
+    def connect(self):
+        """Open and authenticate the SMTP session if it is not already open"""
+        if self.server is None:
+            server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)  # Gmail SMTP
+            server.starttls()  # Enable security
+            server.login(self.email_address, self.email_password)
+            self.server = server
+        return self.server
+
+    def send(self, to, subject, body):
+        """Send one message over the open session"""
         # Create message
         msg = MIMEMultipart()
-        msg['From'] = email_address
+        msg['From'] = self.email_address
         msg['To'] = to
         msg['Subject'] = subject
 
         # Add body to email
         msg.attach(MIMEText(body, 'plain'))
 
-        # Create SMTP session
-        server = smtplib.SMTP('smtp.gmail.com', 587)  # Gmail SMTP
-        server.starttls()  # Enable security
-        server.login(email_address, email_password)
+        self.connect().sendmail(self.email_address, to, msg.as_string())
+
+    def close(self):
+        """Close the SMTP session"""
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except smtplib.SMTPException:
+                pass
+            self.server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
-        # Send email
-        text = msg.as_string()
-        server.sendmail(email_address, to, text)
-        server.quit()
 
-        return {"success": f"Email sent successfully to {to}"}
+def send_batch(messages):
+    """Send several (to, subject, body) messages over a single SMTP login"""
+    if not os.getenv('EMAIL_ADDRESS') or not os.getenv('EMAIL_PASSWORD'):
+        return {"error": "EMAIL_ADDRESS and EMAIL_PASSWORD environment variables must be set"}
+
+    sent = []
+    try:
+        with EmailSender() as sender:
+            for to, subject, body in messages:
+                sender.send(to, subject, body)
+                sent.append(to)
+
+        return {"success": f"Sent {len(sent)} emails", "sent": sent}
 
     except Exception as e:
-        return {"error": f"Failed to send email: {str(e)}"}
+        return {"error": f"Failed to send email: {str(e)}", "sent": sent}
+
+
+def send_email(to, subject, body):
+    """Send an email via Gmail SMTP"""
+    result = send_batch([(to, subject, body)])
+
+    if 'error' in result:
+        return {"error": result['error']}
+
+    return {"success": f"Email sent successfully to {to}"}
 
 
 def main():
@@ -1,33 +1,67 @@
 #!/usr/bin/env python3
 """
 Social Summary System
-Logs all social media activity to centralized Social_Log.md file
+Records social media posts in an append-only store (AI_Employee_Vault/Reports/Social)
+and renders the centralized Social_Log.md from it
 """
 
 import os
 import sys
 import json
+import queue
+import atexit
+import struct
+import hashlib
 import argparse
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 import re
 
+from file_lock import FileLock
+
 
 # Configuration
 VAULT_PATH = os.path.join(os.path.dirname(__file__), "..", "AI_Employee_Vault")
 REPORTS_PATH = os.path.join(VAULT_PATH, "Reports")
 SOCIAL_LOG = os.path.join(REPORTS_PATH, "Social_Log.md")
+SOCIAL_STORE_PATH = os.path.join(REPORTS_PATH, "Social")
+POSTS_FILE = os.path.join(SOCIAL_STORE_PATH, "posts.jsonl")
+RENDER_STATE_FILE = os.path.join(SOCIAL_STORE_PATH, "render_state.json")
+INDEX_FILE = os.path.join(SOCIAL_STORE_PATH, "posts.idx")
+LOCK_FILE = os.path.join(SOCIAL_STORE_PATH, ".social.lock")
 LOGS_PATH = os.path.join(VAULT_PATH, "Logs")
 
 # Environment variables
 AUTO_LOG = os.getenv('SOCIAL_SUMMARY_AUTO_LOG', 'true').lower() == 'true'
 TRACK_ENGAGEMENT = os.getenv('SOCIAL_SUMMARY_TRACK_ENGAGEMENT', 'true').lower() == 'true'
 CEO_INTEGRATION = os.getenv('SOCIAL_SUMMARY_CEO_INTEGRATION', 'true').lower() == 'true'
+RENDER_DEBOUNCE = int(os.getenv('SOCIAL_SUMMARY_RENDER_DEBOUNCE', '60'))  # Seconds between re-renders while logging
+BUFFERED = os.getenv('SOCIAL_SUMMARY_BUFFERED', 'false').lower() == 'true'  # Posters log from a background thread
+
+PLATFORMS = ['linkedin', 'facebook', 'instagram', 'twitter']
+PLATFORM_LABELS = {'linkedin': 'LinkedIn', 'facebook': 'Facebook', 'instagram': 'Instagram', 'twitter': 'Twitter'}
+RENDER_STATE_VERSION = 1
+SUMMARY_PERIODS = ['day', 'week', 'month', 'range']
+
+# posts.idx: header (magic, version, store bytes indexed, record count), then
+# fixed-width (timestamp, store offset) records sorted by timestamp
+INDEX_MAGIC = b'SPIX'
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct('<4sIQQ')
+INDEX_RECORD = struct.Struct('<dQ')
+LEGACY_POST_PATTERN = re.compile(
+    r'^#### (\d{4}-\d{2}-\d{2})\n\n\*\*(\w+) Post\*\*\n- Time: ([\d:]+)\n- Content: (.*)\n((?:- (?:Engagement|URL): .*\n)*)',
+    re.MULTILINE
+)
+
+SOCIAL_LOCK = FileLock(LOCK_FILE)
 
 
 def ensure_directories():
     """Ensure all required directories exist"""
     os.makedirs(REPORTS_PATH, exist_ok=True)
+    os.makedirs(SOCIAL_STORE_PATH, exist_ok=True)
     os.makedirs(LOGS_PATH, exist_ok=True)
 
 
@@ -44,250 +78,623 @@ def log_to_business_log(message):
         pass
 
 
-def initialize_social_log():
-    """Initialize Social_Log.md if it doesn't exist"""
-    if not os.path.exists(SOCIAL_LOG):
-        now = datetime.now()
-        month_name = now.strftime("%B %Y")
+def get_week_number(date):
+    """Get week number within the month"""
+    first_day = date.replace(day=1)
+    days_offset = (date - first_day).days
+    week_num = (days_offset // 7) + 1
+    return week_num
+
+
+def get_week_range_str(date):
+    """Get week range string (e.g., 'Feb 17-23')"""
+    # Find Monday of current week
+    days_since_monday = date.weekday()
+    week_start = date - timedelta(days=days_since_monday)
+    week_end = week_start + timedelta(days=6)
+
+    return f"{week_start.strftime('%b %d')}-{week_end.strftime('%d')}"
+
+
+def get_content_hash(content):
+    """Stable hash of a post's full text"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def get_engagement_total(engagement):
+    """Total interactions in an engagement dict, number or '12 likes, 3 comments' string"""
+    if not engagement:
+        return 0
+    if isinstance(engagement, dict):
+        return sum(value for value in engagement.values() if isinstance(value, (int, float)))
+    if isinstance(engagement, (int, float)):
+        return engagement
+    return sum(int(number) for number in re.findall(r'\d+', str(engagement)))
+
+
+def format_engagement(engagement):
+    """Engagement as shown in Social_Log.md"""
+    if isinstance(engagement, dict):
+        engagement_str = f"{engagement.get('likes', 0)} likes, {engagement.get('comments', 0)} comments"
+        if 'shares' in engagement:
+            engagement_str += f", {engagement['shares']} shares"
+        return engagement_str
+    return str(engagement)
+
+
+def append_posts(posts):
+    """Append posts to the store (a single write)"""
+    with open(POSTS_FILE, 'a', encoding='utf-8') as f:
+        f.write(''.join(json.dumps(post) + '\n' for post in posts))
+
+
+def iter_posts(offset=0):
+    """Yield (start offset, end offset, post) for each complete line of the store after offset"""
+    if not os.path.exists(POSTS_FILE):
+        return
+
+    with open(POSTS_FILE, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break  # A write still in progress
+            start, offset = offset, offset + len(line)
+            try:
+                yield start, offset, json.loads(line)
+            except ValueError:
+                continue
+
+
+def migrate_social_log():
+    """Import the posts of a pre-store Social_Log.md into the store once"""
+    if os.path.exists(POSTS_FILE) or not os.path.exists(SOCIAL_LOG):
+        return
+
+    with SOCIAL_LOCK.hold():
+        if os.path.exists(POSTS_FILE):
+            return
+
+        with open(SOCIAL_LOG, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        posts = []
+        for match in LEGACY_POST_PATTERN.finditer(content):
+            date_str, platform, time_str, text, extra = match.groups()
+            post = {
+                'timestamp': f"{date_str}T{time_str}",
+                'platform': platform.lower(),
+                'content': text,
+                'content_hash': get_content_hash(text),
+                'url': None,
+                'engagement': None
+            }
+            for line in extra.splitlines():
+                field, _, value = line[2:].partition(': ')
+                post['url' if field == 'URL' else 'engagement'] = value
+            posts.append(post)
+
+        # The old log listed the newest post of a week first
+        posts.reverse()
+        posts.sort(key=lambda post: post['timestamp'])
+
+        temp_file = f"{POSTS_FILE}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(post) + '\n' for post in posts))
+        os.replace(temp_file, POSTS_FILE)
+
+    log_to_business_log(f"Migrated {len(posts)} posts from Social_Log.md to the post store")
+
+
+def empty_render_state():
+    """Render state before any post has been rendered"""
+    return {
+        'version': RENDER_STATE_VERSION,
+        'offset': 0,
+        'months': {},
+        'days': {}
+    }
+
+
+def load_render_state():
+    """Load the render state, starting over if it is missing or the store was rewritten"""
+    try:
+        with open(RENDER_STATE_FILE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return empty_render_state()
 
+    store_size = os.path.getsize(POSTS_FILE) if os.path.exists(POSTS_FILE) else 0
+    if state.get('version') != RENDER_STATE_VERSION or state['offset'] > store_size:
+        return empty_render_state()
+
+    return state
+
+
+def save_render_state(state):
+    """Save the render state"""
+    temp_file = f"{RENDER_STATE_FILE}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(temp_file, RENDER_STATE_FILE)
+
+
+def format_post_entry(post):
+    """Markdown for one post"""
+    timestamp = datetime.fromisoformat(post['timestamp'])
+    content = post['content']
+    content_preview = content[:100] + '...' if len(content) > 100 else content
+
+    entry = f"""
+#### {timestamp.strftime('%Y-%m-%d')}
+
+**{post['platform'].title()} Post**
+- Time: {timestamp.strftime('%H:%M:%S')}
+- Content: {content_preview}
+"""
+
+    if post.get('engagement') and TRACK_ENGAGEMENT:
+        entry += f"- Engagement: {format_engagement(post['engagement'])}\n"
+
+    if post.get('url'):
+        entry += f"- URL: {post['url']}\n"
+
+    return entry
+
+
+def add_post_to_month(state, post):
+    """Append a post to its month's rendered section; False if it predates the section's last post"""
+    timestamp = datetime.fromisoformat(post['timestamp'])
+    month = state['months'].setdefault(post['timestamp'][:7], {
+        'text': f"## {timestamp.strftime('%B %Y')}\n",
+        'week': None,
+        'last': ''
+    })
+
+    if post['timestamp'] < month['last']:
+        return False
+
+    week_header = f"### Week {get_week_number(timestamp)} ({get_week_range_str(timestamp)})"
+    if week_header != month['week']:
+        month['text'] += f"\n{week_header}\n"
+        month['week'] = week_header
+
+    month['text'] += format_post_entry(post)
+    month['last'] = post['timestamp']
+    return True
+
+
+def count_post(state, post):
+    """Add a post to its day's per-platform and engagement counters"""
+    day = state['days'].setdefault(post['timestamp'][:10], {'engagement': 0})
+    day[post['platform']] = day.get(post['platform'], 0) + 1
+    day['engagement'] += get_engagement_total(post.get('engagement'))
+
+
+def rebuild_month(state, month):
+    """Re-render one month's section from the store, in timestamp order"""
+    posts = sorted((post for _, _, post in iter_posts() if post['timestamp'][:7] == month),
+                   key=lambda post: post['timestamp'])
+
+    state['months'].pop(month, None)
+    for post in posts:
+        add_post_to_month(state, post)
+
+
+def build_statistics(state, now=None):
+    """Summary Statistics section from the daily counters"""
+    now = now or datetime.now()
+    week_start = (now - timedelta(days=now.weekday())).strftime('%Y-%m-%d')
+    today = now.strftime('%Y-%m-%d')
+    month_prefix = now.strftime('%Y-%m')
+
+    sections = []
+    for title, in_period in [
+        ('This Week', lambda day: week_start <= day <= today),
+        ('This Month', lambda day: day.startswith(month_prefix))
+    ]:
+        counts = {platform: 0 for platform in PLATFORMS}
+        engagement = 0
+        for day, bucket in state['days'].items():
+            if in_period(day):
+                for platform in PLATFORMS:
+                    counts[platform] += bucket.get(platform, 0)
+                engagement += bucket['engagement']
+
+        lines = [f"### {title}", f"- Total Posts: {sum(counts.values())}"]
+        lines += [f"- {PLATFORM_LABELS[platform]}: {counts[platform]}" for platform in PLATFORMS]
+        lines.append(f"- Total Engagement: {engagement} interactions")
+        sections.append('\n'.join(lines))
+
+    return '\n\n'.join(sections)
+
+
+def render_social_log():
+    """Bring Social_Log.md up to date with the store
+
+    Only posts appended since the last render are read; each is appended to
+    its month's cached section. A month is re-rendered from the store only
+    when a backdated post lands before its last rendered post.
+    """
+    ensure_directories()
+
+    with SOCIAL_LOCK.hold():
+        state = load_render_state()
+        stale_months = set()
+        new_posts = 0
+
+        for _, offset, post in iter_posts(state['offset']):
+            count_post(state, post)
+            if not add_post_to_month(state, post):
+                stale_months.add(post['timestamp'][:7])
+            state['offset'] = offset
+            new_posts += 1
+
+        for month in stale_months:
+            rebuild_month(state, month)
+
+        save_render_state(state)
+
+        now = datetime.now()
+        months = ''.join(state['months'][month]['text'] + '\n' for month in sorted(state['months']))
         content = f"""# Social Media Activity Log
 
 Last updated: {now.strftime("%Y-%m-%d %H:%M:%S")}
 
 ---
 
-## {month_name}
-
-### Week {get_week_number(now)} ({get_week_range_str(now)})
-
+{months}
 ---
 
 ## Summary Statistics
 
-### This Week
-- Total Posts: 0
-- LinkedIn: 0
-- Facebook: 0
-- Instagram: 0
-- Twitter: 0
-- Total Engagement: 0 interactions
-
-### This Month
-- Total Posts: 0
-- LinkedIn: 0
-- Facebook: 0
-- Instagram: 0
-- Twitter: 0
-- Total Engagement: 0 interactions
+{build_statistics(state, now)}
 
 ---
 
 *Maintained by Social Summary System*
 """
 
-        with open(SOCIAL_LOG, 'w', encoding='utf-8') as f:
+        temp_file = f"{SOCIAL_LOG}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
             f.write(content)
+        os.replace(temp_file, SOCIAL_LOG)
 
-        log_to_business_log("Initialized Social_Log.md")
+    return new_posts
 
 
-def get_week_number(date):
-    """Get week number within the month"""
-    first_day = date.replace(day=1)
-    days_offset = (date - first_day).days
-    week_num = (days_offset // 7) + 1
-    return week_num
+def is_render_stale():
+    """True if Social_Log.md is missing or older than the store"""
+    if not os.path.exists(SOCIAL_LOG):
+        return True
+    if not os.path.exists(POSTS_FILE):
+        return False
+    return os.path.getmtime(SOCIAL_LOG) < os.path.getmtime(POSTS_FILE)
 
 
-def get_week_range_str(date):
-    """Get week range string (e.g., 'Feb 17-23')"""
-    # Find Monday of current week
-    days_since_monday = date.weekday()
-    week_start = date - timedelta(days=days_since_monday)
-    week_end = week_start + timedelta(days=6)
+def initialize_social_log():
+    """Migrate a legacy Social_Log.md and bring the rendered log up to date"""
+    ensure_directories()
+    migrate_social_log()
+
+    if is_render_stale():
+        render_social_log()
+        log_to_business_log("Rendered Social_Log.md")
+
+
+def get_post_time(post):
+    """Post timestamp as epoch seconds, the index's sort key"""
+    return datetime.fromisoformat(post['timestamp']).timestamp()
+
+
+def read_index_header(f):
+    """(store bytes indexed, record count) from an open index, or None if unusable"""
+    f.seek(0)
+    header = f.read(INDEX_HEADER.size)
+    if len(header) < INDEX_HEADER.size:
+        return None
+
+    magic, version, indexed, count = INDEX_HEADER.unpack(header)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION:
+        return None
+    return indexed, count
+
+
+def read_index_record(f, position):
+    """(timestamp, store offset) of the record at a position"""
+    f.seek(INDEX_HEADER.size + position * INDEX_RECORD.size)
+    return INDEX_RECORD.unpack(f.read(INDEX_RECORD.size))
+
+
+def write_index(records, indexed):
+    """Replace the index with sorted records"""
+    temp_file = f"{INDEX_FILE}.tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, indexed, len(records)))
+        f.write(b''.join(INDEX_RECORD.pack(*record) for record in records))
+    os.replace(temp_file, INDEX_FILE)
+
+
+def sync_index():
+    """Index posts appended to the store since the last sync
+
+    New posts that are not older than the newest indexed one are appended
+    in place; a backdated post makes the index be rewritten in order. The
+    record count in the header is updated last, so records past it from
+    an interrupted sync are ignored and overwritten.
+    """
+    store_size = os.path.getsize(POSTS_FILE) if os.path.exists(POSTS_FILE) else 0
+
+    with SOCIAL_LOCK.hold():
+        header = None
+        if os.path.exists(INDEX_FILE):
+            with open(INDEX_FILE, 'rb') as f:
+                header = read_index_header(f)
+
+        if header is None or header[0] > store_size:
+            # Missing, unreadable or the store was rewritten
+            records, indexed = [], 0
+            for start, end, post in iter_posts():
+                records.append((get_post_time(post), start))
+                indexed = end
+            records.sort()
+            write_index(records, indexed)
+            return len(records)
+
+        indexed, count = header
+        if indexed == store_size:
+            return count
+
+        new_records = []
+        for start, end, post in iter_posts(indexed):
+            new_records.append((get_post_time(post), start))
+            indexed = end
+        new_records.sort()
+
+        with open(INDEX_FILE, 'r+b') as f:
+            newest = read_index_record(f, count - 1)[0] if count else float('-inf')
+
+            if not new_records or new_records[0][0] >= newest:
+                f.seek(INDEX_HEADER.size + count * INDEX_RECORD.size)
+                f.write(b''.join(INDEX_RECORD.pack(*record) for record in new_records))
+                f.flush()
+                count += len(new_records)
+                f.seek(0)
+                f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, indexed, count))
+                return count
+
+            f.seek(INDEX_HEADER.size)
+            data = f.read(count * INDEX_RECORD.size)
+
+        records = sorted(list(INDEX_RECORD.iter_unpack(data)) + new_records)
+        write_index(records, indexed)
+        return len(records)
+
+
+def find_index_position(f, count, timestamp):
+    """First record position whose timestamp is >= timestamp (binary search)"""
+    low, high = 0, count
+    while low < high:
+        middle = (low + high) // 2
+        if read_index_record(f, middle)[0] < timestamp:
+            low = middle + 1
+        else:
+            high = middle
+    return low
 
-    return f"{week_start.strftime('%b %d')}-{week_end.strftime('%d')}"
 
+def query_posts(start_date, end_date):
+    """Posts with start_date <= timestamp < end_date, oldest first
 
-def parse_social_log():
-    """Parse Social_Log.md and extract posts"""
-    if not os.path.exists(SOCIAL_LOG):
+    Two binary searches over the index find the range; only the matching
+    posts are read from the store.
+    """
+    ensure_directories()
+    migrate_social_log()
+    sync_index()
+
+    if not os.path.exists(INDEX_FILE):
         return []
 
     posts = []
+    with open(INDEX_FILE, 'rb') as index, open(POSTS_FILE, 'rb') as store:
+        indexed, count = read_index_header(index)
+        first = find_index_position(index, count, start_date.timestamp())
+        last = find_index_position(index, count, end_date.timestamp())
 
-    with open(SOCIAL_LOG, 'r', encoding='utf-8') as f:
-        content = f.read()
+        index.seek(INDEX_HEADER.size + first * INDEX_RECORD.size)
+        for _, offset in INDEX_RECORD.iter_unpack(index.read((last - first) * INDEX_RECORD.size)):
+            store.seek(offset)
+            posts.append(json.loads(store.readline()))
 
-    # Extract posts using regex
-    post_pattern = r'\*\*(\w+) Post\*\*\n- Time: ([\d:]+)\n- Content: (.+?)\n'
-    matches = re.finditer(post_pattern, content)
+    return posts
 
-    for match in matches:
-        platform = match.group(1).lower()
-        time = match.group(2)
-        content_text = match.group(3)
 
-        posts.append({
-            'platform': platform,
-            'time': time,
-            'content': content_text
-        })
+def get_period_range(period, now=None, start_date=None, end_date=None):
+    """(start, end exclusive, label) for a summary period"""
+    now = now or datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
-    return posts
+    if period == 'day':
+        return today, today + timedelta(days=1), now.strftime('%B %d, %Y')
 
+    if period == 'week':
+        start = today - timedelta(days=now.weekday())
+        end = start + timedelta(days=6)
+        return start, start + timedelta(days=7), f"Week of {start.strftime('%b %d')}-{end.strftime('%d, %Y')}"
 
-def log_post(platform, content, date=None, engagement=None, url=None):
-    """Log a social media post"""
-    ensure_directories()
-    initialize_social_log()
+    if period == 'month':
+        start = today.replace(day=1)
+        return start, (start + timedelta(days=32)).replace(day=1), now.strftime('%B %Y')
 
-    if date is None:
-        date = datetime.now()
-    elif isinstance(date, str):
-        date = datetime.strptime(date, '%Y-%m-%d')
+    if period == 'range':
+        start = (start_date or today - timedelta(days=6)).replace(hour=0, minute=0, second=0, microsecond=0)
+        end = (end_date or today).replace(hour=0, minute=0, second=0, microsecond=0)
+        return start, end + timedelta(days=1), f"{start.strftime('%b %d, %Y')} - {end.strftime('%b %d, %Y')}"
 
-    # Read existing log
-    with open(SOCIAL_LOG, 'r', encoding='utf-8') as f:
-        log_content = f.read()
+    return today - timedelta(days=6), today + timedelta(days=1), 'Last 7 days'
 
-    # Create post entry
-    time_str = date.strftime('%H:%M:%S')
-    date_str = date.strftime('%Y-%m-%d')
 
-    # Truncate content if too long
-    content_preview = content[:100] + '...' if len(content) > 100 else content
+def summarize_posts(posts):
+    """Post counts by platform and engagement totals"""
+    platform_counts = {platform: 0 for platform in PLATFORMS}
+    total_engagement = 0
 
-    post_entry = f"""
-#### {date_str}
+    for post in posts:
+        platform_counts[post['platform']] = platform_counts.get(post['platform'], 0) + 1
+        total_engagement += get_engagement_total(post.get('engagement'))
 
-**{platform.title()} Post**
-- Time: {time_str}
-- Content: {content_preview}
-"""
+    return {
+        'total_posts': len(posts),
+        'by_platform': platform_counts,
+        'total_engagement': total_engagement,
+        'average_engagement': round(total_engagement / len(posts), 2) if posts else 0.0
+    }
 
-    if engagement and TRACK_ENGAGEMENT:
-        if isinstance(engagement, dict):
-            engagement_str = f"{engagement.get('likes', 0)} likes, {engagement.get('comments', 0)} comments"
-            if 'shares' in engagement:
-                engagement_str += f", {engagement['shares']} shares"
-        else:
-            engagement_str = str(engagement)
-        post_entry += f"- Engagement: {engagement_str}\n"
 
-    if url:
-        post_entry += f"- URL: {url}\n"
+def parse_social_log():
+    """Load every post from the store, oldest first"""
+    posts = []
 
-    # Find the right place to insert (after the week header)
-    week_header = f"### Week {get_week_number(date)} ({get_week_range_str(date)})"
+    for _, _, post in iter_posts():
+        timestamp = datetime.fromisoformat(post['timestamp'])
+        posts.append(dict(post, date=timestamp.strftime('%Y-%m-%d'), time=timestamp.strftime('%H:%M:%S')))
 
-    if week_header in log_content:
-        # Insert after week header
-        parts = log_content.split(week_header, 1)
-        updated_content = parts[0] + week_header + post_entry + parts[1]
-    else:
-        # Add new week section
-        month_header = f"## {date.strftime('%B %Y')}"
-        if month_header in log_content:
-            parts = log_content.split(month_header, 1)
-            new_week_section = f"\n\n{week_header}{post_entry}\n"
-            updated_content = parts[0] + month_header + new_week_section + parts[1]
-        else:
-            # Add new month section
-            updated_content = log_content.replace(
-                "---\n\n## Summary Statistics",
-                f"\n## {date.strftime('%B %Y')}\n\n{week_header}{post_entry}\n\n---\n\n## Summary Statistics"
-            )
-
-    # Update timestamp
-    updated_content = re.sub(
-        r'Last updated: .*',
-        f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-        updated_content
-    )
-
-    # Write back
-    with open(SOCIAL_LOG, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
-
-    # Update statistics
-    update_statistics()
+    return posts
 
-    # Log to business.log
-    log_to_business_log(f"Logged {platform} post: {content_preview}")
+
+def make_post(platform, content, date=None, engagement=None, url=None):
+    """Build a store record; date may be a datetime or YYYY-MM-DD (defaults to now)"""
+    if date is None:
+        date = datetime.now()
+    elif isinstance(date, str):
+        date = datetime.strptime(date, '%Y-%m-%d')
 
     return {
-        'success': True,
-        'message': 'Social media post logged successfully',
-        'platform': platform,
-        'date': date_str
+        'timestamp': date.isoformat(timespec='seconds'),
+        'platform': platform.lower(),
+        'content': content,
+        'content_hash': get_content_hash(content),
+        'url': url,
+        'engagement': engagement
     }
 
 
-def update_statistics():
-    """Update summary statistics in Social_Log.md"""
-    if not os.path.exists(SOCIAL_LOG):
-        return
+def render_if_due():
+    """Re-render at most once per debounce window; readers render when stale"""
+    if not os.path.exists(SOCIAL_LOG) or os.path.getmtime(SOCIAL_LOG) < datetime.now().timestamp() - RENDER_DEBOUNCE:
+        render_social_log()
 
-    posts = parse_social_log()
 
-    # Count by platform
-    platform_counts = {}
-    for post in posts:
-        platform = post['platform']
-        platform_counts[platform] = platform_counts.get(platform, 0) + 1
-
-    # Calculate weekly and monthly stats
-    now = datetime.now()
-    week_start = now - timedelta(days=now.weekday())
-    month_start = now.replace(day=1)
+def log_post(platform, content, date=None, engagement=None, url=None):
+    """Log a social media post"""
+    ensure_directories()
+    migrate_social_log()
 
-    # For simplicity, use total counts (in real implementation, filter by date)
-    total_posts = len(posts)
+    post = make_post(platform, content, date, engagement, url)
 
-    # Read log
-    with open(SOCIAL_LOG, 'r', encoding='utf-8') as f:
-        content = f.read()
+    # The store is the source of truth; logging is a single append
+    append_posts([post])
+    render_if_due()
 
-    # Update statistics section
-    stats_section = f"""## Summary Statistics
-
-### This Week
-- Total Posts: {total_posts}
-- LinkedIn: {platform_counts.get('linkedin', 0)}
-- Facebook: {platform_counts.get('facebook', 0)}
-- Instagram: {platform_counts.get('instagram', 0)}
-- Twitter: {platform_counts.get('twitter', 0)}
-- Total Engagement: 0 interactions
-
-### This Month
-- Total Posts: {total_posts}
-- LinkedIn: {platform_counts.get('linkedin', 0)}
-- Facebook: {platform_counts.get('facebook', 0)}
-- Instagram: {platform_counts.get('instagram', 0)}
-- Twitter: {platform_counts.get('twitter', 0)}
-- Total Engagement: 0 interactions
+    # Log to business.log
+    content_preview = content[:100] + '...' if len(content) > 100 else content
+    log_to_business_log(f"Logged {platform} post: {content_preview}")
 
----
+    return {
+        'success': True,
+        'message': 'Social media post logged successfully',
+        'platform': platform,
+        'date': post['timestamp'][:10],
+        'content_hash': post['content_hash']
+    }
 
-*Maintained by Social Summary System*"""
 
-    # Replace statistics section
-    updated_content = re.sub(
-        r'## Summary Statistics.*$',
-        stats_section,
-        content,
-        flags=re.DOTALL
-    )
+class SocialLogger:
+    """Buffered post logging: callers enqueue, a background thread appends
+
+    Posts queued while the thread is writing go out together in one
+    append. Queued posts are flushed when the process exits.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.thread = None
+        self.start_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def log(self, platform, content, date=None, engagement=None, url=None):
+        """Queue a post; returns without touching the disk"""
+        self.queue.put(make_post(platform, content, date, engagement, url))
+
+        with self.start_lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='social-logger', daemon=True)
+                self.thread.start()
+
+    def flush(self):
+        """Block until every queued post is in the store"""
+        self.queue.join()
+
+    def _run(self):
+        while True:
+            posts = [self.queue.get()]
+            while True:
+                try:
+                    posts.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                ensure_directories()
+                migrate_social_log()
+                append_posts(posts)
+                render_if_due()
+                for post in posts:
+                    content_preview = post['content'][:100] + '...' if len(post['content']) > 100 else post['content']
+                    log_to_business_log(f"Logged {post['platform']} post: {content_preview}")
+            except Exception as e:
+                log_to_business_log(f"Failed to log {len(posts)} queued posts: {e}")
+            finally:
+                for _ in posts:
+                    self.queue.task_done()
+
+
+_social_logger = None
+_social_logger_lock = threading.Lock()
+
+
+def get_social_logger():
+    """The process-wide SocialLogger"""
+    global _social_logger
+    with _social_logger_lock:
+        if _social_logger is None:
+            _social_logger = SocialLogger()
+        return _social_logger
+
+
+def record_published_post(platform, content, url=None, engagement=None, buffered=None):
+    """Hook for the posters: log a successful post in-process
+
+    Does nothing when SOCIAL_SUMMARY_AUTO_LOG is off, queues the post when
+    buffered (default SOCIAL_SUMMARY_BUFFERED), and never raises, so a
+    logging problem cannot fail a post that was already published.
+    """
+    if not AUTO_LOG:
+        return None
 
-    with open(SOCIAL_LOG, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
+    try:
+        if BUFFERED if buffered is None else buffered:
+            get_social_logger().log(platform, content, engagement=engagement, url=url)
+            return {'success': True, 'queued': True}
+        return log_post(platform, content, engagement=engagement, url=url)
+    except Exception as e:
+        log_to_business_log(f"Failed to log {platform} post: {e}")
+        return {'success': False, 'error': str(e)}
 
 
 def view_log():
     """View the social log"""
-    if not os.path.exists(SOCIAL_LOG):
-        initialize_social_log()
+    initialize_social_log()
 
     with open(SOCIAL_LOG, 'r', encoding='utf-8') as f:
         content = f.read()
@@ -300,69 +707,34 @@ def view_log():
     }
 
 
-def generate_summary(period='week'):
-    """Generate social media summary"""
-    ensure_directories()
+def generate_summary(period='week', start_date=None, end_date=None):
+    """Generate social media summary for a day, week, month or date range"""
     initialize_social_log()
 
-    posts = parse_social_log()
-
-    # Calculate date range
-    now = datetime.now()
-    if period == 'day':
-        start_date = now.replace(hour=0, minute=0, second=0)
-        period_str = now.strftime('%B %d, %Y')
-    elif period == 'week':
-        start_date = now - timedelta(days=now.weekday())
-        end_date = start_date + timedelta(days=6)
-        period_str = f"Week of {start_date.strftime('%b %d')}-{end_date.strftime('%d, %Y')}"
-    elif period == 'month':
-        start_date = now.replace(day=1)
-        period_str = now.strftime('%B %Y')
-    else:
-        start_date = now - timedelta(days=7)
-        period_str = 'Last 7 days'
-
-    # Count posts by platform
-    platform_counts = {}
-    for post in posts:
-        platform = post['platform']
-        platform_counts[platform] = platform_counts.get(platform, 0) + 1
-
-    total_posts = len(posts)
+    start, end, period_str = get_period_range(period, start_date=start_date, end_date=end_date)
+    summary = summarize_posts(query_posts(start, end))
 
     return {
         'success': True,
         'period': period_str,
-        'total_posts': total_posts,
-        'by_platform': {
-            'linkedin': platform_counts.get('linkedin', 0),
-            'facebook': platform_counts.get('facebook', 0),
-            'instagram': platform_counts.get('instagram', 0),
-            'twitter': platform_counts.get('twitter', 0)
-        },
-        'total_engagement': 0,  # Would be calculated from actual engagement data
-        'average_engagement': 0.0
+        'start': start.strftime('%Y-%m-%d'),
+        'end': (end - timedelta(days=1)).strftime('%Y-%m-%d'),
+        **summary
     }
 
 
 def get_social_activity(start_date, end_date):
-    """Get social activity for date range (for CEO briefing integration)"""
-    posts = parse_social_log()
-
-    # Filter by date range (simplified - in real implementation, parse dates from log)
-    platform_counts = {}
-    for post in posts:
-        platform = post['platform']
-        platform_counts[platform] = platform_counts.get(platform, 0) + 1
+    """Get social activity for the days start_date..end_date inclusive (for CEO briefing integration)"""
+    start, end, _ = get_period_range('range', start_date=start_date, end_date=end_date)
+    summary = summarize_posts(query_posts(start, end))
 
     return {
-        'total_posts': len(posts),
-        'linkedin_posts': platform_counts.get('linkedin', 0),
-        'facebook_posts': platform_counts.get('facebook', 0),
-        'instagram_posts': platform_counts.get('instagram', 0),
-        'twitter_posts': platform_counts.get('twitter', 0),
-        'total_engagement': 0  # Would be calculated from actual engagement data
+        'total_posts': summary['total_posts'],
+        'linkedin_posts': summary['by_platform']['linkedin'],
+        'facebook_posts': summary['by_platform']['facebook'],
+        'instagram_posts': summary['by_platform']['instagram'],
+        'twitter_posts': summary['by_platform']['twitter'],
+        'total_engagement': summary['total_engagement']
     }
 
 
@@ -382,9 +754,14 @@ def main():
     # View log
     subparsers.add_parser('view', help='View social log')
 
+    # Render log
+    subparsers.add_parser('render', help='Bring Social_Log.md up to date with the post store')
+
     # Generate summary
     summary_parser = subparsers.add_parser('summary', help='Generate summary')
-    summary_parser.add_argument('--period', choices=['day', 'week', 'month'], default='week', help='Summary period')
+    summary_parser.add_argument('--period', choices=SUMMARY_PERIODS, default='week', help='Summary period')
+    summary_parser.add_argument('--start', help='Range start (YYYY-MM-DD), implies --period range')
+    summary_parser.add_argument('--end', help='Range end, inclusive (YYYY-MM-DD), implies --period range')
 
     args = parser.parse_args()
 
@@ -393,8 +770,14 @@ def main():
         result = log_post(args.platform, args.content, args.date, engagement, args.url)
     elif args.command == 'view':
         result = view_log()
+    elif args.command == 'render':
+        ensure_directories()
+        migrate_social_log()
+        result = {'success': True, 'rendered_posts': render_social_log(), 'file': SOCIAL_LOG}
     elif args.command == 'summary':
-        result = generate_summary(args.period)
+        dates = [datetime.strptime(value, '%Y-%m-%d') if value else None for value in [args.start, args.end]]
+        period = 'range' if any(dates) else args.period
+        result = generate_summary(period, *dates)
     else:
         parser.print_help()
         return